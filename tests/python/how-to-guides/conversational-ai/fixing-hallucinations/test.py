@@ -9,12 +9,8 @@ showing how correctness and uncertainty metrics can be improved.
 
 import os
 import sys
-import time
 
 from dotenv import load_dotenv
-from galileo import galileo_context
-from galileo.openai import openai
-from rich.console import Console
 from rich.panel import Panel
 
 # Add the parent directory to the path so we can import the utils package
@@ -25,112 +21,22 @@ from after import run_improved_prompt
 from before import run_original_prompt
 
 # Import utility modules
-from tests.python.utils import config, display, galileo_api
+from tests.python.utils import clients, display, prompt_runner, run_scope, session, terminal, usage
 
-# Initialize rich console
-console = Console()
+# Use the harness's shared rich console
+console = terminal.console
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-def run_test_with_metrics(
-    client,
-    run_function,
-    description,
-    api_url,
-    headers,
-    project_id,
-    log_stream_id,
-    max_wait_time=180,
-    target_metrics=None,
-):
+def main():
     """
-    Run a test function and wait for metrics to be available
-
-    Args:
-        client: An initialized Galileo OpenAI client
-        run_function: The function to run (from before.py or after.py)
-        description: A description of the test
-        api_url: The Galileo API URL
-        headers: The API request headers
-        project_id: The project ID
-        log_stream_id: The log stream ID
-        max_wait_time: Maximum time to wait for metrics in seconds (default: 120)
-        target_metrics: List of metrics to wait for (default: ["correctness"])
+    Main function
 
     Returns:
-        A tuple of (response_content, metrics)
+        True if the test passed, False otherwise
     """
-    if target_metrics is None:
-        target_metrics = ["correctness"]
-
-    console.rule(f"[bold blue]{description}", style="blue")
-
-    # Make API call with Galileo tracking
-    console.print("\n[bold cyan]Making API call to OpenAI[/]")
-
-    try:
-        with console.status("[bold green]Sending request to OpenAI...", spinner="dots"):
-            start_time = time.time()
-            content = run_function(client)
-            elapsed = time.time() - start_time
-
-        console.print(f"[bold green]✓ API call completed in {elapsed:.2f} seconds[/]")
-    except Exception as e:
-        console.print(f"[bold red]✗ Error making API call: {str(e)}[/]")
-        return None, None
-
-    # Print the response
-    console.print("\n[bold cyan]Model Response[/]")
-    console.print(Panel(content, border_style="green", expand=False))
-
-    # Flush the logger to ensure all logs are sent to Galileo
-    console.print("[bold cyan]Flushing Galileo logger...[/]")
-    try:
-        galileo_context.flush()
-        console.print("[bold green]✓ Galileo logger flushed successfully[/]")
-    except Exception:
-        console.print("[bold yellow]⚠ Continuing without flush. Metrics may be delayed.[/]")
-
-    # Get the latest trace ID (should be the one we just created)
-    trace_id = galileo_api.get_latest_trace(api_url, headers, project_id, log_stream_id)
-
-    if not trace_id:
-        console.print("[bold red]✗ Could not find the trace for this run[/]")
-        return content, None
-
-    console.print(f"[bold green]✓ Found trace ID: {trace_id}[/]")
-
-    # Wait for metrics to be available
-    metrics = {}
-    for metric_name in target_metrics:
-        console.print(f"\n[bold cyan]Waiting for '{metric_name}' metric to be available...[/]")
-        metric_result = galileo_api.wait_for_metrics(
-            api_url, headers, project_id, trace_id, target_metric=metric_name, max_wait_time=max_wait_time
-        )
-
-        # If metric not found, try again with a longer timeout
-        if not galileo_api.has_target_metric(metric_result, metric_name):
-            console.print(
-                f"[bold yellow]⚠ '{metric_name}' metric not found on first attempt. Trying again with longer timeout...[/]"
-            )
-            metric_result = galileo_api.wait_for_metrics(
-                api_url, headers, project_id, trace_id, max_wait_time=max_wait_time * 1.5, target_metric=metric_name
-            )
-
-        # Merge metrics
-        if metric_result:
-            metrics.update(metric_result)
-
-    # Display metrics
-    display.display_metrics(metrics)
-
-    return content, metrics
-
-
-def main():
-    """Main function"""
     console.print(
         Panel(
             "[bold blue]Fixing Hallucinations Testbed[/]\n\n"
@@ -150,81 +56,97 @@ def main():
         "GALILEO_LOG_STREAM",
         "OPENAI_API_KEY",
     ]
-    if not config.check_environment_variables(required_vars):
-        return
 
-    # Set up API configuration
-    api_url, api_key, project_name, log_stream_name = config.setup_api_config()
+    # Get the shared session (authentication and headers are resolved once per suite run)
+    harness_session = session.get_session(required_vars)
+    if harness_session is None:
+        return False
+
+    api_url, headers = harness_session.api_url, harness_session.headers
 
-    # Override project and log stream names for this specific test
+    # Override the project name for this specific test, and log to a new log stream of this
+    # run, so the latest traces in it come from this test even when other runs overlap
     project_name = "fixing-hallucinations"
-    log_stream_name = "dev"
+    project_id, _ = harness_session.resolve(project_name, "dev")
+    log_stream_name, log_stream_id = run_scope.ephemeral_log_stream(harness_session, "fixing-hallucinations", project_id, project_name)
     console.print(f"[bold cyan]Using project: {project_name}[/]")
     console.print(f"[bold cyan]Using log stream: {log_stream_name}[/]")
 
-    # Get authentication token
-    auth_token = galileo_api.get_auth_token(api_url, api_key)
-
-    # API headers with token
-    headers = config.setup_headers(auth_token, api_key)
-
-    # Get project and log stream IDs
-    project_id, log_stream_id = galileo_api.get_project_and_log_stream_ids(
-        api_url, headers, project_name, log_stream_name
-    )
-
     if not project_id or not log_stream_id:
         console.print("[bold red]✗ Cannot proceed without project and log stream IDs[/]")
-        return
+        return False
 
     # Initialize Galileo client for OpenAI
     console.print("[bold cyan]Initializing Galileo client for OpenAI...[/]")
     openai_api_key = os.environ.get("OPENAI_API_KEY")
 
     try:
-        client = openai.OpenAI(api_key=openai_api_key)
+        client = clients.get_openai_client(api_key=openai_api_key, project=project_name, log_stream=log_stream_name)
         console.print("[bold green]✓ Galileo client initialized successfully[/]")
     except Exception as e:
         console.print(f"[bold red]✗ Error initializing Galileo client: {str(e)}[/]")
-        return
-
-    # Run the original prompt test
-    original_result = run_test_with_metrics(
-        client,
-        run_original_prompt,
-        "Testing Original Prompt (Prone to Hallucinations)",
-        api_url,
-        headers,
-        project_id,
-        log_stream_id,
-        target_metrics=["correctness", "uncertainty"],
-    )
+        return False
+
+    # Track token usage, with an optional budget from HARNESS_MAX_TOKENS / HARNESS_MAX_COST
+    usage_tracker = usage.UsageTracker.from_environment(suite="fixing-hallucinations")
+
+    trials = prompt_runner.get_trials()
+
+    if trials > 1:
+        # Run repeated trials of both prompts (HARNESS_TRIALS) and compare the correctness
+        # distributions; repeated trials compare a single metric
+        original_values, improved_values, comparison = prompt_runner.run_trial_comparison(
+            client,
+            run_original_prompt,
+            run_improved_prompt,
+            api_url,
+            headers,
+            project_id,
+            log_stream_id,
+            max_wait_time=180,
+            target_metric="correctness",
+            trials=trials,
+            usage_tracker=usage_tracker,
+        )
 
-    # Add a delay between tests
-    console.print("[bold blue]Waiting 5 seconds before running the next test...[/]")
-    time.sleep(5)
-
-    # Run the improved prompt test
-    improved_result = run_test_with_metrics(
-        client,
-        run_improved_prompt,
-        "Testing Improved Prompt (Reduced Hallucinations)",
-        api_url,
-        headers,
-        project_id,
-        log_stream_id,
-        target_metrics=["correctness", "uncertainty"],
-    )
+        # Compare the results
+        console.rule("[bold blue]Comparison of Results", style="blue")
+        display.compare_trial_metrics(comparison, "correctness")
+
+        # The test passes if both prompts got at least one metric value
+        success = len(original_values) > 0 and len(improved_values) > 0
+    else:
+        # Run both prompt tests, flushing the Galileo logger once before waiting for metrics
+        original_result, improved_result = prompt_runner.run_batch_with_metrics(
+            client,
+            [
+                ("Testing Original Prompt (Prone to Hallucinations)", run_original_prompt),
+                ("Testing Improved Prompt (Reduced Hallucinations)", run_improved_prompt),
+            ],
+            api_url,
+            headers,
+            project_id,
+            log_stream_id,
+            max_wait_time=180,
+            target_metrics=["correctness", "uncertainty"],
+            usage_tracker=usage_tracker,
+        )
 
-    # Compare the results
-    console.rule("[bold blue]Comparison of Results", style="blue")
+        # Compare the results
+        console.rule("[bold blue]Comparison of Results", style="blue")
 
-    # Compare correctness metrics
-    display.compare_metrics(original_result[1], improved_result[1], "correctness")
+        # Compare correctness metrics
+        display.compare_metrics(original_result[1], improved_result[1], "correctness")
 
-    # Compare uncertainty metrics
-    console.print("\n")
-    display.compare_metrics(original_result[1], improved_result[1], "uncertainty")
+        # Compare uncertainty metrics
+        console.print("\n")
+        display.compare_metrics(original_result[1], improved_result[1], "uncertainty")
+
+        # The test passes if both runs produced a response and were found in Galileo
+        success = original_result[1] is not None and improved_result[1] is not None
+
+    # Display token usage and cost
+    display.display_usage(usage_tracker)
 
     # Print summary
     console.rule("[bold blue]Test Summary", style="blue")
@@ -242,6 +164,8 @@ def main():
         )
     )
 
+    return success
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
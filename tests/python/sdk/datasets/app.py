@@ -5,6 +5,10 @@ from galileo.datasets import create_dataset
 # Load environment variables from .env file
 load_dotenv()
 
+# Prefix the dataset name with the harness run ID, if set, so concurrent runs don't collide
+run_id = os.environ.get("HARNESS_RUN_ID")
+dataset_name = f"{run_id}-test_dataset" if run_id else "test_dataset"
+
 # Create a dataset with test data
 test_data = [
     {
@@ -19,7 +23,7 @@ test_data = [
 
 try:
     dataset = create_dataset(
-        name="test_dataset",
+        name=dataset_name,
         content=test_data,
     )
 
@@ -8,27 +8,21 @@ and verifying that datasets were created and managed correctly in the Galileo pl
 
 import os
 import sys
-import time
 import subprocess
 import requests
 from dotenv import load_dotenv
-from rich.console import Console
 from rich.panel import Panel
 from rich.rule import Rule
 import json
 
-# Add the utils directory to the path
-utils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../utils'))
-sys.path.insert(0, utils_path)
-print(f"Utils path: {utils_path}")
+# Add the parent directory to the path so we can import the utils package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-# Import utility modules directly
-import config
-import galileo_api
-import display
+# Import utility modules
+from tests.python.utils import app_runner, display, galileo_api, polling, run_scope, session, terminal
 
-# Initialize rich console
-console = Console()
+# Use the harness's shared rich console
+console = terminal.console
 
 # Load environment variables from .env file in the datasets directory
 env_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -47,32 +41,29 @@ def run_app_and_verify_datasets():
         "GALILEO_LOG_STREAM",
         "OPENAI_API_KEY"
     ]
-    if not config.check_environment_variables(required_vars):
-        return False
 
-    # Set up API configuration
-    api_url, api_key, project_name, log_stream_name = config.setup_api_config()
+    # Start the warm app worker (if HARNESS_APP_MODE=warm) while the API lookups run
+    app_runner.prestart()
 
-    # Get authentication token
-    auth_token = galileo_api.get_auth_token(api_url, api_key)
+    # Get the shared session (authentication, headers and IDs are resolved once per suite run)
+    harness_session = session.get_session(required_vars)
+    if harness_session is None:
+        return False
 
-    # API headers with token
-    headers = config.setup_headers(auth_token, api_key)
+    api_url, headers = harness_session.api_url, harness_session.headers
 
     # We don't need to get project and log stream IDs for dataset operations
-    # Just get all datasets directly
 
-    # Get the current datasets
-    console.print("[bold cyan]Checking current datasets...[/]")
-    current_datasets = galileo_api.get_datasets(api_url, headers, None)  # Pass None to get all datasets
-    current_dataset_count = len(current_datasets)
-    console.print(f"[bold cyan]Current dataset count: {current_dataset_count}[/]")
+    # The app prefixes the dataset name with the run ID, so look for exactly that name;
+    # the dataset is deleted when the test exits
+    dataset_name = run_scope.ephemeral_dataset(harness_session, "test_dataset")
+    console.print(f"[bold cyan]Expecting dataset: {dataset_name}[/]")
 
     # Run the app.py script
     console.print("[bold cyan]Running datasets/app.py...[/]")
     try:
-        script_path = os.path.join(os.path.dirname(__file__), "app.py")
-        result = subprocess.run(["python", script_path], capture_output=True, text=True, check=True)
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+        result = app_runner.run_app(script_path)
         console.print("[bold green]✓ app.py executed successfully[/]")
         console.print(Panel(result.stdout.strip(), title="[bold blue]App Output[/]", border_style="green"))
     except subprocess.CalledProcessError as e:
@@ -80,66 +71,67 @@ def run_app_and_verify_datasets():
         console.print(Panel(e.stderr.strip(), title="[bold red]Error Output[/]", border_style="red"))
         return False
 
-    # Wait a moment for the dataset operations to be processed
-    console.print("[bold cyan]Waiting for dataset operations to be processed...[/]")
-    time.sleep(5)
-
-    # Check for new datasets
+    # Poll for the test dataset, quickly at first and then backing off
     console.print("[bold cyan]Checking for dataset changes...[/]")
-    max_attempts = 12
-    for attempt in range(1, max_attempts + 1):
-        console.print(f"[bold cyan]Attempt {attempt}/{max_attempts}...[/]")
-        new_datasets = galileo_api.get_datasets(api_url, headers, None)
-        new_dataset_count = len(new_datasets)
-
-        if new_dataset_count >= current_dataset_count:
-            # Look for the test dataset created by app.py
-            test_dataset = None
-            for dataset in new_datasets:
-                if "test_dataset" in dataset.get('name', '').lower():
-                    test_dataset = dataset
-                    break
-
-            if test_dataset:
-                console.print(f"[bold green]✓ Found test dataset: {test_dataset.get('name')}[/]")
-                dataset_id = test_dataset.get('id')
-
-                # Get dataset details
-                dataset_data = galileo_api.get_dataset_details(api_url, headers, None, dataset_id)
-
-                if dataset_data:
-                    console.print("[bold green]✓ Successfully retrieved dataset details[/]")
-
-                    # Print the dataset_data structure to understand what's in it
-                    console.print("[bold cyan]Dataset data structure:[/]")
-                    console.print(f"[cyan]Keys in dataset_data: {list(dataset_data.keys())}[/]")
-
-                    # Print a sample of the dataset_data content
-                    console.print(Panel(
-                        json.dumps(dataset_data, indent=2)[:1000] + "...",  # Limit to first 1000 chars
-                        title="[bold blue]Dataset Data Sample[/]",
-                        border_style="cyan"
-                    ))
-
-                    # Consider the test successful if we found the dataset and got its details
-                    console.print("[bold green]✓ Successfully found and retrieved the dataset[/]")
-                    console.print("[bold green]✓ Datasets integration is working correctly[/]")
-                    return True
-
-                else:
-                    console.print("[bold yellow]⚠ Could not retrieve dataset details[/]")
-            else:
-                console.print("[bold yellow]⚠ Test dataset not found[/]")
-
-        if attempt < max_attempts:
-            console.print("[bold cyan]Waiting and trying again...[/]")
-            time.sleep(5)
-
-    console.print("[bold red]✗ No dataset changes detected after running app.py[/]")
-    return False
+
+    def find_test_dataset():
+        # Look for the test dataset created by app.py
+        test_dataset = galileo_api.find_dataset(api_url, headers, None, dataset_name)  # Pass None to search all datasets
+
+        if not test_dataset:
+            console.print("[bold yellow]⚠ Test dataset not found[/]")
+            return None
+
+        # Get dataset details
+        dataset_id = test_dataset.get('id')
+        dataset_data = galileo_api.get_dataset_details(api_url, headers, None, dataset_id)
+
+        if not dataset_data:
+            console.print("[bold yellow]⚠ Could not retrieve dataset details[/]")
+            return None
+
+        return test_dataset, dataset_data
+
+    found = polling.eventually(find_test_dataset, deadline=65, description="Test dataset with details", phase="dataset_lookup")
+
+    if not found:
+        console.print("[bold red]✗ No dataset changes detected after running app.py[/]")
+        return False
+
+    test_dataset, dataset_data = found
+    console.print(f"[bold green]✓ Found test dataset: {test_dataset.get('name')}[/]")
+    console.print("[bold green]✓ Successfully retrieved dataset details[/]")
+
+    # Count the entries page by page, without loading the whole dataset at once
+    try:
+        entry_count = sum(len(page) for page in galileo_api.iter_dataset_pages(api_url, headers, None, test_dataset.get('id')))
+        console.print(f"[bold green]✓ Dataset has {entry_count} entries[/]")
+    except requests.RequestException as e:
+        console.print(f"[bold yellow]⚠ Could not read dataset entries: {str(e)}[/]")
+
+    # Print the dataset_data structure to understand what's in it
+    console.print("[bold cyan]Dataset data structure:[/]")
+    console.print(f"[cyan]Keys in dataset_data: {list(dataset_data.keys())}[/]")
+
+    # Print a sample of the dataset_data content
+    console.print(Panel(
+        json.dumps(dataset_data, indent=2)[:1000] + "...",  # Limit to first 1000 chars
+        title="[bold blue]Dataset Data Sample[/]",
+        border_style="cyan"
+    ))
+
+    # Consider the test successful if we found the dataset and got its details
+    console.print("[bold green]✓ Successfully found and retrieved the dataset[/]")
+    console.print("[bold green]✓ Datasets integration is working correctly[/]")
+    return True
 
 def main():
-    """Main function"""
+    """
+    Main function
+
+    Returns:
+        True if the test passed, False otherwise
+    """
     console.print(Panel(
         "[bold blue]Galileo Datasets Integration Test[/]\n\n"
         "This script tests the Galileo datasets integration by running the app.py script\n"
@@ -169,5 +161,7 @@ def main():
             border_style="red"
         ))
 
+    return success
+
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
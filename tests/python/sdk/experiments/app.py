@@ -1,60 +1,62 @@
 import os
+import sys
 from dotenv import load_dotenv
-from galileo.datasets import get_dataset, create_dataset
 from galileo.experiments import run_experiment
-from galileo.prompts import get_prompt_template, create_prompt_template
+
+# Add the repository root to the path so we can import the utils package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
+
+from tests.python.utils import resource_cache
 
 # Load environment variables from .env file
 load_dotenv()
 
+# The dataset and prompt template are shared fixtures: the resolver keys them by name and
+# content, so runs reuse them and a content change gets its own copy. Only the experiment
+# is prefixed with the harness run ID, if set, so concurrent runs don't collide
+run_id = os.environ.get("HARNESS_RUN_ID")
+prefix = f"{run_id}-" if run_id else ""
+dataset_name = "storyteller-dataset"
+prompt_name = "storyteller-prompt"
+experiment_name = f"{prefix}my-experiment"
+
 try:
-    # First, create a test dataset if it doesn't exist
-    test_dataset = None
-    try:
-        test_dataset = get_dataset(name="storyteller-dataset")
-        print(f"Using existing dataset: {test_dataset.name}")
-    except:
-        # Create a new dataset if it doesn't exist
-        test_data = [
-            {"question": "What continent is Spain in?", "answer": "Europe"},
-            {"question": "What continent is Japan in?", "answer": "Asia"}
-        ]
-        test_dataset = create_dataset("storyteller-dataset", test_data)
-        print(f"Created new dataset: {test_dataset.name}")
+    # Get the dataset and prompt template, creating them only if they don't exist yet.
+    # The resolver remembers their IDs, so later runs validate them with one request each.
+    resolver = resource_cache.get_resolver()
+
+    test_data = [
+        {"question": "What continent is Spain in?", "answer": "Europe"},
+        {"question": "What continent is Japan in?", "answer": "Asia"}
+    ]
+    test_dataset = resolver.dataset(dataset_name, test_data)
+    print(f"Using dataset: {test_dataset.name}")
 
-    # Create a prompt template if it doesn't exist
-    test_prompt = None
-    try:
-        test_prompt = get_prompt_template(name="storyteller-prompt")
-        print(f"Using existing prompt template: {test_prompt.name}")
-    except:
-        # Create a new prompt template if it doesn't exist
-        # The API has changed and now requires 'messages' parameter instead of text
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a storyteller. Create a short story based on the following question.
-                Your story should be creative and engaging."""
-            },
-            {
-                "role": "user",
-                "content": "Question: {{question}}"
-            }
-        ]
-        test_prompt = create_prompt_template("storyteller-prompt", messages)
-        print(f"Created new prompt template: {test_prompt.name}")
+    messages = [
+        {
+            "role": "system",
+            "content": """You are a storyteller. Create a short story based on the following question.
+            Your story should be creative and engaging."""
+        },
+        {
+            "role": "user",
+            "content": "Question: {{question}}"
+        }
+    ]
+    test_prompt = resolver.prompt(prompt_name, messages)
+    print(f"Using prompt template: {test_prompt.name}")
 
     # Run an experiment with the prompt template
     project_name = os.getenv("GALILEO_PROJECT", "my-project")
     results = run_experiment(
-        "my-experiment",
+        experiment_name,
         dataset=test_dataset,
         prompt=test_prompt,
         metrics=["correctness"],
         project=project_name,
     )
 
-    print(f"Successfully created experiment: my-experiment")
+    print(f"Successfully created experiment: {experiment_name}")
     if hasattr(results, 'id'):
         print(f"Experiment ID: {results.id}")
     else:
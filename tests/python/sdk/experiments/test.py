@@ -8,27 +8,20 @@ and verifying that experiments were created and managed correctly in the Galileo
 
 import os
 import sys
-import time
 import subprocess
 import requests
 from dotenv import load_dotenv
-from rich.console import Console
 from rich.panel import Panel
 from rich.rule import Rule
-import json
 
-# Add the utils directory to the path
-utils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../utils'))
-sys.path.insert(0, utils_path)
-print(f"Utils path: {utils_path}")
+# Add the parent directory to the path so we can import the utils package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
-# Import utility modules directly
-import config
-import galileo_api
-import display
+# Import utility modules
+from tests.python.utils import app_runner, display, galileo_api, polling, run_scope, session, terminal
 
-# Initialize rich console
-console = Console()
+# Use the harness's shared rich console
+console = terminal.console
 
 # Load environment variables from .env file in the experiments directory
 env_path = os.path.join(os.path.dirname(__file__), '.env')
@@ -47,106 +40,106 @@ def run_app_and_verify_experiments():
         "GALILEO_LOG_STREAM",
         "OPENAI_API_KEY"
     ]
-    if not config.check_environment_variables(required_vars):
-        return False
 
-    # Set up API configuration
-    api_url, api_key, project_name, log_stream_name = config.setup_api_config()
+    # Start the warm app worker (if HARNESS_APP_MODE=warm) while the API lookups run
+    app_runner.prestart()
 
-    # Get authentication token
-    auth_token = galileo_api.get_auth_token(api_url, api_key)
+    # Get the shared session (authentication, headers and IDs are resolved once per suite run)
+    harness_session = session.get_session(required_vars)
+    if harness_session is None:
+        return False
 
-    # API headers with token
-    headers = config.setup_headers(auth_token, api_key)
+    api_url, headers = harness_session.api_url, harness_session.headers
 
     # Get project ID
-    project_id, _ = galileo_api.get_project_and_log_stream_ids(api_url, headers, project_name, log_stream_name)
-    console.print(f"[bold cyan]Using project: {project_name} (ID: {project_id})[/]")
+    project_id, _ = harness_session.resolve()
+    console.print(f"[bold cyan]Using project: {harness_session.project_name} (ID: {project_id})[/]")
 
-    # Get the current experiments
-    console.print("[bold cyan]Checking current experiments...[/]")
-    current_experiments = galileo_api.get_experiments(api_url, headers, project_id)  # Pass project_id
-    current_experiment_count = len(current_experiments)
-    console.print(f"[bold cyan]Current experiment count: {current_experiment_count}[/]")
+    # The app prefixes the experiment name with the run ID, so look for exactly that name;
+    # the experiment is deleted when the test exits
+    experiment_name = run_scope.ephemeral_experiment(harness_session, "my-experiment", project_id)
+    console.print(f"[bold cyan]Expecting experiment: {experiment_name}[/]")
 
     # Run the app.py script
     console.print("[bold cyan]Running experiments/app.py...[/]")
     try:
-        script_path = os.path.join(os.path.dirname(__file__), "app.py")
-        result = subprocess.run(["python", script_path], capture_output=True, text=True, check=True)
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+        result = app_runner.run_app(script_path)
         console.print("[bold green]✓ app.py executed successfully[/]")
         console.print(Panel(result.stdout.strip(), title="[bold blue]App Output[/]", border_style="green"))
 
-        # Check if the output indicates successful experiment creation
+        # The app's own report is informational; the experiment is verified through the API below
         if "Successfully created experiment" in result.stdout:
             console.print("[bold green]✓ Experiment was successfully created according to app.py output[/]")
-            console.print("[bold green]✓ Experiments integration is working correctly[/]")
-            return True
+        else:
+            console.print("[bold yellow]⚠ app.py didn't report creating the experiment[/]")
 
     except subprocess.CalledProcessError as e:
         console.print(f"[bold red]✗ Error running app.py: {e}[/]")
         console.print(Panel(e.stderr.strip(), title="[bold red]Error Output[/]", border_style="red"))
         return False
 
-    # Wait a moment for the experiment operations to be processed
-    console.print("[bold cyan]Waiting for experiment operations to be processed...[/]")
-    time.sleep(5)
-
-    # Check for new experiments
+    # Poll for the test experiment, quickly at first and then backing off
     console.print("[bold cyan]Checking for experiment changes...[/]")
-    max_attempts = 12
-    for attempt in range(1, max_attempts + 1):
-        console.print(f"[bold cyan]Attempt {attempt}/{max_attempts}...[/]")
-        new_experiments = galileo_api.get_experiments(api_url, headers, project_id)
-        new_experiment_count = len(new_experiments)
-
-        if new_experiment_count >= current_experiment_count:
-            # Look for the test experiment created by app.py
-            test_experiment = None
-            for experiment in new_experiments:
-                if "my-experiment" in experiment.get('name', '').lower():
-                    test_experiment = experiment
-                    break
-
-            if test_experiment:
-                console.print(f"[bold green]✓ Found test experiment: {test_experiment.get('name')}[/]")
-                experiment_id = test_experiment.get('id')
-
-                # Get experiment details
-                experiment_data = galileo_api.get_experiment_details(api_url, headers, project_id, experiment_id)
-
-                if experiment_data:
-                    console.print("[bold green]✓ Successfully retrieved experiment details[/]")
-
-                    # Print the experiment_data structure to understand what's in it
-                    console.print("[bold cyan]Experiment data structure:[/]")
-                    console.print(f"[cyan]Keys in experiment_data: {list(experiment_data.keys())}[/]")
-
-                    # Print a sample of the experiment_data content
-                    console.print(Panel(
-                        json.dumps(experiment_data, indent=2)[:1000] + "...",  # Limit to first 1000 chars
-                        title="[bold blue]Experiment Data Sample[/]",
-                        border_style="cyan"
-                    ))
-
-                    # Consider the test successful if we found the experiment and got its details
-                    console.print("[bold green]✓ Successfully found and retrieved the experiment[/]")
-                    console.print("[bold green]✓ Experiments integration is working correctly[/]")
-                    return True
-                else:
-                    console.print("[bold yellow]⚠ Could not retrieve experiment details[/]")
-            else:
-                console.print("[bold yellow]⚠ Test experiment not found[/]")
-
-        if attempt < max_attempts:
-            console.print("[bold cyan]Waiting and trying again...[/]")
-            time.sleep(5)
-
-    console.print("[bold red]✗ No experiment changes detected after running app.py[/]")
-    return False
+
+    def find_test_experiment():
+        # Look for the test experiment created by app.py
+        test_experiment = galileo_api.find_experiment(api_url, headers, project_id, experiment_name)
+
+        if not test_experiment:
+            console.print("[bold yellow]⚠ Test experiment not found[/]")
+            return None
+
+        # Get experiment details
+        experiment_id = test_experiment.get('id')
+        experiment_data = galileo_api.get_experiment_details(api_url, headers, project_id, experiment_id)
+
+        if not experiment_data:
+            console.print("[bold yellow]⚠ Could not retrieve experiment details[/]")
+            return None
+
+        return test_experiment, experiment_data
+
+    found = polling.eventually(find_test_experiment, deadline=65, description="Test experiment with details", phase="experiment_lookup")
+
+    if not found:
+        console.print("[bold red]✗ No experiment changes detected after running app.py[/]")
+        return False
+
+    test_experiment, experiment_data = found
+    console.print(f"[bold green]✓ Found test experiment: {test_experiment.get('name')}[/]")
+    console.print("[bold green]✓ Successfully retrieved experiment details[/]")
+
+    # Print the experiment_data structure to understand what's in it
+    console.print("[bold cyan]Experiment data structure:[/]")
+    console.print(f"[cyan]Keys in experiment_data: {list(experiment_data.keys())}[/]")
+
+    # Summarize the experiment's per-row results; rows may still be scoring, so this is informational.
+    # The exporter needs pandas, which is optional for this test
+    try:
+        from tests.python.utils import experiment_export
+
+        results = experiment_export.export_experiment(api_url, headers, project_id, test_experiment.get('id'), include_text=False)
+        console.print(f"[bold cyan]Experiment rows: {len(results)}[/]")
+        if len(results):
+            experiment_export.display_summary(experiment_export.summarize_metrics(results), title="Experiment Metrics")
+    except ImportError as e:
+        console.print(f"[bold yellow]⚠ Skipping the experiment export: {str(e)}[/]")
+    except requests.RequestException as e:
+        console.print(f"[bold yellow]⚠ Could not export experiment results: {str(e)}[/]")
+
+    # Consider the test successful if we found the experiment and got its details
+    console.print("[bold green]✓ Successfully found and retrieved the experiment[/]")
+    console.print("[bold green]✓ Experiments integration is working correctly[/]")
+    return True
 
 def main():
-    """Main function"""
+    """
+    Main function
+
+    Returns:
+        True if the test passed, False otherwise
+    """
     console.print(Panel(
         "[bold blue]Galileo Experiments Integration Test[/]\n\n"
         "This script tests the Galileo experiments integration by running the app.py script\n"
@@ -176,5 +169,7 @@ def main():
             border_style="red"
         ))
 
+    return success
+
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
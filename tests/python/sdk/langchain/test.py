@@ -8,10 +8,8 @@ and verifying that traces were created in the Galileo platform.
 
 import os
 import sys
-import time
 import subprocess
 from dotenv import load_dotenv
-from rich.console import Console
 from rich.panel import Panel
 from rich.rule import Rule
 
@@ -19,10 +17,10 @@ from rich.rule import Rule
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../../')))
 
 # Import utility modules
-from tests.python.utils import config, galileo_api, display
+from tests.python.utils import app_runner, display, galileo_api, polling, run_scope, session, terminal
 
-# Initialize rich console
-console = Console()
+# Use the harness's shared rich console
+console = terminal.console
 
 # Load environment variables from .env file
 load_dotenv()
@@ -39,35 +37,33 @@ def run_app_and_verify_traces():
         "GALILEO_LOG_STREAM",
         "OPENAI_API_KEY"
     ]
-    if not config.check_environment_variables(required_vars):
-        return False
 
-    # Set up API configuration
-    api_url, api_key, project_name, log_stream_name = config.setup_api_config()
+    # Start the warm app worker (if HARNESS_APP_MODE=warm) while the API lookups run
+    app_runner.prestart()
 
-    # Get authentication token
-    auth_token = galileo_api.get_auth_token(api_url, api_key)
+    # Get the shared session (authentication, headers and IDs are resolved once per suite run)
+    harness_session = session.get_session(required_vars)
+    if harness_session is None:
+        return False
 
-    # API headers with token
-    headers = config.setup_headers(auth_token, api_key)
+    api_url, headers = harness_session.api_url, harness_session.headers
 
-    # Get project and log stream IDs
-    project_id, log_stream_id = galileo_api.get_project_and_log_stream_ids(api_url, headers, project_name, log_stream_name)
+    # Get the project ID, and log to a new log stream of this run, so every trace in it
+    # comes from this test's app even when other runs use the same project
+    project_id, _ = harness_session.resolve()
+    log_stream_name, log_stream_id = run_scope.ephemeral_log_stream(harness_session, "sdk/langchain", project_id)
 
     if not project_id or not log_stream_id:
         console.print("[bold red]✗ Cannot proceed without project and log stream IDs[/]")
         return False
 
-    # Get the current number of traces
-    console.print("[bold cyan]Checking current traces...[/]")
-    current_traces = galileo_api.get_traces_by_query(api_url, headers, project_id, log_stream_id, {"limit": 1})
-    current_trace_count = len(current_traces)
-    console.print(f"[bold cyan]Current trace count: {current_trace_count}[/]")
+    console.print(f"[bold cyan]Using log stream: {log_stream_name}[/]")
 
     # Run the app.py script
     console.print("[bold cyan]Running app.py...[/]")
     try:
-        result = subprocess.run(["python", "app.py"], capture_output=True, text=True, check=True)
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+        result = app_runner.run_app(script_path)
         console.print("[bold green]✓ app.py executed successfully[/]")
         console.print(Panel(result.stdout.strip(), title="[bold blue]App Output[/]", border_style="green"))
     except subprocess.CalledProcessError as e:
@@ -75,67 +71,71 @@ def run_app_and_verify_traces():
         console.print(Panel(e.stderr.strip(), title="[bold red]Error Output[/]", border_style="red"))
         return False
 
-    # Wait a moment for the trace to be processed
-    console.print("[bold cyan]Waiting for trace to be processed...[/]")
-    time.sleep(5)
-
-    # Check for new traces
+    # Poll for the new trace, quickly at first and then backing off
     console.print("[bold cyan]Checking for new traces...[/]")
-    max_attempts = 12
-    for attempt in range(1, max_attempts + 1):
-        console.print(f"[bold cyan]Attempt {attempt}/{max_attempts}...[/]")
+
+    def find_new_trace():
         new_traces = galileo_api.get_traces_by_query(api_url, headers, project_id, log_stream_id, {"limit": 10})
         new_trace_count = len(new_traces)
 
-        if new_trace_count > current_trace_count:
-            console.print(f"[bold green]✓ Found {new_trace_count - current_trace_count} new trace(s)[/]")
-
-            # Get the latest trace
-            latest_trace = new_traces[0]
-            trace_id = latest_trace.get('id')
-            console.print(f"[bold green]✓ Latest trace ID: {trace_id}[/]")
+        if not new_trace_count:
+            return None
 
-            # Get trace details
-            trace_data = galileo_api.get_trace_data(api_url, headers, project_id, trace_id)
+        # Get the latest trace
+        latest_trace = new_traces[0]
+        trace_id = latest_trace.get('id')
 
-            if trace_data:
-                console.print("[bold green]✓ Successfully retrieved trace data[/]")
+        # Get trace details
+        trace_data = galileo_api.get_trace_data(api_url, headers, project_id, trace_id)
 
-                # Check if the trace has spans
-                if 'spans' in trace_data and len(trace_data['spans']) > 0:
-                    console.print(f"[bold green]✓ Trace contains {len(trace_data['spans'])} span(s)[/]")
+        if not trace_data:
+            console.print("[bold yellow]⚠ Could not retrieve trace data[/]")
+            return None
 
-                    # Display span information
-                    for i, span in enumerate(trace_data['spans']):
-                        console.print(f"[bold cyan]Span {i+1}:[/] {span.get('name', 'Unknown')} - {span.get('status', 'Unknown')}")
+        # Check if the trace has spans
+        if 'spans' not in trace_data or len(trace_data['spans']) == 0:
+            console.print("[bold yellow]⚠ Trace does not contain any spans[/]")
+            return None
 
-                    # Check for LangChain-specific information
-                    langchain_found = False
-                    for span in trace_data['spans']:
-                        if 'langchain' in str(span).lower() or 'llm' in str(span).lower():
-                            langchain_found = True
-                            console.print(f"[bold green]✓ Found LangChain-related span: {span.get('name', 'Unknown')}[/]")
+        return new_trace_count, trace_id, trace_data
 
-                    if langchain_found:
-                        console.print("[bold green]✓ LangChain integration is working correctly[/]")
-                    else:
-                        console.print("[bold yellow]⚠ No LangChain-specific spans found[/]")
+    found = polling.eventually(find_new_trace, deadline=65, description="New trace with spans", phase="trace_lookup")
 
-                    return True
-                else:
-                    console.print("[bold yellow]⚠ Trace does not contain any spans[/]")
-            else:
-                console.print("[bold yellow]⚠ Could not retrieve trace data[/]")
+    if not found:
+        console.print("[bold red]✗ No new traces found after running app.py[/]")
+        return False
 
-        if attempt < max_attempts:
-            console.print("[bold cyan]Waiting and trying again...[/]")
-            time.sleep(5)
+    new_trace_count, trace_id, trace_data = found
+    console.print(f"[bold green]✓ Found {new_trace_count} new trace(s)[/]")
+    console.print(f"[bold green]✓ Latest trace ID: {trace_id}[/]")
+    console.print("[bold green]✓ Successfully retrieved trace data[/]")
+    console.print(f"[bold green]✓ Trace contains {len(trace_data['spans'])} span(s)[/]")
+
+    # Display span information
+    for i, span in enumerate(trace_data['spans']):
+        console.print(f"[bold cyan]Span {i+1}:[/] {span.get('name', 'Unknown')} - {span.get('status', 'Unknown')}")
+
+    # Check for LangChain-specific information
+    langchain_found = False
+    for span in trace_data['spans']:
+        if 'langchain' in str(span).lower() or 'llm' in str(span).lower():
+            langchain_found = True
+            console.print(f"[bold green]✓ Found LangChain-related span: {span.get('name', 'Unknown')}[/]")
+
+    if langchain_found:
+        console.print("[bold green]✓ LangChain integration is working correctly[/]")
+    else:
+        console.print("[bold yellow]⚠ No LangChain-specific spans found[/]")
 
-    console.print("[bold red]✗ No new traces found after running app.py[/]")
-    return False
+    return True
 
 def main():
-    """Main function"""
+    """
+    Main function
+
+    Returns:
+        True if the test passed, False otherwise
+    """
     console.print(Panel(
         "[bold blue]Galileo LangChain Integration Test[/]\n\n"
         "This script tests the Galileo LangChain integration by running the app.py script\n"
@@ -165,5 +165,7 @@ def main():
             border_style="red"
         ))
 
+    return success
+
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
@@ -2,12 +2,38 @@
 Galileo Testing Utilities
 
 This package provides reusable utilities for testing with Galileo,
-including API interactions, metrics display, configuration, and prompt running.
+including app running, API interactions, shared clients, metrics display,
+dataset caching, uploads, syncing and deduplication, experiment running,
+exports and comparisons, polling, configuration, prompt running, run-scoped
+resource names, cached resource resolution, shared sessions, statistics, phase
+timings, usage accounting, suite running, sharding, change impact analysis,
+result caching, a stub API server, benchmarks and import time checks.
+
+setup_project and register_scorer are standalone scripts rather than
+submodules, and are not listed in __all__.
+
+Submodules are imported on first access (PEP 562), so a script that only needs
+`config` doesn't pay for importing galileo, openai and numpy.
 """
 
-from . import config
-from . import display
-from . import galileo_api
-from . import prompt_runner
+import importlib
+
+__all__ = [
+    'app_runner', 'benchmark', 'clients', 'config', 'dataset_cache', 'dataset_dedup', 'dataset_sync', 'dataset_upload',
+    'display', 'experiment_compare', 'experiment_export', 'experiment_runner', 'galileo_api', 'impact', 'import_time',
+    'polling', 'prompt_runner', 'resource_cache', 'result_cache', 'run_scope', 'session', 'sharding', 'stats',
+    'stub_server', 'suite_runner', 'terminal', 'timings', 'usage',
+]
+
+def __getattr__(name):
+    """Import a submodule the first time it's accessed as an attribute"""
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['config', 'display', 'galileo_api', 'prompt_runner']
+def __dir__():
+    """List the submodules alongside the package attributes"""
+    return sorted(set(globals()) | set(__all__))
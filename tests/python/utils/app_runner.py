@@ -0,0 +1,408 @@
+"""
+App Runner Utilities
+
+This module provides reusable functions for running sample app scripts from the tests.
+Apps run in a fresh subprocess for full isolation by default. Faster modes are opt-in:
+in a pre-forked warm worker that already has the heavy imports loaded, or in-process with
+runpy (no interpreter startup or repeated heavy imports). In-process runs restore the
+working directory, sys.argv, sys.path and os.environ afterwards, but modules the app
+imports, and SDK singletons such as the Galileo context, stay loaded in the test process.
+
+The mode defaults to HARNESS_APP_MODE ("inprocess", "warm" or "subprocess"; default
+"subprocess"). Every mode returns a subprocess.CompletedProcess, raises
+subprocess.CalledProcessError on failure and subprocess.TimeoutExpired on a timeout, so
+callers handle them all the same way.
+"""
+
+import atexit
+import io
+import multiprocessing
+import os
+import pickle
+import runpy
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+from . import timings
+
+MODES = ("inprocess", "warm", "subprocess")
+
+# Modules the warm worker imports once, before forking a child for each app
+DEFAULT_PRELOAD = ("dotenv", "rich", "openai", "galileo", "galileo.openai", "galileo.datasets", "galileo.experiments", "galileo.prompts")
+
+# In-process runs change the working directory, sys.argv and sys.stdout, which are
+# process-wide, so only one app runs in-process at a time
+_inprocess_lock = threading.Lock()
+_warm_worker = None
+_warm_worker_lock = threading.Lock()
+
+def get_mode(mode=None):
+    """
+    Resolve the app run mode
+
+    Args:
+        mode: An explicit mode (optional)
+
+    Returns:
+        The mode, from the argument, HARNESS_APP_MODE or the "subprocess" default
+    """
+    mode = mode or os.environ.get("HARNESS_APP_MODE", "subprocess")
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown app run mode '{mode}'. Use one of: {', '.join(MODES)}")
+
+    return mode
+
+def _flush_galileo():
+    """Flush traces logged by the app, as the process exit would in subprocess mode"""
+    if "galileo" not in sys.modules:
+        return
+
+    from galileo import galileo_context
+    galileo_context.flush()
+
+class _AppTimeout(BaseException):
+    """Raised inside an in-process app when its timeout expires"""
+
+def _on_alarm(signum, frame):
+    """Interrupt an in-process app whose timeout expired"""
+    raise _AppTimeout()
+
+def _execute(script_path, timeout=None):
+    """
+    Execute a script in the current process with fresh globals, capturing its output
+
+    Args:
+        script_path: Absolute path to the script
+        timeout: Maximum run time in seconds (optional); only enforced on the main thread,
+                 where SIGALRM can interrupt the app
+
+    Returns:
+        A tuple of (returncode, stdout, stderr, timed_out)
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    returncode = 0
+    timed_out = False
+
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    saved_environ = dict(os.environ)
+    script_dir = os.path.dirname(script_path)
+
+    use_alarm = bool(timeout) and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    saved_handler = signal.signal(signal.SIGALRM, _on_alarm) if use_alarm else None
+
+    try:
+        os.chdir(script_dir)
+        sys.argv = [script_path]
+        sys.path.insert(0, script_dir)
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, timeout)
+                # run_path executes the script in a new module namespace, so no globals
+                # leak between apps or into the caller
+                runpy.run_path(script_path, run_name="__main__")
+                _flush_galileo()
+            except _AppTimeout:
+                timed_out = True
+                returncode = 1
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                traceback.print_exc()
+                returncode = 1
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, saved_handler)
+        os.chdir(saved_cwd)
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        # Apps load .env files and set variables such as GALILEO_LOG_STREAM; undo them
+        os.environ.clear()
+        os.environ.update(saved_environ)
+
+    return returncode, stdout.getvalue(), stderr.getvalue(), timed_out
+
+def _completed(script_path, returncode, stdout, stderr, check):
+    """Build a CompletedProcess, raising CalledProcessError on failure if check is set"""
+    args = [sys.executable, script_path]
+
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, args, output=stdout, stderr=stderr)
+
+    return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+def run_inprocess(script_path, check=True, timeout=None):
+    """
+    Run a script in the current process
+
+    Args:
+        script_path: Path to the script
+        check: Whether to raise CalledProcessError on failure (default: True)
+        timeout: Maximum run time in seconds (optional); only enforced when called from
+                 the main thread
+
+    Returns:
+        A subprocess.CompletedProcess with the captured output
+    """
+    script_path = os.path.abspath(script_path)
+
+    with _inprocess_lock:
+        returncode, stdout, stderr, timed_out = _execute(script_path, timeout)
+
+    if timed_out:
+        raise subprocess.TimeoutExpired([sys.executable, script_path], timeout, output=stdout, stderr=stderr)
+
+    return _completed(script_path, returncode, stdout, stderr, check)
+
+def run_subprocess(script_path, check=True, timeout=None):
+    """
+    Run a script in a fresh Python subprocess
+
+    Args:
+        script_path: Path to the script
+        check: Whether to raise CalledProcessError on failure (default: True)
+        timeout: Maximum run time in seconds (optional)
+
+    Returns:
+        A subprocess.CompletedProcess with the captured output
+    """
+    script_path = os.path.abspath(script_path)
+
+    return subprocess.run([sys.executable, script_path], capture_output=True, text=True, check=check, cwd=os.path.dirname(script_path), timeout=timeout)
+
+def _fork_app(script_path, environ):
+    """
+    Fork a child that runs the script and writes the pickled result to a pipe
+
+    Args:
+        script_path: Absolute path to the script
+        environ: The environment the app runs with
+
+    Returns:
+        A tuple of (child pid, read end of the result pipe)
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        # Child: run the app with the caller's environment and report back. os._exit skips
+        # the inherited atexit handlers; the app's Galileo traces are flushed by _execute.
+        os.close(read_fd)
+        try:
+            os.environ.clear()
+            os.environ.update(environ)
+            result = _execute(script_path)
+            with os.fdopen(write_fd, "wb") as pipe:
+                pickle.dump(result, pipe)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    return pid, read_fd
+
+def _wait_for_app(pid, read_fd, timeout):
+    """
+    Read a forked app's result, killing it if it runs past the timeout
+
+    Args:
+        pid: The child pid
+        read_fd: The read end of the result pipe
+        timeout: Maximum run time in seconds (None waits indefinitely)
+
+    Returns:
+        A tuple of (returncode, stdout, stderr, timed_out)
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    chunks = []
+
+    with os.fdopen(read_fd, "rb") as pipe:
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                return -signal.SIGKILL, "", f"App timed out after {timeout} seconds", True
+
+            ready, _, _ = select.select([pipe], [], [], remaining)
+            if not ready:
+                continue
+
+            chunk = os.read(pipe.fileno(), 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    os.waitpid(pid, 0)
+
+    if not chunks:
+        return 1, "", "App process exited without a result", False
+
+    return pickle.loads(b"".join(chunks))
+
+def _warm_worker_main(conn, preload):
+    """
+    Main loop of the warm worker
+
+    Imports the preload modules once, then forks a child for every requested script, so
+    each app starts with the imports loaded but with its own process state.
+    """
+    for module_name in preload:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+
+        if request is None:
+            break
+
+        script_path, environ, timeout = request
+        pid, read_fd = _fork_app(script_path, environ)
+        conn.send(_wait_for_app(pid, read_fd, timeout))
+
+class WarmWorker:
+    """
+    A pre-forked worker process that keeps the heavy imports loaded
+
+    Start it early (e.g. at the beginning of a test, while authentication and ID lookups
+    run) so the imports are done by the time the app runs. Requires the fork start method,
+    so it's available on Linux and macOS only.
+    """
+
+    def __init__(self, preload=DEFAULT_PRELOAD):
+        """
+        Initialize and start the worker
+
+        Args:
+            preload: Modules to import in the worker before any app runs
+        """
+        context = multiprocessing.get_context("fork")
+        self._conn, worker_conn = context.Pipe()
+        self._process = context.Process(target=_warm_worker_main, args=(worker_conn, tuple(preload)), daemon=True)
+        self._process.start()
+        worker_conn.close()
+        self._lock = threading.Lock()
+
+    def run(self, script_path, check=True, timeout=None):
+        """
+        Run a script in a child forked from the warm worker
+
+        The app runs with the caller's current environment, not the one the worker
+        started with.
+
+        Args:
+            script_path: Path to the script
+            check: Whether to raise CalledProcessError on failure (default: True)
+            timeout: Maximum run time in seconds (optional); the app's child is killed
+                     and subprocess.TimeoutExpired raised when it runs longer
+
+        Returns:
+            A subprocess.CompletedProcess with the captured output
+        """
+        script_path = os.path.abspath(script_path)
+
+        with self._lock:
+            try:
+                self._conn.send((script_path, dict(os.environ), timeout))
+                returncode, stdout, stderr, timed_out = self._conn.recv()
+            except (EOFError, BrokenPipeError, OSError):
+                returncode, stdout, stderr, timed_out = 1, "", "The warm worker exited unexpectedly", False
+
+        if timed_out:
+            raise subprocess.TimeoutExpired([sys.executable, script_path], timeout, output=stdout, stderr=stderr)
+
+        return _completed(script_path, returncode, stdout, stderr, check)
+
+    def close(self):
+        """Stop the worker process"""
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+
+def prestart(mode=None):
+    """
+    Start the shared warm worker ahead of time if the warm mode is selected
+
+    Args:
+        mode: An explicit mode (default: HARNESS_APP_MODE)
+    """
+    if get_mode(mode) == "warm":
+        get_warm_worker()
+
+def get_warm_worker():
+    """
+    Get the shared warm worker, starting it on first use
+
+    Returns:
+        The process-wide WarmWorker
+    """
+    global _warm_worker
+
+    with _warm_worker_lock:
+        if _warm_worker is None:
+            _warm_worker = WarmWorker()
+        return _warm_worker
+
+def close_warm_worker():
+    """Stop the shared warm worker, if it was started"""
+    global _warm_worker
+
+    with _warm_worker_lock:
+        if _warm_worker is not None:
+            _warm_worker.close()
+            _warm_worker = None
+
+atexit.register(close_warm_worker)
+
+def run_app(script_path, mode=None, check=True, timeout=None):
+    """
+    Run a sample app script
+
+    Args:
+        script_path: Path to the script
+        mode: "inprocess", "warm" or "subprocess" (default: HARNESS_APP_MODE or "subprocess").
+              The warm mode falls back to a subprocess where fork isn't available.
+        check: Whether to raise CalledProcessError on failure (default: True)
+        timeout: Maximum run time in seconds (optional)
+
+    Returns:
+        A subprocess.CompletedProcess with the captured output
+    """
+    mode = get_mode(mode)
+
+    with timings.phase("app_run", mode=mode):
+        if mode == "inprocess":
+            return run_inprocess(script_path, check=check, timeout=timeout)
+
+        if mode == "warm" and "fork" in multiprocessing.get_all_start_methods():
+            return get_warm_worker().run(script_path, check=check, timeout=timeout)
+
+        return run_subprocess(script_path, check=check, timeout=timeout)
@@ -0,0 +1,185 @@
+"""
+Benchmark Utilities
+
+This module provides reusable functions for benchmarking and load-testing the harness
+against the local stub server, including prompt_runner throughput and the wall time of
+sample apps and test runners.
+
+    python -m tests.python.utils.benchmark --runs 200 --concurrency 8 --latency uniform:0.05,0.15 --seed 1
+    python -m tests.python.utils.benchmark --script tests/python/sdk/openai-wrapper/app.py --repeats 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from rich.table import Table
+
+from . import clients
+from . import prompt_runner
+from . import stub_server
+from .terminal import console
+
+def summarize_durations(durations):
+    """
+    Summarize a list of durations
+
+    Args:
+        durations: Durations in seconds
+
+    Returns:
+        A dictionary with count, mean, p50, p95, p99 and max
+    """
+    values = np.asarray(durations, dtype=float)
+
+    if values.size == 0:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
+
+def benchmark_prompt_runner(base_url, runs=50, concurrency=1, prompt="Say this is a test", model="gpt-4o"):
+    """
+    Benchmark prompt_runner.run_prompt against an OpenAI-compatible endpoint
+
+    Args:
+        base_url: The OpenAI base URL (usually a StubServer's base_url)
+        runs: Number of prompts to run (default: 50)
+        concurrency: Number of concurrent runs (default: 1)
+        prompt: The prompt to run (default: "Say this is a test")
+        model: The model to request (default: "gpt-4o")
+
+    Returns:
+        A dictionary with the duration summary, failures, wall time and throughput
+    """
+    client = clients.get_openai_client(api_key="stub", base_url=base_url)
+
+    def timed_run(_):
+        start_time = time.perf_counter()
+        content = prompt_runner.run_prompt(client, prompt, model, show_status=False)
+        return time.perf_counter() - start_time, content is not None
+
+    # Silence per-run output; it would dominate the measurement
+    quiet = prompt_runner.console.quiet
+    prompt_runner.console.quiet = True
+    try:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(timed_run, range(runs)))
+        wall_time = time.perf_counter() - start_time
+    finally:
+        prompt_runner.console.quiet = quiet
+
+    durations = [duration for duration, _ in results]
+    return {
+        "durations": summarize_durations(durations),
+        "failures": sum(1 for _, ok in results if not ok),
+        "wall_time": wall_time,
+        "throughput": runs / wall_time if wall_time else 0.0,
+    }
+
+def benchmark_script(script_path, base_url, repeats=3, timeout=300):
+    """
+    Benchmark the wall time of a script (a sample app or a test runner) against an endpoint
+
+    The script runs in a subprocess with OPENAI_BASE_URL pointing at base_url, so the
+    OpenAI client it constructs talks to the stub without any code change. Galileo API
+    calls made by the script are not stubbed.
+
+    Args:
+        script_path: Path to the script
+        base_url: The OpenAI base URL (usually a StubServer's base_url)
+        repeats: Number of runs (default: 3)
+        timeout: Per-run timeout in seconds (default: 300)
+
+    Returns:
+        A dictionary with the duration summary and the number of failed runs
+    """
+    script_path = os.path.abspath(script_path)
+    env = dict(os.environ, OPENAI_BASE_URL=base_url)
+    env.setdefault("OPENAI_API_KEY", "stub")
+
+    durations = []
+    failures = 0
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        try:
+            result = subprocess.run([sys.executable, script_path], capture_output=True, text=True, env=env, cwd=os.path.dirname(script_path), timeout=timeout)
+            failures += int(result.returncode != 0)
+        except subprocess.TimeoutExpired:
+            failures += 1
+        durations.append(time.perf_counter() - start_time)
+
+    return {"durations": summarize_durations(durations), "failures": failures}
+
+def display_benchmark(title, result, server_stats=None):
+    """
+    Display a benchmark result
+
+    Args:
+        title: The table title
+        result: A result from benchmark_prompt_runner or benchmark_script
+        server_stats: A StubStats snapshot, used to report harness overhead (optional)
+    """
+    durations = result["durations"]
+
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    table.add_column("Runs", style="cyan")
+    table.add_column("Mean", style="cyan")
+    table.add_column("p50", style="cyan")
+    table.add_column("p95", style="cyan")
+    table.add_column("p99", style="cyan")
+    table.add_column("Max", style="cyan")
+    table.add_column("Failures", style="cyan")
+    table.add_row(
+        str(durations["count"]),
+        f"{durations['mean']:.3f}s",
+        f"{durations['p50']:.3f}s",
+        f"{durations['p95']:.3f}s",
+        f"{durations['p99']:.3f}s",
+        f"{durations['max']:.3f}s",
+        str(result["failures"])
+    )
+    console.print(table)
+
+    if "throughput" in result:
+        console.print(f"[bold cyan]Throughput:[/] {result['throughput']:.1f} runs/s over {result['wall_time']:.2f}s")
+
+    if server_stats and server_stats["requests"]:
+        overhead = durations["mean"] - server_stats["mean_latency"]
+        console.print(f"[bold cyan]Stub latency:[/] {server_stats['mean_latency'] * 1000:.1f} ms mean, "
+                      f"[bold cyan]harness overhead:[/] {overhead * 1000:.1f} ms per run")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the harness against the local OpenAI stub server")
+    parser.add_argument("--runs", type=int, default=50, help="Number of prompt_runner runs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent prompt_runner runs")
+    parser.add_argument("--script", action="append", default=[], help="Script to time against the stub (repeatable)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per script")
+    stub_server.add_config_arguments(parser)
+    args = parser.parse_args()
+
+    with stub_server.StubServer(**stub_server.config_from_args(args)) as server:
+        console.print(f"[bold cyan]Stub server listening on {server.base_url}[/]")
+
+        result = benchmark_prompt_runner(server.base_url, runs=args.runs, concurrency=args.concurrency)
+        display_benchmark(f"prompt_runner.run_prompt (concurrency {args.concurrency})", result, server.stats.snapshot())
+
+        for script_path in args.script:
+            result = benchmark_script(script_path, server.base_url, repeats=args.repeats)
+            display_benchmark(os.path.relpath(script_path), result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Client Utilities
+
+This module provides process-wide shared clients for OpenAI and the Galileo API,
+so that every test run in the same process reuses one set of warm HTTP connections
+and one Galileo logger per project and log stream.
+"""
+
+import atexit
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connection pool settings shared by every client. Idle connections are kept open long
+# enough to survive the gaps between tests (metric waits, app runs) in a suite run.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+KEEPALIVE_EXPIRY = 120
+
+_lock = threading.Lock()
+_openai_clients = {}
+_galileo_loggers = {}
+_httpx_client = None
+_http_session = None
+
+def get_httpx_client():
+    """
+    Get the shared httpx client used by all OpenAI clients
+
+    Returns:
+        A process-wide httpx.Client with keep-alive connection pooling
+    """
+    global _httpx_client
+
+    # Imported here so that Galileo API helpers can share the session without loading OpenAI
+    import httpx
+    from galileo.openai import openai
+
+    with _lock:
+        if _httpx_client is None:
+            _httpx_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=POOL_MAXSIZE,
+                    max_keepalive_connections=POOL_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                )
+            )
+        return _httpx_client
+
+def get_http_session():
+    """
+    Get the shared requests session used for Galileo API calls
+
+    Returns:
+        A process-wide requests.Session with keep-alive connection pooling
+    """
+    global _http_session
+
+    with _lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+def get_galileo_logger(project=None, log_stream=None):
+    """
+    Get the Galileo logger for a project and log stream, initializing it only once
+
+    Args:
+        project: The project name (default: GALILEO_PROJECT)
+        log_stream: The log stream name (default: GALILEO_LOG_STREAM)
+
+    Returns:
+        The Galileo logger instance
+    """
+    from galileo import galileo_context
+
+    project = project or os.environ.get("GALILEO_PROJECT")
+    log_stream = log_stream or os.environ.get("GALILEO_LOG_STREAM")
+    key = (project, log_stream)
+
+    with _lock:
+        logger = _galileo_loggers.get(key)
+        if logger is None:
+            logger = galileo_context.get_logger_instance(project=project, log_stream=log_stream)
+            _galileo_loggers[key] = logger
+        return logger
+
+def get_openai_client(api_key=None, base_url=None, project=None, log_stream=None):
+    """
+    Get a Galileo-wrapped OpenAI client, shared by every caller with the same settings
+
+    Clients are cached per (api_key, base_url, project, log_stream) and all share one
+    pooled HTTP client. The Galileo logger for the project and log stream is initialized
+    along with the client, so the first traced call doesn't pay for it.
+
+    Args:
+        api_key: The OpenAI API key (default: OPENAI_API_KEY)
+        base_url: The OpenAI base URL (default: OPENAI_BASE_URL, or the OpenAI default)
+        project: The Galileo project name (default: GALILEO_PROJECT)
+        log_stream: The Galileo log stream name (default: GALILEO_LOG_STREAM)
+
+    Returns:
+        A Galileo-wrapped openai.OpenAI client
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+    project = project or os.environ.get("GALILEO_PROJECT")
+    log_stream = log_stream or os.environ.get("GALILEO_LOG_STREAM")
+    key = (api_key, base_url, project, log_stream)
+
+    # Check the cache first so that the common case never touches the logger or HTTP client
+    with _lock:
+        client = _openai_clients.get(key)
+    if client is not None:
+        return client
+
+    if project and log_stream:
+        get_galileo_logger(project, log_stream)
+
+    from galileo.openai import openai
+
+    http_client = get_httpx_client()
+
+    with _lock:
+        # Another thread may have created the client while the lock was released
+        client = _openai_clients.get(key)
+        if client is None:
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            _openai_clients[key] = client
+        return client
+
+def close_clients():
+    """Close every shared client and clear the caches"""
+    global _httpx_client, _http_session
+
+    with _lock:
+        _openai_clients.clear()
+        _galileo_loggers.clear()
+
+        if _httpx_client is not None:
+            _httpx_client.close()
+            _httpx_client = None
+
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+atexit.register(close_clients)
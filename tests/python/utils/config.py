@@ -6,11 +6,37 @@ including loading environment variables and checking for required values.
 """
 
 import os
-from rich.console import Console
+import threading
 from rich.panel import Panel
+from .terminal import console
 
-# Initialize rich console
-console = Console()
+_env_lock = threading.Lock()
+_loaded_env_files = set()
+
+def load_environment(dotenv_path=None):
+    """
+    Load environment variables from a .env file, once per process
+
+    Variables already set in the environment are kept. Later calls with the same file are
+    no-ops, so every module can call this without re-reading the file.
+
+    Args:
+        dotenv_path: The .env file path (default: the nearest .env found from the working directory)
+
+    Returns:
+        True if the file was loaded by this call, False if it was already loaded or not found
+    """
+    # Imported here, as most scripts never need it
+    from dotenv import find_dotenv, load_dotenv
+
+    path = os.path.abspath(dotenv_path or find_dotenv(usecwd=True) or ".env")
+
+    with _env_lock:
+        if path in _loaded_env_files:
+            return False
+        _loaded_env_files.add(path)
+
+    return load_dotenv(dotenv_path=path)
 
 def check_environment_variables(required_vars=None):
     """
@@ -0,0 +1,379 @@
+"""
+Dataset Cache Utilities
+
+This module keeps a local columnar copy of Galileo datasets for repeated analysis. Entries
+are stored as Arrow IPC files keyed by dataset ID and version, and memory-mapped on read,
+so loading a cached dataset of any size takes milliseconds and no network transfer.
+
+Syncing is incremental. The dataset's current version is checked first, and an up-to-date
+cache is used as is. If every newer version only appended rows, only those rows are
+fetched. Any other change (edited or removed rows, column changes) refetches the current
+version in full.
+
+Values are stored as strings (other values JSON-encoded), next to each row's ID, index and
+content hash (see row_hash), so a local source can be diffed against the remote rows
+without fetching them again. The manifest records the hashing scheme, and a cache written
+with another scheme is refetched in full.
+
+    python -m tests.python.utils.dataset_cache sync DATASET_ID
+    python -m tests.python.utils.dataset_cache clear [DATASET_ID]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import requests
+
+from . import config
+from . import galileo_api
+from . import session
+from . import timings
+from .terminal import console
+
+# Environment variable overriding the cache directory
+CACHE_DIR_ENV = "HARNESS_DATASET_CACHE_DIR"
+
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_DIR = os.path.join(TESTS_ROOT, ".results", "dataset_cache")
+
+# Columns stored alongside the dataset's own columns
+ROW_ID_COLUMN = "_row_id"
+INDEX_COLUMN = "_index"
+HASH_COLUMN = "_row_hash"
+
+# Version of row_hash's canonical form; bump it whenever the hash of a row can change
+HASH_SCHEME_VERSION = 2
+
+# Version changes that can be applied by fetching only the appended rows
+_NON_APPEND_CHANGES = ("rows_removed", "rows_edited", "columns_added", "columns_removed", "columns_renamed")
+
+def normalize_values(values):
+    """
+    Normalize row values to the strings stored in the cache
+
+    Args:
+        values: A dictionary of row values
+
+    Returns:
+        A dictionary with the same keys; None is kept, strings are unchanged and other
+        values are JSON-encoded
+    """
+    return {
+        key: value if value is None or isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+        for key, value in values.items()
+    }
+
+def row_hash(values):
+    """
+    Hash a row's content
+
+    Args:
+        values: A dictionary of row values
+
+    Returns:
+        The SHA-256 hex digest of the canonical JSON of the normalized values; None values
+        are left out, so a missing value and a null one hash the same
+    """
+    present = {key: value for key, value in normalize_values(values).items() if value is not None}
+    canonical = json.dumps(present, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def entry_values(entry):
+    """
+    Get the values of a dataset content entry
+
+    Args:
+        entry: An entry returned by the dataset content endpoints
+
+    Returns:
+        A dictionary mapping column names to values
+    """
+    values = entry.get("values_dict")
+    if values is None:
+        values = {key: value for key, value in entry.items() if key not in ("row_id", "index", "metadata", "values")}
+    return values
+
+def _schema(columns):
+    """Build the Arrow schema of a cached dataset"""
+    fields = [pa.field(ROW_ID_COLUMN, pa.string()), pa.field(INDEX_COLUMN, pa.int64()), pa.field(HASH_COLUMN, pa.string())]
+    fields.extend(pa.field(column, pa.large_string()) for column in columns)
+    return pa.schema(fields)
+
+def _to_batch(entries, schema, columns):
+    """Convert a page of dataset content entries to a record batch"""
+    data = {name: [] for name in schema.names}
+
+    for entry in entries:
+        values = normalize_values(entry_values(entry))
+        data[ROW_ID_COLUMN].append(entry.get("row_id"))
+        data[INDEX_COLUMN].append(entry.get("index"))
+        data[HASH_COLUMN].append(row_hash(values))
+        for column in columns:
+            data[column].append(values.get(column))
+
+    return pa.RecordBatch.from_pydict(data, schema=schema)
+
+class DatasetCache:
+    """A directory of cached datasets, one subdirectory per dataset ID"""
+
+    def __init__(self, directory=None):
+        """
+        Initialize the cache
+
+        Args:
+            directory: The cache directory (default: HARNESS_DATASET_CACHE_DIR or
+                       tests/python/.results/dataset_cache)
+        """
+        self.directory = directory or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+    def _dataset_dir(self, dataset_id):
+        """Get the directory of a dataset"""
+        return os.path.join(self.directory, dataset_id)
+
+    def path_for(self, dataset_id, version_index):
+        """
+        Get the Arrow file of a dataset version
+
+        Args:
+            dataset_id: The dataset ID
+            version_index: The dataset version
+
+        Returns:
+            The file path
+        """
+        return os.path.join(self._dataset_dir(dataset_id), f"v{version_index}.arrow")
+
+    def manifest(self, dataset_id):
+        """
+        Get the manifest of a cached dataset
+
+        Args:
+            dataset_id: The dataset ID
+
+        Returns:
+            A dictionary with dataset_id, version_index, num_rows, columns, file,
+            hash_version and synced_at, or None if the dataset isn't cached or its hashes
+            were computed with another scheme than HASH_SCHEME_VERSION
+        """
+        try:
+            with open(os.path.join(self._dataset_dir(dataset_id), "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.exists(os.path.join(self._dataset_dir(dataset_id), manifest.get("file", ""))):
+            return None
+
+        # Hashes from another scheme would never match a local row's hash
+        if manifest.get("hash_version") != HASH_SCHEME_VERSION:
+            return None
+
+        return manifest
+
+    def load(self, dataset_id):
+        """
+        Load a cached dataset without copying it into memory
+
+        Args:
+            dataset_id: The dataset ID
+
+        Returns:
+            A pyarrow Table backed by a memory map, or None if the dataset isn't cached
+        """
+        manifest = self.manifest(dataset_id)
+        if manifest is None:
+            return None
+
+        source = pa.memory_map(os.path.join(self._dataset_dir(dataset_id), manifest["file"]), "r")
+        return pa.ipc.open_file(source).read_all()
+
+    def _write(self, dataset_id, version_index, columns, batches):
+        """Write batches as a dataset version, then point the manifest at it"""
+        dataset_dir = self._dataset_dir(dataset_id)
+        os.makedirs(dataset_dir, exist_ok=True)
+
+        path = self.path_for(dataset_id, version_index)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        schema = _schema(columns)
+        num_rows = 0
+
+        try:
+            with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+                    num_rows += batch.num_rows
+        except BaseException:
+            # A failed page fetch (or an interrupt) leaves a partial file behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        os.replace(tmp_path, path)
+
+        manifest = {
+            "dataset_id": dataset_id,
+            "version_index": version_index,
+            "num_rows": num_rows,
+            "columns": columns,
+            "file": os.path.basename(path),
+            "hash_version": HASH_SCHEME_VERSION,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+        }
+        manifest_path = os.path.join(dataset_dir, "manifest.json")
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+        # Older versions are no longer referenced
+        for filename in os.listdir(dataset_dir):
+            if filename.endswith(".arrow") and filename != manifest["file"]:
+                os.remove(os.path.join(dataset_dir, filename))
+
+        return manifest
+
+    def _sync_mode(self, api_url, headers, dataset_id, cached, dataset):
+        """Decide whether a stale cache can be brought up to date by appending rows"""
+        if cached is None or cached["columns"] != list(dataset.get("column_names") or []):
+            return "full"
+
+        versions = galileo_api.get_dataset_versions(api_url, headers, dataset_id)
+        if versions is None:
+            return "full"
+
+        newer = [version for version in versions if version.get("version_index", 0) > cached["version_index"]]
+        if not newer or any(version.get(change) for version in newer for change in _NON_APPEND_CHANGES):
+            return "full"
+
+        return "append"
+
+    def sync(self, api_url, headers, dataset_id, page_size=1000):
+        """
+        Bring a dataset's cache up to date and load it
+
+        Args:
+            api_url: The Galileo API URL
+            headers: The API request headers
+            dataset_id: The dataset ID
+            page_size: Entries per request (default: 1000)
+
+        Returns:
+            A tuple of (table, stats); both are None if the dataset or one of its pages can't
+            be fetched, in which case the cache is left as it was. Otherwise stats has mode
+            ("hit", "append" or "full"), version_index, rows, rows_fetched and elapsed
+        """
+        start_time = time.perf_counter()
+        cached = self.manifest(dataset_id)
+
+        with timings.phase("dataset_cache_sync", dataset=dataset_id):
+            dataset = galileo_api.get_dataset(api_url, headers, dataset_id)
+            if dataset is None:
+                return None, None
+
+            version_index = dataset.get("current_version_index", 0)
+            columns = list(dataset.get("column_names") or (cached["columns"] if cached else []))
+            rows_fetched = 0
+
+            if cached is not None and cached["version_index"] == version_index:
+                mode = "hit"
+            else:
+                mode = self._sync_mode(api_url, headers, dataset_id, cached, dataset)
+                schema = _schema(columns)
+                fetched = []
+
+                def fetch(starting_token):
+                    # Read the exact version checked above, even if the dataset changes meanwhile
+                    for entries in galileo_api.iter_dataset_pages(api_url, headers, None, dataset_id, page_size, starting_token=starting_token, version_index=version_index):
+                        fetched.append(len(entries))
+                        yield _to_batch(entries, schema, columns)
+
+                try:
+                    if mode == "append":
+                        previous = self.load(dataset_id)
+                        manifest = self._write(dataset_id, version_index, columns, _chain(previous.to_batches(), fetch(cached["num_rows"])))
+                    else:
+                        manifest = self._write(dataset_id, version_index, columns, fetch(0))
+
+                    rows_fetched = sum(fetched)
+
+                    # An append that doesn't add up to the dataset's size means the history was misread
+                    expected_rows = dataset.get("num_rows")
+                    if mode == "append" and expected_rows is not None and manifest["num_rows"] != expected_rows:
+                        console.print(f"[bold yellow]⚠ Appended cache has {manifest['num_rows']} rows, expected {expected_rows}. Refetching in full.[/]")
+                        mode = "full"
+                        fetched.clear()
+                        self._write(dataset_id, version_index, columns, fetch(0))
+                        rows_fetched += sum(fetched)
+                except requests.RequestException as e:
+                    console.print(f"[bold red]✗ Could not sync dataset {dataset_id}: {str(e)}[/]")
+                    return None, None
+
+            table = self.load(dataset_id)
+
+        stats = {
+            "mode": mode,
+            "version_index": version_index,
+            "rows": table.num_rows,
+            "rows_fetched": rows_fetched,
+            "elapsed": time.perf_counter() - start_time,
+        }
+        console.print(f"[bold green]✓ Dataset {dataset_id} v{version_index}: {mode}, {stats['rows']:,} rows ({rows_fetched:,} fetched) in {stats['elapsed']:.2f}s[/]")
+
+        return table, stats
+
+    def clear(self, dataset_id=None):
+        """
+        Remove cached datasets
+
+        Args:
+            dataset_id: The dataset to remove (default: every dataset)
+        """
+        path = self._dataset_dir(dataset_id) if dataset_id else self.directory
+        shutil.rmtree(path, ignore_errors=True)
+
+def _chain(*iterables):
+    """Chain iterables lazily"""
+    for iterable in iterables:
+        yield from iterable
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if the command succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Sync Galileo datasets to a local columnar cache")
+    parser.add_argument("--cache-dir", default=None, help="The cache directory (default: HARNESS_DATASET_CACHE_DIR or tests/python/.results/dataset_cache)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="Bring datasets up to date in the cache")
+    sync_parser.add_argument("dataset_ids", nargs="+")
+    sync_parser.add_argument("--page-size", type=int, default=1000, help="Entries per request")
+
+    clear_parser = subparsers.add_parser("clear", help="Remove cached datasets")
+    clear_parser.add_argument("dataset_id", nargs="?", default=None)
+
+    args = parser.parse_args()
+    cache = DatasetCache(args.cache_dir)
+
+    if args.command == "clear":
+        cache.clear(args.dataset_id)
+        console.print(f"[bold green]✓ Cleared {args.dataset_id or 'every dataset'} from {cache.directory}[/]")
+        return True
+
+    config.load_environment()
+    harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY"])
+    if harness_session is None:
+        return False
+
+    return all(cache.sync(harness_session.api_url, harness_session.headers, dataset_id, args.page_size)[0] is not None for dataset_id in args.dataset_ids)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,444 @@
+"""
+Dataset Deduplication Utilities
+
+This module finds exact and near-duplicate rows in a dataset before it is uploaded or run
+as an experiment, where every duplicate costs another LLM call and scorer run.
+
+Each row's text (the values of the chosen columns) is normalized: lowercased, with
+whitespace collapsed. Rows with the same normalized text are exact duplicates and are
+matched by hash. Among the remaining rows, near duplicates are found with MinHash and
+locality-sensitive hashing (LSH):
+
+- Each text is split into overlapping character shingles.
+- A MinHash signature estimates the Jaccard similarity of two rows' shingle sets.
+- Signatures are cut into bands. Rows sharing any band land in the same bucket and
+  become candidates, and a candidate pair is kept when its estimated similarity reaches
+  the threshold. The band shape puts the LSH threshold just below the similarity
+  threshold, so that pairs above it rarely fail to become candidates.
+
+Shingling and hashing run on whole batches of rows at once with numpy. Buckets are
+grouped by hashing, and each row is compared only with the first row of each bucket it
+falls in. The work therefore grows linearly with the number of rows. Matches are merged
+into clusters, and the first row of each cluster is kept.
+
+Duplicates can be dropped, or collapsed into the kept row, which then records how many
+rows it stands for. Either way, a report lists every row removed and the row it
+duplicates.
+
+    python -m tests.python.utils.dataset_dedup eval-set.jsonl --output deduped.jsonl --columns input --threshold 0.8 --report removed.csv
+    python -m tests.python.utils.dataset_dedup --check --threshold 0.8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from rich.table import Table
+
+from . import dataset_upload
+from . import timings
+from .terminal import console
+
+# Default estimated Jaccard similarity at which two rows are near duplicates
+DEFAULT_THRESHOLD = 0.8
+
+# Default number of MinHash permutations
+DEFAULT_NUM_PERM = 128
+
+# Default shingle length, in bytes of normalized text
+DEFAULT_SHINGLE_SIZE = 5
+
+# Rows shingled and hashed at once
+DEFAULT_BATCH_SIZE = 10000
+
+# Column added to kept rows by collapse mode
+DUPLICATE_COUNT_COLUMN = "duplicate_count"
+
+# Multiplier of the rolling shingle hash (the 64-bit FNV prime)
+_FNV_PRIME = np.uint64(1099511628211)
+
+def row_text(row, columns=None):
+    """
+    Get the normalized text of a row
+
+    Args:
+        row: A row dictionary
+        columns: The columns compared (default: every column, in sorted order)
+
+    Returns:
+        The lowercased values of the columns, joined by newlines, with whitespace collapsed
+    """
+    parts = []
+
+    for column in columns if columns is not None else sorted(row):
+        value = row.get(column)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            value = json.dumps(value, sort_keys=True, default=str)
+        parts.append(" ".join(value.lower().split()))
+
+    return "\n".join(parts)
+
+def _band_shape(num_perm, threshold):
+    """Choose the bands and rows per band with the highest LSH threshold not above threshold"""
+    shapes = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+
+    # Pairs at similarity (1 / bands) ** (1 / rows) have an even chance of sharing a band.
+    # Candidates are filtered by their estimated similarity afterwards, so a lower LSH
+    # threshold only costs comparisons, while a higher one misses true duplicates
+    below = [shape for shape in shapes if (1 / shape[0]) ** (1 / shape[1]) <= threshold]
+    return max(below, key=lambda shape: shape[1]) if below else shapes[0]
+
+class MinHasher:
+    """Computes MinHash signatures of texts, a batch at a time"""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """
+        Initialize the hasher
+
+        Args:
+            num_perm: The number of permutations (signature length)
+            shingle_size: The shingle length in bytes
+            seed: The random seed of the permutations; only signatures with the same seed
+                  can be compared
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        # Each permutation is a multiply-shift hash: the top 32 bits of a * hash + b,
+        # with a odd, which avoids a slow 64-bit modulo per shingle
+        self.a = generator.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = generator.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, texts):
+        """
+        Compute the MinHash signatures of texts
+
+        Args:
+            texts: A list of strings
+
+        Returns:
+            A uint32 array with one row per text and num_perm columns
+        """
+        k = self.shingle_size
+        if not texts:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+
+        # Texts shorter than one shingle are padded, so every text has at least one
+        encoded = [text.encode("utf-8").ljust(k) for text in texts]
+        lengths = np.array([len(data) for data in encoded], dtype=np.int64)
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        # Rolling hash of every k-byte window of the batch (uint64 arithmetic wraps)
+        windows = len(buffer) - k + 1
+        hashes = np.zeros(windows, dtype=np.uint64)
+        for offset in range(k):
+            hashes = hashes * _FNV_PRIME + buffer[offset:offset + windows]
+        hashes ^= hashes >> np.uint64(32)
+
+        # Keep the windows that end within the text they start in
+        ends = np.cumsum(lengths)
+        text_of_window = np.repeat(np.arange(len(texts)), lengths)[:windows]
+        hashes = hashes[np.arange(windows) + k <= ends[text_of_window]]
+        shingles = lengths - k + 1
+        offsets = np.cumsum(shingles) - shingles
+
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for permutation in range(self.num_perm):
+            permuted = (self.a[permutation] * hashes + self.b[permutation]) >> np.uint64(32)
+            signatures[:, permutation] = np.minimum.reduceat(permuted, offsets)
+
+        return signatures
+
+def _find(parents, node):
+    """Find a node's cluster root, compressing the path"""
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+    return root
+
+def find_duplicates(texts, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, batch_size=DEFAULT_BATCH_SIZE, seed=1):
+    """
+    Find exact and near-duplicate texts
+
+    Args:
+        texts: A list of normalized texts (see row_text)
+        threshold: The estimated Jaccard similarity at which texts are near duplicates
+        num_perm: The number of MinHash permutations
+        shingle_size: The shingle length in bytes
+        batch_size: Texts hashed at once
+        seed: The random seed of the permutations
+
+    Returns:
+        A tuple of (kept, report): kept is an int array giving, for each text, the index
+        of the text kept in its place (its own index if it is kept), and report is a
+        DataFrame with one row per duplicate: index, kept_index, kind ("exact" or "near")
+        and similarity (estimated, against the kept text)
+    """
+    count = len(texts)
+    kept = np.arange(count)
+
+    with timings.phase("dataset_dedup", rows=count):
+        # Exact duplicates, by hash of the normalized text
+        first_seen = {}
+        unique = []
+        for index, text in enumerate(texts):
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            first = first_seen.setdefault(digest, index)
+            if first == index:
+                unique.append(index)
+            else:
+                kept[index] = first
+        unique = np.array(unique, dtype=np.int64)
+
+        # Near duplicates among the distinct texts
+        hasher = MinHasher(num_perm, shingle_size, seed)
+        signatures = np.empty((len(unique), num_perm), dtype=np.uint32)
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start:start + batch_size]
+            signatures[start:start + len(batch)] = hasher.signatures([texts[index] for index in batch])
+
+        bands, rows_per_band = _band_shape(num_perm, threshold)
+        parents = list(range(len(unique)))
+
+        for band in range(bands):
+            # One 64-bit key per band, grouped by hashing rather than sorting
+            columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+            keys = np.zeros(len(unique), dtype=np.uint64)
+            for column in columns.T:
+                keys = keys * _FNV_PRIME + column
+            codes, _ = pd.factorize(keys)
+
+            # Codes are numbered in order of first appearance, so a row opens a bucket
+            # when its code exceeds every code before it
+            seen = np.maximum.accumulate(np.concatenate(([-1], codes[:-1])))
+            candidates = np.flatnonzero(codes > seen)[codes]
+            members = np.flatnonzero(candidates != np.arange(len(codes)))
+            if not len(members):
+                continue
+
+            similarity = (signatures[members] == signatures[candidates[members]]).mean(axis=1)
+            for member in members[similarity >= threshold]:
+                root, other = _find(parents, member), _find(parents, candidates[member])
+                if root != other:
+                    # The earlier row stays the root, so each cluster keeps its first row
+                    parents[max(root, other)] = min(root, other)
+
+        roots = np.array([_find(parents, position) for position in range(len(unique))], dtype=np.int64)
+        kept[unique] = unique[roots]
+        # Exact duplicates follow the row they duplicate
+        kept = kept[kept]
+
+    duplicates = np.flatnonzero(kept != np.arange(count))
+    positions = np.full(count, -1, dtype=np.int64)
+    positions[unique] = np.arange(len(unique))
+    exact = positions[duplicates] < 0
+
+    similarity = np.ones(len(duplicates))
+    near = duplicates[~exact]
+    if len(near):
+        similarity[~exact] = (signatures[positions[near]] == signatures[positions[kept[near]]]).mean(axis=1)
+
+    report = pd.DataFrame({
+        "index": duplicates,
+        "kept_index": kept[duplicates],
+        "kind": np.where(exact, "exact", "near"),
+        "similarity": similarity,
+    })
+    return kept, report
+
+def deduplicate_rows(rows, columns=None, mode="drop", threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """
+    Remove exact and near-duplicate rows
+
+    Args:
+        rows: A list of row dictionaries
+        columns: The columns compared (default: every column)
+        mode: "drop" to remove duplicates, or "collapse" to also count them on the kept
+              row, in a duplicate_count column (default: "drop")
+        threshold: The estimated Jaccard similarity at which rows are near duplicates
+        num_perm: The number of MinHash permutations
+        shingle_size: The shingle length in bytes
+
+    Returns:
+        A tuple of (kept rows, report); the report is a DataFrame as returned by
+        find_duplicates
+    """
+    if mode not in ("drop", "collapse"):
+        raise ValueError(f"Unsupported mode '{mode}'. Use drop or collapse.")
+
+    kept, report = find_duplicates([row_text(row, columns) for row in rows], threshold, num_perm, shingle_size)
+    is_kept = kept == np.arange(len(rows))
+
+    result = []
+    if mode == "collapse":
+        counts = np.bincount(kept, minlength=len(rows))
+        for index in np.flatnonzero(is_kept):
+            row = dict(rows[index])
+            row[DUPLICATE_COUNT_COLUMN] = int(counts[index])
+            result.append(row)
+    else:
+        result = [rows[index] for index in np.flatnonzero(is_kept)]
+
+    return result, report
+
+def display_report(report, rows, columns=None, top=10):
+    """
+    Display the duplicates found
+
+    Args:
+        report: A DataFrame from find_duplicates
+        rows: The rows deduplicated
+        columns: The columns compared
+        top: The number of removed rows shown (default: 10)
+    """
+    exact = int((report["kind"] == "exact").sum())
+    console.print(f"[bold cyan]Found {len(report):,} duplicates in {len(rows):,} rows ({exact:,} exact, {len(report) - exact:,} near)[/]")
+
+    if report.empty:
+        return
+
+    table = Table(title="Removed Rows", show_header=True, header_style="bold cyan")
+    table.add_column("Row", style="cyan", justify="right")
+    table.add_column("Kept Row", style="cyan", justify="right")
+    table.add_column("Kind", style="cyan")
+    table.add_column("Similarity", style="cyan", justify="right")
+    table.add_column("Text", style="cyan", overflow="ellipsis", max_width=40, no_wrap=True)
+
+    for _, duplicate in report.head(top).iterrows():
+        table.add_row(
+            str(duplicate["index"]),
+            str(duplicate["kept_index"]),
+            duplicate["kind"],
+            f"{duplicate['similarity']:.2f}",
+            row_text(rows[duplicate["index"]], columns),
+        )
+
+    console.print(table)
+
+def write_rows(rows, path):
+    """
+    Write rows to a JSONL, CSV or Parquet file
+
+    Args:
+        rows: A list of row dictionaries
+        path: The output file; the format follows the extension
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    file_format = dataset_upload.detect_format(path)
+
+    if file_format == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+    elif file_format == "csv":
+        pd.DataFrame(rows).to_csv(path, index=False)
+    else:
+        pd.DataFrame(rows).to_parquet(path, index=False)
+
+def check(threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, pairs=400, min_recall=0.95, seed=0):
+    """
+    Check that near-duplicate pairs above the threshold are found
+
+    Each pair is a random text and a copy with a few characters changed, for a true
+    Jaccard similarity of about 0.83 with the default shingle size. Of the pairs whose
+    estimated similarity reaches the threshold, find_duplicates must match at least
+    min_recall.
+
+    Args:
+        threshold: The estimated Jaccard similarity at which texts are near duplicates
+        num_perm: The number of MinHash permutations
+        shingle_size: The shingle length in bytes
+        pairs: The number of synthetic pairs (default: 400)
+        min_recall: The share of pairs above the threshold that must be found (default: 0.95)
+        seed: The random seed of the synthetic texts (default: 0)
+
+    Returns:
+        True if enough pairs were found, False otherwise
+    """
+    generator = np.random.default_rng(seed)
+    alphabet = np.array(list("abcdefghijklmnopqrstuvwxyz "))
+    texts = []
+
+    for _ in range(pairs):
+        original = generator.choice(alphabet, 300)
+        changed = original.copy()
+        changed[generator.choice(len(changed), 6, replace=False)] = generator.choice(alphabet, 6)
+        texts.extend(["".join(original), "".join(changed)])
+
+    kept, _ = find_duplicates(texts, threshold, num_perm, shingle_size)
+
+    signatures = MinHasher(num_perm, shingle_size).signatures(texts)
+    similarity = (signatures[0::2] == signatures[1::2]).mean(axis=1)
+    above = np.flatnonzero(similarity >= threshold)
+    found = int(np.sum(kept[above * 2 + 1] == above * 2))
+
+    bands, rows_per_band = _band_shape(num_perm, threshold)
+    recall = found / len(above) if len(above) else 1.0
+    console.print(f"[bold cyan]{bands} bands of {rows_per_band} rows: found {found} of {len(above)} pairs with estimated similarity ≥ {threshold} ({recall:.1%})[/]")
+
+    if recall < min_recall:
+        console.print(f"[bold red]✗ Recall is below {min_recall:.0%}[/]")
+        return False
+
+    console.print(f"[bold green]✓ Recall is at least {min_recall:.0%}[/]")
+    return True
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if deduplication (or the check) succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Find exact and near-duplicate dataset rows and remove them")
+    parser.add_argument("path", nargs="?", default=None, help="A JSONL, CSV or Parquet file of rows")
+    parser.add_argument("--output", default=None, help="Write the deduplicated rows to this file (default: only report)")
+    parser.add_argument("--report", default=None, help="Write the removed rows to this CSV file")
+    parser.add_argument("--columns", action="append", default=None, help="A column compared (repeatable, default: every column)")
+    parser.add_argument("--mode", choices=("drop", "collapse"), default="drop", help="Drop duplicates, or collapse them into a duplicate_count on the kept row")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Estimated Jaccard similarity of near duplicates")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="MinHash permutations")
+    parser.add_argument("--shingle-size", type=int, default=DEFAULT_SHINGLE_SIZE, help="Shingle length in bytes")
+    parser.add_argument("--check", action="store_true", help="Check that synthetic near-duplicate pairs above the threshold are found, instead of deduplicating")
+    args = parser.parse_args()
+
+    if args.check:
+        return check(args.threshold, args.num_perm, args.shingle_size)
+
+    if args.path is None:
+        parser.error("the path is required unless --check is given")
+
+    try:
+        rows = list(dataset_upload.read_rows(args.path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]✗ Could not read {args.path}: {str(e)}[/]")
+        return False
+
+    try:
+        kept_rows, report = deduplicate_rows(rows, args.columns, args.mode, args.threshold, args.num_perm, args.shingle_size)
+    except ValueError as e:
+        console.print(f"[bold red]✗ {str(e)}[/]")
+        return False
+
+    display_report(report, rows, args.columns)
+
+    if args.report:
+        report.to_csv(args.report, index=False)
+        console.print(f"[bold green]✓ Removed rows written to {args.report}[/]")
+
+    if args.output:
+        write_rows(kept_rows, args.output)
+        console.print(f"[bold green]✓ {len(kept_rows):,} rows written to {args.output}[/]")
+
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,374 @@
+"""
+Dataset Sync Utilities
+
+This module brings an existing Galileo dataset in line with a local JSONL, CSV or Parquet
+file by sending only the rows that changed. Each local row is hashed (see
+dataset_cache.row_hash) and compared against the hashes of the remote rows, taken from
+the local dataset cache (kept current incrementally) or from freshly fetched entries.
+The differences are sent as batched content edits: update_row, delete_row and
+append_row. Unchanged rows are never sent. The dataset's ETag is taken before the remote
+rows are read and sent as If-Match with the first batch, so if the dataset changes after
+the diff was computed, the sync fails instead of applying stale edits.
+
+Rows are matched by a key column when one is given (e.g. a question ID). Otherwise they
+are matched by content: identical rows pair up, and the remaining remote rows are
+updated in place with the remaining local rows, then deleted or appended as needed.
+
+The file is read twice, first to hash it and then to encode the changed rows, so memory
+holds one hash per row rather than the rows themselves.
+
+    python -m tests.python.utils.dataset_sync eval-set.jsonl --name eval-set --key id
+    python -m tests.python.utils.dataset_sync eval-set.jsonl --dataset-id DATASET_ID --dry-run
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict, deque
+
+from . import config
+from . import dataset_cache
+from . import dataset_upload
+from . import galileo_api
+from . import session
+from . import timings
+from .terminal import console
+
+# Maximum edits per request
+DEFAULT_BATCH_SIZE = 500
+
+class SyncError(Exception):
+    """Raised when a local file can't be synced to a dataset"""
+
+def _key_value(values, key):
+    """Get a row's key as stored in the cache, so local and remote keys compare equal"""
+    return dataset_cache.normalize_values({key: values.get(key)})[key]
+
+def local_manifest(path, file_format=None, key=None):
+    """
+    Hash the rows of a local file
+
+    Args:
+        path: A JSONL, CSV or Parquet file
+        file_format: "jsonl", "csv" or "parquet" (default: from the extension)
+        key: A column identifying rows (optional)
+
+    Returns:
+        A dictionary with hashes and keys (None without a key column), one per row in
+        file order, and columns, the set of columns used by any row
+    """
+    hashes = []
+    keys = [] if key else None
+    columns = set()
+
+    for row in dataset_upload.read_rows(path, file_format):
+        values = dataset_upload.to_row_values(row)
+        hashes.append(dataset_cache.row_hash(values))
+        columns.update(column for column, value in values.items() if value is not None)
+        if key:
+            keys.append(_key_value(values, key))
+
+    return {"hashes": hashes, "keys": keys, "columns": columns}
+
+def remote_manifest(api_url, headers, dataset_id, key=None, cache=None, page_size=1000):
+    """
+    Get the row IDs and hashes of a dataset
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        key: A column identifying rows (optional)
+        cache: A DatasetCache to read the rows from, synced first (default: fetch and hash
+               every entry)
+        page_size: Entries per request (default: 1000)
+
+    Returns:
+        A dictionary with row_ids, hashes and keys (None without a key column) in dataset
+        order, and columns, or None if the dataset can't be fetched
+    """
+    if cache is not None:
+        table, _ = cache.sync(api_url, headers, dataset_id, page_size)
+        if table is None:
+            return None
+
+        columns = set(table.column_names) - {dataset_cache.ROW_ID_COLUMN, dataset_cache.INDEX_COLUMN, dataset_cache.HASH_COLUMN}
+        if key and key not in columns:
+            raise SyncError(f"Dataset {dataset_id} has no column '{key}'")
+
+        return {
+            "row_ids": table.column(dataset_cache.ROW_ID_COLUMN).to_pylist(),
+            "hashes": table.column(dataset_cache.HASH_COLUMN).to_pylist(),
+            "keys": table.column(key).to_pylist() if key else None,
+            "columns": columns,
+        }
+
+    dataset = galileo_api.get_dataset(api_url, headers, dataset_id)
+    if dataset is None:
+        return None
+
+    manifest = {"row_ids": [], "hashes": [], "keys": [] if key else None, "columns": set(dataset.get("column_names") or [])}
+
+    with timings.phase("dataset_sync_fetch", dataset=dataset_id):
+        for entry in galileo_api.iter_dataset_entries(api_url, headers, None, dataset_id, page_size):
+            values = dataset_cache.entry_values(entry)
+            manifest["row_ids"].append(entry.get("row_id"))
+            manifest["hashes"].append(dataset_cache.row_hash(values))
+            if key:
+                manifest["keys"].append(_key_value(values, key))
+
+    return manifest
+
+def diff_manifests(local, remote):
+    """
+    Work out the edits that turn the remote rows into the local ones
+
+    Args:
+        local: The result of local_manifest
+        remote: The result of remote_manifest, with the same key column
+
+    Returns:
+        A dictionary with updates (a list of (row_id, local position) pairs), deletes (a
+        list of row IDs), inserts (a list of local positions) and unchanged (a count)
+    """
+    if local["keys"] is not None:
+        return _diff_by_key(local, remote)
+
+    # Pair identical rows, consuming remote duplicates one at a time
+    remote_by_hash = defaultdict(deque)
+    for row_id, row_hash in zip(remote["row_ids"], remote["hashes"]):
+        remote_by_hash[row_hash].append(row_id)
+
+    unmatched = []
+    unchanged = 0
+    for position, row_hash in enumerate(local["hashes"]):
+        if remote_by_hash.get(row_hash):
+            remote_by_hash[row_hash].popleft()
+            unchanged += 1
+        else:
+            unmatched.append(position)
+
+    # Rewrite the leftover remote rows in place before deleting or appending any
+    leftover = set(row_id for row_ids in remote_by_hash.values() for row_id in row_ids)
+    leftover = [row_id for row_id in remote["row_ids"] if row_id in leftover]
+    paired = min(len(leftover), len(unmatched))
+
+    return {
+        "updates": list(zip(leftover[:paired], unmatched[:paired])),
+        "deletes": leftover[paired:],
+        "inserts": unmatched[paired:],
+        "unchanged": unchanged,
+    }
+
+def _diff_by_key(local, remote):
+    """Diff two manifests whose rows are identified by a key column"""
+    remote_rows = {}
+    for row_id, row_key, row_hash in zip(remote["row_ids"], remote["keys"], remote["hashes"]):
+        if row_key in remote_rows:
+            raise SyncError(f"Key '{row_key}' appears more than once in the dataset")
+        remote_rows[row_key] = (row_id, row_hash)
+
+    updates, inserts = [], []
+    seen = set()
+    unchanged = 0
+
+    for position, (row_key, row_hash) in enumerate(zip(local["keys"], local["hashes"])):
+        if row_key in seen:
+            raise SyncError(f"Key '{row_key}' appears more than once in the file")
+        seen.add(row_key)
+
+        if row_key not in remote_rows:
+            inserts.append(position)
+        elif remote_rows[row_key][1] != row_hash:
+            updates.append((remote_rows[row_key][0], position))
+        else:
+            unchanged += 1
+
+    deletes = [row_id for row_key, (row_id, _) in remote_rows.items() if row_key not in seen]
+
+    return {"updates": updates, "deletes": deletes, "inserts": inserts, "unchanged": unchanged}
+
+def iter_edits(path, plan, file_format=None):
+    """
+    Build the content edits of a plan, reading the changed rows from the file
+
+    Args:
+        path: The file the plan was computed from
+        plan: The result of diff_manifests
+        file_format: "jsonl", "csv" or "parquet" (default: from the extension)
+
+    Yields:
+        Edit dictionaries: deletes first, then updates and appends in file order
+    """
+    for row_id in plan["deletes"]:
+        yield {"edit_type": "delete_row", "row_id": row_id}
+
+    if not plan["updates"] and not plan["inserts"]:
+        return
+
+    updates = {position: row_id for row_id, position in plan["updates"]}
+    inserts = set(plan["inserts"])
+
+    for position, row in enumerate(dataset_upload.read_rows(path, file_format)):
+        if position in updates:
+            yield {"edit_type": "update_row", "row_id": updates[position], "values": dataset_upload.to_row_values(row)}
+        elif position in inserts:
+            yield {"edit_type": "append_row", "values": dataset_upload.to_row_values(row)}
+
+def batch_edits(edits, batch_size=DEFAULT_BATCH_SIZE, max_bytes=dataset_upload.MAX_CHUNK_BYTES):
+    """
+    Group edits into batches bounded by count and encoded size
+
+    Args:
+        edits: An iterable of edit dictionaries
+        batch_size: Maximum edits per batch (default: DEFAULT_BATCH_SIZE)
+        max_bytes: Maximum encoded JSON size per batch (default: MAX_CHUNK_BYTES)
+
+    Yields:
+        Lists of edits
+    """
+    batch = []
+    size = 0
+
+    for edit in edits:
+        edit_size = len(json.dumps(edit, default=str))
+
+        if batch and (len(batch) >= batch_size or size + edit_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+
+        batch.append(edit)
+        size += edit_size
+
+    if batch:
+        yield batch
+
+def sync_dataset(api_url, headers, path, dataset_id, key=None, file_format=None, cache=None, batch_size=DEFAULT_BATCH_SIZE, max_attempts=dataset_upload.DEFAULT_MAX_ATTEMPTS, dry_run=False):
+    """
+    Send only the changed rows of a file to an existing dataset
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        path: A JSONL, CSV or Parquet file
+        dataset_id: The dataset ID
+        key: A column identifying rows (default: match rows by content)
+        file_format: "jsonl", "csv" or "parquet" (default: from the extension)
+        cache: A DatasetCache holding the remote rows (default: fetch every entry)
+        batch_size: Maximum edits per request (default: DEFAULT_BATCH_SIZE)
+        max_attempts: Attempts per batch (default: DEFAULT_MAX_ATTEMPTS)
+        dry_run: Whether to only report the changes (default: False)
+
+    Returns:
+        A dictionary with unchanged, updated, deleted, inserted, batches, bytes_sent and
+        elapsed
+    """
+    start_time = time.perf_counter()
+
+    with timings.phase("dataset_sync_diff", dataset=dataset_id):
+        local = local_manifest(path, file_format, key)
+        # The version the remote rows are read from: taken first, so any later change makes
+        # the edits fail with 412 rather than apply to rows the diff never saw
+        etag = dataset_upload.get_dataset_etag(api_url, headers, dataset_id)
+        remote = remote_manifest(api_url, headers, dataset_id, key, cache)
+        if remote is None:
+            raise SyncError(f"Could not fetch dataset {dataset_id}")
+
+        # Content edits can't add columns, so a file with new columns needs a new dataset
+        new_columns = local["columns"] - remote["columns"]
+        if new_columns:
+            raise SyncError(f"The file has columns the dataset doesn't: {', '.join(sorted(new_columns))}. Create a new dataset instead.")
+
+        plan = diff_manifests(local, remote)
+
+    stats = {
+        "unchanged": plan["unchanged"],
+        "updated": len(plan["updates"]),
+        "deleted": len(plan["deletes"]),
+        "inserted": len(plan["inserts"]),
+        "batches": 0,
+        "bytes_sent": 0,
+        "elapsed": 0.0,
+    }
+    changed = stats["updated"] + stats["deleted"] + stats["inserted"]
+
+    console.print(
+        f"[bold cyan]{path} vs dataset {dataset_id}: {stats['unchanged']:,} unchanged, {stats['updated']:,} to update, "
+        f"{stats['deleted']:,} to delete, {stats['inserted']:,} to append[/]"
+    )
+
+    if changed and not dry_run:
+        if etag is None:
+            console.print(f"[bold yellow]⚠ Could not get the version of dataset {dataset_id}; edits are sent without a version check[/]")
+
+        for batch in batch_edits(iter_edits(path, plan, file_format), batch_size):
+            body = dataset_upload.encode_edits_body(batch)
+            with timings.phase("dataset_sync_batch", edits=len(batch)):
+                etag, _ = dataset_upload.apply_edits(api_url, headers, dataset_id, body, etag, max_attempts, refresh_on_conflict=False)
+            stats["batches"] += 1
+            stats["bytes_sent"] += len(body)
+
+    stats["elapsed"] = time.perf_counter() - start_time
+
+    if dry_run:
+        console.print(f"[bold yellow]⚠ Dry run: {changed:,} changed rows not sent[/]")
+    elif not changed:
+        console.print(f"[bold green]✓ Dataset {dataset_id} already matches {path}[/]")
+    else:
+        console.print(f"[bold green]✓ Synced {changed:,} changed rows in {stats['batches']} batches ({stats['bytes_sent'] / 1024:,.0f} KiB) in {stats['elapsed']:.1f}s[/]")
+
+    return stats
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if the sync succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Send only the changed rows of a local file to a Galileo dataset")
+    parser.add_argument("path", help="The dataset file")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--dataset-id", default=None, help="The dataset to sync")
+    target.add_argument("--name", default=None, help="The dataset to sync, by name in the session project; created from the file if it doesn't exist")
+    parser.add_argument("--key", default=None, help="A column identifying rows (default: match rows by content)")
+    parser.add_argument("--format", choices=dataset_upload.FORMATS, default=None, help="The file format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Maximum edits per request")
+    parser.add_argument("--no-cache", action="store_true", help="Fetch every remote entry instead of using the local dataset cache")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the changes")
+    args = parser.parse_args()
+
+    config.load_environment()
+    harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY"])
+    if harness_session is None:
+        return False
+
+    api_url, headers = harness_session.api_url, harness_session.headers
+    dataset_id = args.dataset_id
+
+    try:
+        if dataset_id is None:
+            project_id, _ = harness_session.resolve()
+            dataset = galileo_api.find_dataset(api_url, headers, project_id, args.name) if project_id else None
+
+            if dataset is None:
+                if args.dry_run:
+                    console.print(f"[bold yellow]⚠ Dry run: dataset {args.name} doesn't exist and would be created[/]")
+                    return True
+                console.print(f"[bold cyan]Dataset {args.name} doesn't exist, creating it from {args.path}...[/]")
+                dataset_upload.upload_dataset(api_url, headers, args.path, args.name, file_format=args.format, project_id=project_id)
+                return True
+
+            dataset_id = dataset.get("id")
+
+        cache = None if args.no_cache else dataset_cache.DatasetCache()
+        sync_dataset(api_url, headers, args.path, dataset_id, key=args.key, file_format=args.format, cache=cache, batch_size=args.batch_size, dry_run=args.dry_run)
+    except (SyncError, dataset_upload.UploadError, ValueError, OSError) as e:
+        console.print(f"[bold red]✗ {e}[/]")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
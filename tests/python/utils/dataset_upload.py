@@ -0,0 +1,508 @@
+"""
+Dataset Upload Utilities
+
+This module streams large datasets to Galileo from JSONL, CSV or Parquet files. Rows are
+read lazily and grouped into bounded chunks. The first chunk creates the dataset and the
+rest are appended, so peak memory depends on the chunk size, not on the file size. A file
+without rows is rejected rather than creating nothing.
+
+Reading and encoding run in a background thread, a few chunks ahead of the uploads. The
+appends themselves are sent one at a time: every content edit must carry the dataset's
+current version (ETag, sent as If-Match), so parallel appends would conflict with each
+other. A failed chunk, the first one included, is retried on its own with backoff. Before
+an append is retried, the dataset version is checked, so a chunk that was applied even
+though its response was lost isn't sent twice.
+
+    python -m tests.python.utils.dataset_upload eval-set.jsonl --name eval-set --chunk-size 2000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+from . import clients
+from . import config
+from . import galileo_api
+from . import polling
+from . import session
+from . import timings
+from .terminal import console
+
+# Default number of rows per chunk
+DEFAULT_CHUNK_SIZE = 1000
+
+# Chunks are also cut at this encoded size, so rows with long text don't make huge requests
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Number of encoded chunks read ahead of the upload
+DEFAULT_PREFETCH = 2
+
+# Attempts per chunk before the upload fails
+DEFAULT_MAX_ATTEMPTS = 4
+
+FORMATS = ("jsonl", "csv", "parquet")
+
+class UploadError(Exception):
+    """Raised when a chunk can't be uploaded after all its attempts"""
+
+def detect_format(path):
+    """
+    Get a file's dataset format from its extension
+
+    Args:
+        path: The file path
+
+    Returns:
+        "jsonl", "csv" or "parquet"
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    formats = {"jsonl": "jsonl", "ndjson": "jsonl", "csv": "csv", "parquet": "parquet", "pq": "parquet"}
+
+    if extension not in formats:
+        raise ValueError(f"Unsupported dataset file '{path}'. Use one of: {', '.join(FORMATS)}")
+
+    return formats[extension]
+
+def read_rows(path, file_format=None, batch_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read dataset rows from a file, one at a time
+
+    Args:
+        path: A JSONL, CSV or Parquet file
+        file_format: "jsonl", "csv" or "parquet" (default: from the extension)
+        batch_size: Rows decoded at once from Parquet files (default: DEFAULT_CHUNK_SIZE)
+
+    Yields:
+        Row dictionaries
+    """
+    file_format = file_format or detect_format(path)
+
+    if file_format == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+
+    elif file_format == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    elif file_format == "parquet":
+        # Imported here, as pyarrow is only needed for Parquet files
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+
+    else:
+        raise ValueError(f"Unsupported format '{file_format}'. Use one of: {', '.join(FORMATS)}")
+
+def to_row_values(row):
+    """
+    Convert a row to dataset values
+
+    Args:
+        row: A row dictionary
+
+    Returns:
+        A dictionary of scalar values; nested values are JSON-encoded, and ground_truth is
+        renamed to output as the Galileo SDK does
+    """
+    values = {}
+
+    for key, value in row.items():
+        if key == "ground_truth" and "output" not in row:
+            key = "output"
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True, default=str)
+        values[key] = value
+
+    return values
+
+def iter_chunks(rows, chunk_size=DEFAULT_CHUNK_SIZE, max_bytes=MAX_CHUNK_BYTES):
+    """
+    Group rows into chunks bounded by row count and encoded size
+
+    Args:
+        rows: An iterable of row dictionaries
+        chunk_size: Maximum rows per chunk (default: DEFAULT_CHUNK_SIZE)
+        max_bytes: Maximum encoded JSON size per chunk (default: MAX_CHUNK_BYTES)
+
+    Yields:
+        Lists of row values (see to_row_values)
+    """
+    chunk = []
+    size = 0
+
+    for row in rows:
+        values = to_row_values(row)
+        row_size = len(json.dumps(values, default=str))
+
+        if chunk and (len(chunk) >= chunk_size or size + row_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+
+        chunk.append(values)
+        size += row_size
+
+    if chunk:
+        yield chunk
+
+def encode_create_body(chunk):
+    """Encode rows as the JSONL file that creates a dataset"""
+    return "".join(json.dumps(values, default=str) + "\n" for values in chunk).encode("utf-8")
+
+def encode_edits_body(edits):
+    """Encode content edits (append_row, update_row or delete_row) as a request body"""
+    return json.dumps({"edits": edits}, default=str).encode("utf-8")
+
+def encode_append_body(chunk):
+    """Encode rows as a content edit that appends them"""
+    return encode_edits_body([{"edit_type": "append_row", "values": values} for values in chunk])
+
+def create_dataset(api_url, headers, name, body, project_id=None):
+    """
+    Create a dataset from an encoded JSONL body
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        name: The dataset name
+        body: The JSONL file content (see encode_create_body)
+        project_id: A project to associate the dataset with (optional)
+
+    Returns:
+        The created dataset dictionary, or None if creation fails
+    """
+    dataset, _ = _send_create(api_url, headers, name, body, project_id)
+    return dataset
+
+def _send_create(api_url, headers, name, body, project_id=None):
+    """Send the create request, returning (dataset or None, status code)"""
+    data = {"name": name}
+    if project_id:
+        data["project_id"] = project_id
+
+    # Let requests set the multipart Content-Type
+    request_headers = {key: value for key, value in headers.items() if key.lower() != "content-type"}
+
+    response = clients.get_http_session().post(
+        f"{api_url}/datasets", headers=request_headers, params={"format": "jsonl"},
+        data=data, files={"file": (f"{name}.jsonl", io.BytesIO(body), "application/jsonl")},
+    )
+
+    if response.status_code in (200, 201):
+        return response.json(), response.status_code
+
+    console.print(f"[bold red]✗ Error creating dataset: {response.status_code}[/]")
+    console.print(f"[red]{response.text}[/]")
+    return None, response.status_code
+
+def create_dataset_with_retry(api_url, headers, name, body, project_id=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Create a dataset from the first chunk, retrying it like an append
+
+    Client errors other than timeouts and rate limits (a taken name, an invalid file) fail
+    at once. If an earlier attempt was applied and only its response was lost, the retry
+    is rejected because the name is taken. The dataset is then looked up by name and
+    returned, so the upload goes on appending to it instead of creating a second one.
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        name: The dataset name
+        body: The JSONL file content (see encode_create_body)
+        project_id: A project to associate the dataset with (optional)
+        max_attempts: Attempts before failing (default: DEFAULT_MAX_ATTEMPTS)
+
+    Returns:
+        A tuple of (created dataset dictionary, attempts)
+    """
+    intervals = polling.exponential_backoff(initial=1, max_interval=15)
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            dataset, status = _send_create(api_url, headers, name, body, project_id)
+        except Exception as e:
+            dataset, status = None, str(e)
+
+        if dataset:
+            return dataset, attempt
+
+        if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+            # After a failed attempt, a rejected retry most likely means that attempt
+            # created the dataset; on the first attempt the name was already taken
+            if attempt > 1:
+                dataset = galileo_api.find_dataset_by_name(api_url, headers, name)
+                if dataset:
+                    console.print(f"[bold yellow]⚠ Dataset '{name}' was created by an earlier attempt; continuing with it[/]")
+                    return dataset, attempt
+            break
+
+        if attempt == max_attempts:
+            break
+
+        console.print(f"[bold yellow]⚠ Creating dataset '{name}' failed ({status}), retrying (attempt {attempt + 1}/{max_attempts})...[/]")
+        time.sleep(next(intervals))
+
+    raise UploadError(f"Could not create dataset '{name}' after {attempt} attempts (last status: {status})")
+
+def get_dataset_etag(api_url, headers, dataset_id):
+    """
+    Get the version tag that content edits must send as If-Match
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+
+    Returns:
+        The ETag, or None if it can't be fetched
+    """
+    response = clients.get_http_session().get(f"{api_url}/datasets/{dataset_id}/content", headers=headers, params={"starting_token": 0, "limit": 1})
+
+    if response.status_code != 200:
+        return None
+
+    return response.headers.get("ETag")
+
+def append_chunk(api_url, headers, dataset_id, body, etag):
+    """
+    Send one append edit
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        body: The encoded edit (see encode_append_body)
+        etag: The current dataset version
+
+    Returns:
+        A tuple of (succeeded, new ETag or None, status code)
+    """
+    request_headers = dict(headers)
+    request_headers["Content-Type"] = "application/json"
+    if etag:
+        request_headers["If-Match"] = etag
+
+    response = clients.get_http_session().patch(f"{api_url}/datasets/{dataset_id}/content", headers=request_headers, data=body)
+
+    return response.status_code in (200, 204), response.headers.get("ETag"), response.status_code
+
+class _ChunkReader:
+    """Reads and encodes chunks in a background thread, a bounded number ahead"""
+
+    _done = object()
+
+    def __init__(self, rows, chunk_size, prefetch):
+        """
+        Initialize and start the reader
+
+        Args:
+            rows: An iterable of row dictionaries
+            chunk_size: Maximum rows per chunk
+            prefetch: Maximum chunks waiting to be uploaded
+        """
+        self.queue = queue.Queue(maxsize=max(1, prefetch))
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._read, args=(rows, chunk_size), daemon=True)
+        self.thread.start()
+
+    def _read(self, rows, chunk_size):
+        """Fill the queue with (row count, chunk) pairs"""
+        try:
+            for chunk in iter_chunks(rows, chunk_size):
+                while not self.stopped.is_set():
+                    try:
+                        self.queue.put((len(chunk), chunk), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if self.stopped.is_set():
+                    return
+        except Exception as e:
+            self.error = e
+        finally:
+            # Once stopped, nobody reads the queue, so don't block on it
+            if not self.stopped.is_set():
+                self.queue.put(self._done)
+
+    def __iter__(self):
+        """Yield chunks until the file is exhausted, re-raising read errors"""
+        while True:
+            item = self.queue.get()
+            if item is self._done:
+                if self.error:
+                    raise self.error
+                return
+            yield item
+
+    def stop(self):
+        """Stop reading, e.g. after an upload failure"""
+        self.stopped.set()
+
+def apply_edits(api_url, headers, dataset_id, body, etag, max_attempts=DEFAULT_MAX_ATTEMPTS, refresh_on_conflict=True):
+    """
+    Send one batch of content edits, retrying it on its own
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        body: The encoded edits (see encode_edits_body)
+        etag: The current dataset version
+        max_attempts: Attempts before failing (default: DEFAULT_MAX_ATTEMPTS)
+        refresh_on_conflict: Whether to retry against the latest version when the dataset
+                             changed (status 412). Edits computed from a given version,
+                             such as a sync's updates and deletes, must not be (default: True)
+
+    Returns:
+        A tuple of (new ETag, attempts)
+    """
+    intervals = polling.exponential_backoff(initial=1, max_interval=15)
+    sent_etag = etag
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            succeeded, new_etag, status = append_chunk(api_url, headers, dataset_id, body, sent_etag)
+        except Exception as e:
+            succeeded, new_etag, status = False, None, str(e)
+
+        if succeeded:
+            return new_etag or get_dataset_etag(api_url, headers, dataset_id), attempt
+
+        if status == 412 and not refresh_on_conflict:
+            raise UploadError(f"Dataset {dataset_id} changed since version {sent_etag}; the edits were not applied")
+
+        if attempt == max_attempts:
+            break
+
+        console.print(f"[bold yellow]⚠ Edit batch failed ({status}), retrying (attempt {attempt + 1}/{max_attempts})...[/]")
+        time.sleep(next(intervals))
+
+        # If the version moved past the one this batch was sent against, the edits were
+        # applied and only their response was lost (this client is the only writer)
+        current_etag = get_dataset_etag(api_url, headers, dataset_id)
+        if sent_etag and current_etag and current_etag != sent_etag and status != 412:
+            return current_etag, attempt
+        sent_etag = current_etag
+
+    raise UploadError(f"Edit batch failed after {max_attempts} attempts (last status: {status})")
+
+def upload_dataset(api_url, headers, path, name, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE, prefetch=DEFAULT_PREFETCH, max_attempts=DEFAULT_MAX_ATTEMPTS, project_id=None, show_progress=True):
+    """
+    Stream a file into a new dataset
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        path: A JSONL, CSV or Parquet file
+        name: The dataset name
+        file_format: "jsonl", "csv" or "parquet" (default: from the extension)
+        chunk_size: Maximum rows per chunk (default: DEFAULT_CHUNK_SIZE)
+        prefetch: Chunks read ahead of the upload (default: DEFAULT_PREFETCH)
+        max_attempts: Attempts per chunk (default: DEFAULT_MAX_ATTEMPTS)
+        project_id: A project to associate the dataset with (optional)
+        show_progress: Whether to show a progress bar (default: True)
+
+    Returns:
+        A dictionary with dataset_id, rows, chunks, retries, elapsed and rows_per_second
+
+    Raises:
+        UploadError: If the file has no rows or a chunk can't be uploaded
+    """
+    reader = _ChunkReader(read_rows(path, file_format, batch_size=chunk_size), chunk_size, prefetch)
+    stats = {"dataset_id": None, "rows": 0, "chunks": 0, "retries": 0, "elapsed": 0.0, "rows_per_second": 0.0}
+    start_time = time.perf_counter()
+    etag = None
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[bold blue]{task.description}"),
+        TimeElapsedColumn(),
+        console=console,
+        disable=not show_progress,
+    ) as progress:
+        task = progress.add_task(f"Uploading {os.path.basename(path)}...", total=None)
+
+        try:
+            for row_count, chunk in reader:
+                with timings.phase("dataset_upload_chunk", rows=row_count):
+                    if stats["dataset_id"] is None:
+                        dataset, attempts = create_dataset_with_retry(api_url, headers, name, encode_create_body(chunk), project_id, max_attempts)
+                        stats["retries"] += attempts - 1
+                        stats["dataset_id"] = dataset.get("id")
+                        etag = get_dataset_etag(api_url, headers, stats["dataset_id"])
+                    else:
+                        etag, attempts = apply_edits(api_url, headers, stats["dataset_id"], encode_append_body(chunk), etag, max_attempts)
+                        stats["retries"] += attempts - 1
+
+                stats["rows"] += row_count
+                stats["chunks"] += 1
+                elapsed = time.perf_counter() - start_time
+                progress.update(task, description=f"Uploaded {stats['rows']:,} rows in {stats['chunks']} chunks ({stats['rows'] / elapsed:,.0f} rows/s)")
+        finally:
+            reader.stop()
+
+    # Without a first chunk no dataset was created, and callers expect a dataset ID
+    if stats["dataset_id"] is None:
+        raise UploadError(f"{path} has no rows, so no dataset '{name}' was created")
+
+    stats["elapsed"] = time.perf_counter() - start_time
+    stats["rows_per_second"] = stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0.0
+
+    console.print(
+        f"[bold green]✓ Uploaded {stats['rows']:,} rows to dataset {name} ({stats['dataset_id']}) in {stats['chunks']} chunks, "
+        f"{stats['elapsed']:.1f}s ({stats['rows_per_second']:,.0f} rows/s, {stats['retries']} retries)[/]"
+    )
+
+    return stats
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if the upload succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Stream a JSONL, CSV or Parquet file into a new Galileo dataset")
+    parser.add_argument("path", help="The dataset file")
+    parser.add_argument("--name", required=True, help="The dataset name")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="The file format (default: from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Maximum rows per chunk")
+    parser.add_argument("--prefetch", type=int, default=DEFAULT_PREFETCH, help="Chunks read ahead of the upload")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Attempts per chunk before failing")
+    args = parser.parse_args()
+
+    config.load_environment()
+    harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY"])
+    if harness_session is None:
+        return False
+
+    try:
+        upload_dataset(
+            harness_session.api_url, harness_session.headers, args.path, args.name, file_format=args.format,
+            chunk_size=args.chunk_size, prefetch=args.prefetch, max_attempts=args.max_attempts,
+        )
+    except (UploadError, ValueError, OSError) as e:
+        console.print(f"[bold red]✗ {e}[/]")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -5,13 +5,13 @@ This module provides reusable functions for displaying metrics and results
 in a formatted way using the rich library.
 """
 
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-# Initialize rich console
-console = Console()
+from . import timings
+from .terminal import console
 
+@timings.timed("display")
 def display_metrics(metrics):
     """
     Display metrics in a formatted way
@@ -90,6 +90,7 @@ def extract_metric_value(metrics, metric_name="instruction_adherence"):
 
     return None
 
+@timings.timed("display")
 def compare_metrics(original_metrics, improved_metrics, metric_name="instruction_adherence"):
     """
     Compare metrics between original and improved versions
@@ -147,6 +148,94 @@ def compare_metrics(original_metrics, improved_metrics, metric_name="instruction
         console.print(f"[bold red]✗ Decrease: {improvement:.2f}%[/]")
         console.print(Panel(f"[bold red]The improved version has worse {metric_name.replace('_', ' ')}.[/]", border_style="red"))
 
+@timings.timed("display")
+def compare_trial_metrics(comparison, metric_name="instruction_adherence"):
+    """
+    Compare repeated-trial metrics between original and improved versions
+
+    Args:
+        comparison: The comparison dictionary from stats.compare_trials
+        metric_name: The name of the compared metric
+    """
+    console.print("\n[bold cyan]Metric Comparison[/]")
+
+    if not comparison or comparison["original"]["n"] == 0 or comparison["improved"]["n"] == 0:
+        console.print(f"[bold yellow]⚠ Cannot compare {metric_name} - one or both versions have no metric values[/]")
+        return
+
+    confidence_pct = f"{comparison['confidence'] * 100:g}%"
+
+    # Create a comparison table
+    table = Table(title=f"{metric_name.replace('_', ' ').title()} Comparison", show_header=True, header_style="bold cyan")
+    table.add_column("Version", style="cyan")
+    table.add_column("Trials", style="cyan")
+    table.add_column("Mean", style="cyan")
+    table.add_column("Stdev", style="cyan")
+    table.add_column(f"{confidence_pct} CI", style="cyan")
+
+    for version in ("original", "improved"):
+        summary = comparison[version]
+        table.add_row(
+            version.title(),
+            str(summary["n"]),
+            f"{summary['mean']:.4f}",
+            f"{summary['stdev']:.4f}",
+            f"[{summary['ci_low']:.4f}, {summary['ci_high']:.4f}]"
+        )
+
+    console.print(table)
+
+    console.print(f"[bold cyan]Difference in means:[/] {comparison['difference']:+.4f} "
+                  f"({confidence_pct} CI [{comparison['diff_ci_low']:+.4f}, {comparison['diff_ci_high']:+.4f}])")
+    console.print(f"[bold cyan]Effect size (Cohen's d):[/] {comparison['effect_size']:.2f}")
+
+    # Print significance summary
+    if not comparison["significant"]:
+        console.print(f"[bold yellow]⚠ No significant change in {metric_name.replace('_', ' ')}.[/]")
+    elif comparison["difference"] > 0:
+        console.print(Panel(f"[bold green]The improved version has significantly better {metric_name.replace('_', ' ')}! 🎉[/]", border_style="green"))
+    else:
+        console.print(Panel(f"[bold red]The improved version has significantly worse {metric_name.replace('_', ' ')}.[/]", border_style="red"))
+
+@timings.timed("display")
+def display_usage(usage_tracker):
+    """
+    Display token usage and cost, broken down by model, prompt and suite
+
+    Args:
+        usage_tracker: The usage.UsageTracker to summarize
+    """
+    console.print("\n[bold cyan]Token Usage[/]")
+
+    totals = usage_tracker.totals()
+
+    if totals["calls"] == 0:
+        console.print("[bold yellow]⚠ No token usage recorded[/]")
+        return
+
+    groups = [("Model", "model"), ("Prompt", "prompt")]
+    if len(usage_tracker.aggregate("suite")) > 1:
+        groups.append(("Suite", "suite"))
+
+    for title, key in groups:
+        table = Table(title=f"Usage by {title}", show_header=True, header_style="bold cyan")
+        table.add_column(title, style="cyan")
+        table.add_column("Calls", style="cyan")
+        table.add_column("Prompt Tokens", style="cyan")
+        table.add_column("Completion Tokens", style="cyan")
+        table.add_column("Cost (USD)", style="cyan")
+
+        for name, group in usage_tracker.aggregate(key).items():
+            table.add_row(name, str(group["calls"]), str(group["prompt_tokens"]), str(group["completion_tokens"]), f"{group['cost']:.4f}")
+
+        console.print(table)
+
+    console.print(f"[bold cyan]Total:[/] {totals['total_tokens']} tokens, ${totals['cost']:.4f} over {totals['calls']} calls")
+
+    if usage_tracker.exceeded():
+        console.print("[bold yellow]⚠ Token or cost budget reached. Later runs were not scheduled.[/]")
+
+@timings.timed("display")
 def display_word_count(content, max_words=None):
     """
     Display word count and check if it's within the limit
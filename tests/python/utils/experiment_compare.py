@@ -0,0 +1,299 @@
+"""
+Experiment Comparison Utilities
+
+This module compares two experiments over the same dataset row by row, e.g. a baseline
+prompt and a changed one, to gate prompt changes in CI. Both experiments are exported
+(see experiment_export.py) or read from Parquet exports, and their rows are aligned on
+the dataset row key, with repeated rows paired in order. For every metric, the per-row
+deltas come from one vectorized subtraction over the aligned score matrices. Each delta
+is then checked with a paired t-test and a Wilcoxon signed-rank test, and the most
+regressed rows are listed.
+
+A metric regresses when it moves in the worse direction and both tests agree that the
+change is significant. Since every metric is tested, the p-values of each test are
+Holm-adjusted across metrics before they are compared with alpha, so the chance of
+flagging any metric by accident stays at alpha. Scores are assumed to be better when
+higher, unless the metric is listed as lower-is-better.
+
+    python -m tests.python.utils.experiment_compare baseline.parquet my-experiment --lower-is-better toxicity --fail-on-regression
+"""
+
+import argparse
+import os
+import sys
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+from rich.table import Table
+
+from . import config
+from . import experiment_export
+from . import galileo_api
+from . import session
+from . import stats
+from . import timings
+from .terminal import console
+
+# Default significance level
+DEFAULT_ALPHA = 0.05
+
+# Default number of regressed rows listed per metric
+DEFAULT_TOP = 10
+
+# Default random seed of the sampled sign-flip test, so a CI gate gives the same verdict on every run
+DEFAULT_SEED = 0
+
+# Columns carried along for the regressed-row listings, when present
+_CONTEXT_COLUMNS = ("id", "dataset_input")
+
+def align(baseline, candidate):
+    """
+    Pair the rows of two experiment exports on their dataset row
+
+    Rows with the same row_key are paired in the order they appear, so a dataset with
+    repeated rows still pairs one-to-one.
+
+    Args:
+        baseline: A DataFrame from experiment_export.export_experiment
+        candidate: A DataFrame from experiment_export.export_experiment
+
+    Returns:
+        A tuple of (aligned, unmatched_baseline, unmatched_candidate); aligned has the
+        row_key and, for each metric and context column of either export, a
+        "<column>_baseline" and a "<column>_candidate" column
+    """
+    metrics = sorted(set(experiment_export.metric_columns(baseline)) | set(experiment_export.metric_columns(candidate)))
+
+    def keyed(frame):
+        columns = ["row_key"] + [column for column in _CONTEXT_COLUMNS + tuple(metrics) if column in frame.columns]
+        keyed_frame = frame[columns].copy()
+        keyed_frame["occurrence"] = keyed_frame.groupby("row_key", sort=False).cumcount()
+        # A metric missing from one export has no scores there
+        for metric in metrics:
+            if metric not in keyed_frame.columns:
+                keyed_frame[metric] = np.nan
+        return keyed_frame
+
+    aligned = pd.merge(keyed(baseline), keyed(candidate), on=["row_key", "occurrence"], how="inner", suffixes=("_baseline", "_candidate"), sort=False)
+    return aligned, len(baseline) - len(aligned), len(candidate) - len(aligned)
+
+def compare_experiments(baseline, candidate, alpha=DEFAULT_ALPHA, lower_is_better=(), top=DEFAULT_TOP, seed=DEFAULT_SEED):
+    """
+    Compare two experiment exports row by row
+
+    Args:
+        baseline: A DataFrame from experiment_export.export_experiment
+        candidate: A DataFrame from experiment_export.export_experiment
+        alpha: The significance level (default: DEFAULT_ALPHA)
+        lower_is_better: Metric names whose scores are better when lower (default: none)
+        top: The number of regressed rows listed per metric (default: DEFAULT_TOP)
+        seed: The random seed of the small-sample t-test, used between
+              stats.EXACT_SIGN_FLIP_MAX and 30 pairs (default: DEFAULT_SEED)
+
+    Returns:
+        A dictionary with rows (aligned pairs), unmatched_baseline, unmatched_candidate,
+        metrics (a DataFrame indexed by metric with n, baseline, candidate, delta, ci_low,
+        ci_high, t_p_value, wilcoxon_p_value, their Holm-adjusted t_p_adjusted and
+        wilcoxon_p_adjusted, regressed and improved) and top_regressions (a dictionary
+        mapping metric names to DataFrames of the most regressed rows). The confidence
+        interval of the delta uses the t distribution below 30 pairs, like the t-test.
+    """
+    with timings.phase("experiment_compare"):
+        aligned, unmatched_baseline, unmatched_candidate = align(baseline, candidate)
+
+        columns = sorted(set(experiment_export.metric_columns(baseline)) | set(experiment_export.metric_columns(candidate)))
+        names = [column[len(experiment_export.METRIC_PREFIX):] for column in columns]
+
+        baseline_scores = aligned[[f"{column}_baseline" for column in columns]].to_numpy(dtype=float)
+        candidate_scores = aligned[[f"{column}_candidate" for column in columns]].to_numpy(dtype=float)
+
+        # One subtraction for every row and metric; a row missing either score has no delta
+        deltas = candidate_scores - baseline_scores
+        # Flip lower-is-better metrics so that a negative delta always means worse
+        direction = np.array([-1.0 if name in lower_is_better else 1.0 for name in names])
+        signed_deltas = deltas * direction
+
+        z = NormalDist().inv_cdf(1 - alpha / 2)
+        metrics = []
+        top_regressions = {}
+
+        for position, name in enumerate(names):
+            t_test = stats.paired_t_test(deltas[:, position], seed=seed)
+            wilcoxon = stats.wilcoxon_signed_rank(deltas[:, position])
+            paired = ~np.isnan(deltas[:, position])
+
+            # The normal approximation understates the interval for small samples
+            critical = z if t_test["n"] >= 30 else stats.t_critical(1 - alpha, t_test["n"] - 1)
+
+            metrics.append({
+                "metric": name,
+                "n": t_test["n"],
+                "baseline": float(baseline_scores[paired, position].mean()) if paired.any() else float('nan'),
+                "candidate": float(candidate_scores[paired, position].mean()) if paired.any() else float('nan'),
+                "delta": t_test["mean"],
+                "ci_low": t_test["mean"] - critical * t_test["stderr"],
+                "ci_high": t_test["mean"] + critical * t_test["stderr"],
+                "t_p_value": t_test["p_value"],
+                "wilcoxon_p_value": wilcoxon["p_value"],
+            })
+
+            top_regressions[name] = _top_regressed_rows(aligned, signed_deltas[:, position], deltas[:, position], columns[position], top)
+
+        # Every metric is a separate test, so correct for testing them together
+        t_adjusted = stats.holm_adjust([metric["t_p_value"] for metric in metrics])
+        wilcoxon_adjusted = stats.holm_adjust([metric["wilcoxon_p_value"] for metric in metrics])
+
+        for position, metric in enumerate(metrics):
+            metric["t_p_adjusted"] = float(t_adjusted[position])
+            metric["wilcoxon_p_adjusted"] = float(wilcoxon_adjusted[position])
+
+            significant = metric["t_p_adjusted"] < alpha and metric["wilcoxon_p_adjusted"] < alpha
+            worse = metric["delta"] * direction[position] < 0
+            metric["regressed"] = bool(significant and worse)
+            metric["improved"] = bool(significant and not worse)
+
+    return {
+        "rows": len(aligned),
+        "unmatched_baseline": unmatched_baseline,
+        "unmatched_candidate": unmatched_candidate,
+        "metrics": pd.DataFrame(metrics).set_index("metric") if metrics else pd.DataFrame(),
+        "top_regressions": top_regressions,
+    }
+
+def _top_regressed_rows(aligned, signed_deltas, deltas, column, top):
+    """Get the rows whose score got the most worse, without sorting every row"""
+    regressed = np.flatnonzero(signed_deltas < 0)
+    if regressed.size > top:
+        regressed = regressed[np.argpartition(signed_deltas[regressed], top)[:top]]
+    regressed = regressed[np.argsort(signed_deltas[regressed], kind="stable")]
+
+    rows = aligned.iloc[regressed]
+    listing = pd.DataFrame({"row_key": rows["row_key"].to_numpy()})
+    for context in _CONTEXT_COLUMNS:
+        if f"{context}_candidate" in rows.columns:
+            listing[context] = rows[f"{context}_candidate"].to_numpy()
+    listing["baseline"] = rows[f"{column}_baseline"].to_numpy()
+    listing["candidate"] = rows[f"{column}_candidate"].to_numpy()
+    listing["delta"] = deltas[regressed]
+    return listing
+
+def display_comparison(result, alpha=DEFAULT_ALPHA, top=5):
+    """
+    Display an experiment comparison
+
+    Args:
+        result: The dictionary from compare_experiments
+        alpha: The significance level used
+        top: The number of regressed rows shown per regressed metric (default: 5)
+    """
+    console.print(f"[bold cyan]Aligned {result['rows']:,} rows ({result['unmatched_baseline']:,} baseline and {result['unmatched_candidate']:,} candidate rows unmatched)[/]")
+
+    table = Table(title="Experiment Comparison", show_header=True, header_style="bold cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Pairs", style="cyan", justify="right")
+    table.add_column("Baseline", style="cyan", justify="right")
+    table.add_column("Candidate", style="cyan", justify="right")
+    table.add_column("Delta", style="cyan", justify="right")
+    table.add_column(f"{(1 - alpha) * 100:.0f}% CI", style="cyan")
+    table.add_column("Holm p (t/W)", style="cyan")
+    table.add_column("Status", style="cyan")
+
+    for name, row in result["metrics"].iterrows():
+        status = "[red]✗ worse[/]" if row["regressed"] else "[green]✓ better[/]" if row["improved"] else "-"
+        table.add_row(
+            name,
+            f"{int(row['n']):,}",
+            f"{row['baseline']:.4f}",
+            f"{row['candidate']:.4f}",
+            f"{row['delta']:+.4f}",
+            f"[{row['ci_low']:+.3f}, {row['ci_high']:+.3f}]",
+            f"{row['t_p_adjusted']:.2g}/{row['wilcoxon_p_adjusted']:.2g}",
+            status,
+        )
+
+    console.print(table)
+
+    for name, row in result["metrics"].iterrows():
+        listing = result["top_regressions"].get(name)
+        if not row["regressed"] or listing is None or listing.empty:
+            continue
+
+        rows_table = Table(title=f"Most Regressed Rows: {name}", show_header=True, header_style="bold red")
+        for column in listing.columns:
+            rows_table.add_column(column, style="cyan", overflow="ellipsis", max_width=40 if column == "dataset_input" else None)
+        for _, regressed_row in listing.head(top).iterrows():
+            rows_table.add_row(*(f"{value:+.4f}" if column == "delta" else f"{value:.4f}" if isinstance(value, float) else str(value) for column, value in regressed_row.items()))
+        console.print(rows_table)
+
+def load_experiment(harness_session, source, project_id=None):
+    """
+    Load an experiment export from a Parquet file or from Galileo
+
+    Args:
+        harness_session: The shared Session, used when source isn't a file
+        source: A Parquet file written by experiment_export, or an experiment name or ID
+        project_id: The project ID (default: resolved from the session)
+
+    Returns:
+        A DataFrame from experiment_export
+    """
+    if os.path.exists(source):
+        return experiment_export.read_parquet(source)
+
+    if project_id is None:
+        project_id, _ = harness_session.resolve()
+
+    experiment = galileo_api.find_experiment(harness_session.api_url, harness_session.headers, project_id, source)
+    experiment_id = experiment.get('id') if experiment else source
+    return experiment_export.export_experiment(harness_session.api_url, harness_session.headers, project_id, experiment_id, include_text=False)
+
+def main():
+    """
+    Main function
+
+    Returns:
+        False if the comparison failed, or found a regression with --fail-on-regression,
+        True otherwise
+    """
+    parser = argparse.ArgumentParser(description="Compare two experiments row by row")
+    parser.add_argument("baseline", help="The baseline: a Parquet export, or an experiment name or ID")
+    parser.add_argument("candidate", help="The candidate: a Parquet export, or an experiment name or ID")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="The significance level")
+    parser.add_argument("--lower-is-better", action="append", default=[], help="A metric whose scores are better when lower (repeatable)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Regressed rows listed per metric")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed of the small-sample t-test")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with an error if any metric regressed")
+    args = parser.parse_args()
+
+    harness_session = None
+    if not (os.path.exists(args.baseline) and os.path.exists(args.candidate)):
+        config.load_environment()
+        harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY", "GALILEO_PROJECT"])
+        if harness_session is None:
+            return False
+
+    try:
+        baseline = load_experiment(harness_session, args.baseline)
+        candidate = load_experiment(harness_session, args.candidate)
+    except Exception as e:
+        console.print(f"[bold red]✗ Could not load the experiments: {str(e)}[/]")
+        return False
+
+    result = compare_experiments(baseline, candidate, alpha=args.alpha, lower_is_better=args.lower_is_better, top=args.top, seed=args.seed)
+    display_comparison(result, alpha=args.alpha, top=args.top)
+
+    if result["rows"] == 0:
+        console.print("[bold red]✗ The experiments have no rows in common[/]")
+        return False
+
+    regressed = [name for name, row in result["metrics"].iterrows() if row["regressed"]]
+    if regressed:
+        console.print(f"[bold red]✗ Regressed: {', '.join(regressed)}[/]")
+        return not args.fail_on_regression
+
+    console.print("[bold green]✓ No metric regressed[/]")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
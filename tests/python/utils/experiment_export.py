@@ -0,0 +1,314 @@
+"""
+Experiment Export Utilities
+
+This module exports an experiment's per-row results into column-oriented arrays for
+analysis. The experiment's trace records are paged through (fetching the next page while
+the current one is converted) and each page becomes a small pandas DataFrame, so the raw
+JSON of only one or two pages is ever held in memory. Metric scores become float columns
+named "metrics.<name>", with NaN where a row has no score (the scorer failed or hasn't
+run), and summaries are computed over the whole score matrix at once.
+
+Each row also gets a row_key identifying its dataset row, so that two experiments over
+the same dataset can be aligned row by row.
+
+    python -m tests.python.utils.experiment_export my-experiment --parquet results.parquet
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from rich.table import Table
+
+from . import config
+from . import galileo_api
+from . import session
+from . import timings
+from .terminal import console
+
+# Prefix of the metric score columns
+METRIC_PREFIX = "metrics."
+
+# Quantiles reported by summarize_metrics
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Metric entries that aren't scores
+_NON_SCORE_METRICS = ("duration_ns",)
+
+# Text columns, left out with include_text=False
+TEXT_COLUMNS = ("dataset_input", "dataset_output", "output")
+
+def row_key(record):
+    """
+    Identify the dataset row an experiment record was produced from
+
+    Args:
+        record: A trace record
+
+    Returns:
+        The row ID from the dataset metadata if there is one, otherwise a hash of the
+        dataset input and output
+    """
+    metadata = record.get('dataset_metadata') or {}
+    for key in ("row_id", "dataset_row_id"):
+        if metadata.get(key):
+            return str(metadata[key])
+
+    content = json.dumps([record.get('dataset_input'), record.get('dataset_output')], sort_keys=True, default=str)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+def _score(value):
+    """Convert a metric value to a float, or None if it isn't a score"""
+    if isinstance(value, dict):
+        if value.get('status_type') in ("failed", "error"):
+            return float('nan')
+        value = value.get('value', value.get('score'))
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+def metric_scores(record):
+    """
+    Get a record's metric scores
+
+    Args:
+        record: A trace record
+
+    Returns:
+        A dictionary mapping metric names to float scores; NaN marks a failed metric
+    """
+    scores = {}
+
+    for source in (record.get('metric_info') or {}, record.get('metrics') or {}):
+        for name, value in source.items():
+            if name in _NON_SCORE_METRICS or name in scores:
+                continue
+            score = _score(value)
+            if score is not None:
+                scores[name] = score
+
+    return scores
+
+def _text(value):
+    """Flatten a record's input or output to a string"""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+def records_to_frame(records, include_text=True):
+    """
+    Convert a page of trace records to a DataFrame
+
+    Args:
+        records: A list of trace records
+        include_text: Whether to include the input and output text (default: True)
+
+    Returns:
+        A DataFrame with one row per record
+    """
+    columns = {
+        "id": [record.get('id') for record in records],
+        "row_key": [row_key(record) for record in records],
+        "created_at": pd.to_datetime([record.get('created_at') for record in records], utc=True, errors="coerce"),
+        "status_code": np.array([record.get('status_code') or 0 for record in records], dtype=np.int32),
+        "duration_ms": np.array([((record.get('metrics') or {}).get('duration_ns') or np.nan) for record in records], dtype=float) / 1e6,
+    }
+
+    if include_text:
+        for column in TEXT_COLUMNS:
+            columns[column] = [_text(record.get(column)) for record in records]
+
+    # Rows without a metric get NaN in its column
+    scores = [metric_scores(record) for record in records]
+    names = sorted({name for row_scores in scores for name in row_scores})
+    for name in names:
+        columns[f"{METRIC_PREFIX}{name}"] = np.array([row_scores.get(name, np.nan) for row_scores in scores], dtype=float)
+
+    return pd.DataFrame(columns)
+
+def export_experiment(api_url, headers, project_id, experiment_id, page_size=500, include_text=True):
+    """
+    Export an experiment's per-row results
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        experiment_id: The experiment ID
+        page_size: Records per request (default: 500)
+        include_text: Whether to include the input and output text (default: True)
+
+    Returns:
+        A DataFrame with one row per record: id, row_key, created_at, status_code,
+        duration_ms, the text columns and one "metrics.<name>" column per metric
+    """
+    frames = []
+
+    with timings.phase("experiment_export", experiment=experiment_id):
+        for records in galileo_api.iter_experiment_record_pages(api_url, headers, project_id, experiment_id, page_size):
+            frames.append(records_to_frame(records, include_text))
+
+    if not frames:
+        return records_to_frame([], include_text)
+
+    # Pages can have different metrics; concat fills the gaps with NaN
+    frame = pd.concat(frames, ignore_index=True, sort=False)
+    metrics = sorted(metric_columns(frame))
+    return frame[[column for column in frame.columns if column not in metrics] + metrics]
+
+def metric_columns(frame):
+    """
+    Get the metric score columns of an export
+
+    Args:
+        frame: A DataFrame from export_experiment
+
+    Returns:
+        A list of column names
+    """
+    return [column for column in frame.columns if column.startswith(METRIC_PREFIX)]
+
+def metric_matrix(frame):
+    """
+    Get the metric scores of an export as one array
+
+    Args:
+        frame: A DataFrame from export_experiment
+
+    Returns:
+        A tuple of (metric names, 2-D float array with one column per metric)
+    """
+    columns = metric_columns(frame)
+    names = [column[len(METRIC_PREFIX):] for column in columns]
+    return names, frame[columns].to_numpy(dtype=float)
+
+def summarize_metrics(frame, quantiles=DEFAULT_QUANTILES):
+    """
+    Summarize each metric of an export
+
+    Args:
+        frame: A DataFrame from export_experiment
+        quantiles: The quantiles to report (default: DEFAULT_QUANTILES)
+
+    Returns:
+        A DataFrame indexed by metric with count, mean, std, min, one column per quantile
+        (e.g. "p50"), max and failure_rate (the share of rows without a score)
+    """
+    names, values = metric_matrix(frame)
+    count = (~np.isnan(values)).sum(axis=0)
+
+    summary = pd.DataFrame(index=pd.Index(names, name="metric"))
+    summary["count"] = count
+    summary["failure_rate"] = 1 - count / max(len(frame), 1)
+
+    if not names:
+        return summary
+
+    # A metric with no scores at all warns and reports NaN, which is the wanted result
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        summary["mean"] = np.nanmean(values, axis=0)
+        summary["std"] = np.nanstd(values, axis=0, ddof=1)
+        summary["min"] = np.nanmin(values, axis=0)
+        for quantile, row in zip(quantiles, np.nanquantile(values, quantiles, axis=0)):
+            summary[f"p{quantile * 100:g}"] = row
+        summary["max"] = np.nanmax(values, axis=0)
+
+    return summary
+
+def write_parquet(frame, path):
+    """
+    Write an export to a Parquet file
+
+    Args:
+        frame: A DataFrame from export_experiment
+        path: The output path
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    frame.to_parquet(path, index=False)
+
+def read_parquet(path):
+    """
+    Read an export written by write_parquet
+
+    Args:
+        path: The Parquet file
+
+    Returns:
+        The DataFrame
+    """
+    return pd.read_parquet(path)
+
+def display_summary(summary, title="Experiment Metrics"):
+    """
+    Display a metric summary
+
+    Args:
+        summary: A DataFrame from summarize_metrics
+        title: The table title
+    """
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Scored", style="cyan", justify="right")
+    table.add_column("Failed", style="cyan", justify="right")
+
+    # The middle quantiles are left out to keep the table narrow
+    columns = [column for column in ("mean", "std", "p5", "p50", "p95") if column in summary.columns]
+    for column in columns:
+        table.add_column(column.capitalize() if column in ("mean", "std") else column, style="cyan", justify="right")
+
+    for name, row in summary.iterrows():
+        failed = f"[red]{row['failure_rate']:.1%}[/]" if row["failure_rate"] > 0 else "0%"
+        table.add_row(name, f"{int(row['count']):,}", failed, *(f"{row[column]:.3f}" for column in columns))
+
+    console.print(table)
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if the export succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Export an experiment's per-row results and summarize its metrics")
+    parser.add_argument("experiment", help="The experiment name or ID")
+    parser.add_argument("--parquet", default=None, help="Write the rows to this Parquet file")
+    parser.add_argument("--no-text", action="store_true", help="Leave out the input and output text")
+    parser.add_argument("--page-size", type=int, default=500, help="Records per request")
+    args = parser.parse_args()
+
+    config.load_environment()
+    harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY", "GALILEO_PROJECT"])
+    if harness_session is None:
+        return False
+
+    api_url, headers = harness_session.api_url, harness_session.headers
+    project_id, _ = harness_session.resolve()
+
+    experiment = galileo_api.find_experiment(api_url, headers, project_id, args.experiment)
+    experiment_id = experiment.get('id') if experiment else args.experiment
+
+    try:
+        frame = export_experiment(api_url, headers, project_id, experiment_id, args.page_size, include_text=not args.no_text)
+    except Exception as e:
+        console.print(f"[bold red]✗ Could not export experiment {args.experiment}: {str(e)}[/]")
+        return False
+
+    console.print(f"[bold green]✓ Exported {len(frame):,} rows and {len(metric_columns(frame))} metrics ({frame.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MiB)[/]")
+    display_summary(summarize_metrics(frame), title=f"Metrics of {args.experiment}")
+
+    if args.parquet:
+        write_parquet(frame, args.parquet)
+        console.print(f"[bold green]✓ Rows written to {args.parquet}[/]")
+
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
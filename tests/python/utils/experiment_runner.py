@@ -0,0 +1,523 @@
+"""
+Experiment Runner Utilities
+
+This module runs function-based experiments (a local Python callable applied to every
+dataset row) in parallel, as a faster alternative to run_experiment(function=...), which
+processes rows one at a time.
+
+Rows are dispatched to a thread or process pool, with a bounded number in flight. Before a
+row is dispatched, a token is taken from the rate limiter of every provider it calls
+(e.g. openai=10 for 10 rows per second), so the pool never outruns a provider's quota.
+Calls that fail with a rate-limit error (status 429) are dispatched again after a backoff,
+taking a new token from every limiter like any other dispatch.
+
+Workers only call the function. Its traces are logged into the experiment from the
+driver thread, through one Galileo logger, and flushed in batches. Each row becomes one
+trace with the row's input, the function's output and its duration as measured in the
+worker. Spans the function logs itself aren't captured.
+
+After each flush, the rows that succeeded are appended to a checkpoint file. If the run
+crashes, running it again with the same experiment name reuses the experiment and skips
+those rows. Rows that failed, and rows finished but not yet flushed when the run crashed,
+are run again; a failed row then has both its error trace and the new one.
+
+    python -m tests.python.utils.experiment_runner my_app.pipeline:answer --dataset-id DATASET_ID --name my-experiment --workers 16 --rate-limit openai=10
+"""
+
+import argparse
+import importlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+from . import config
+from . import dataset_upload
+from . import galileo_api
+from . import polling
+from . import session
+from . import timings
+from .terminal import console
+
+# Environment variable with default rate limits, e.g. "openai=10,anthropic=2"
+RATE_LIMITS_ENV = "HARNESS_RATE_LIMITS"
+
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CHECKPOINT_DIR = os.path.join(TESTS_ROOT, ".results", "experiment_runs")
+
+# Default number of concurrent rows
+DEFAULT_WORKERS = 8
+
+# Rows logged between flushes (and checkpoints)
+DEFAULT_FLUSH_EVERY = 100
+
+# Attempts per row when the function is rate limited
+DEFAULT_MAX_ATTEMPTS = 4
+
+class RateLimiter:
+    """A token bucket allowing a steady rate of acquisitions with short bursts"""
+
+    def __init__(self, rate, burst=None):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Acquisitions per second
+            burst: Acquisitions allowed at once after an idle period (default: one
+                   second's worth, at least 1)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available
+
+        Returns:
+            The seconds spent waiting
+        """
+        waited = 0.0
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+def parse_rate_limits(spec):
+    """
+    Parse rate limits
+
+    Args:
+        spec: A string like "openai=10,anthropic=2.5" (rows per second per provider)
+
+    Returns:
+        A dictionary mapping provider names to RateLimiters
+    """
+    limits = {}
+
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        provider, _, rate = item.partition("=")
+        try:
+            limits[provider.strip()] = RateLimiter(float(rate))
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{item}', expected PROVIDER=ROWS_PER_SECOND")
+
+    return limits
+
+def dataset_rows(api_url, headers, dataset_id, page_size=1000):
+    """
+    Read the rows of a Galileo dataset for run_function_experiment
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        page_size: Entries per request (default: 1000)
+
+    Yields:
+        Row dictionaries with row_id, input, output and metadata
+    """
+    for entry in galileo_api.iter_dataset_entries(api_url, headers, None, dataset_id, page_size):
+        values = entry.get('values_dict') or {}
+        yield {
+            "row_id": entry.get('row_id'),
+            "input": values.get('input'),
+            "output": values.get('output', values.get('ground_truth')),
+            "metadata": values.get('metadata'),
+        }
+
+def _deserialize(value):
+    """Decode JSON inputs as run_experiment does, leaving other strings unchanged"""
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+def _as_text(value):
+    """Convert a row value to the string stored on the trace"""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, default=str)
+
+def _call_row(function, row_input):
+    """
+    Call the function on one row input, in a worker
+
+    A rate-limited call isn't retried here, since the retry has to take a token from the
+    driver's limiters first.
+
+    Returns:
+        A tuple of (output, error message or None, rate_limited, duration_ns, started_at)
+    """
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter_ns()
+
+    try:
+        output = function(row_input)
+        return output, None, False, time.perf_counter_ns() - start, started_at
+    except Exception as e:
+        duration_ns = time.perf_counter_ns() - start
+        name = getattr(function, "__name__", "function")
+        # Rate-limit errors (e.g. openai.RateLimitError) are worth another try
+        return None, f"error during executing: {name}: {e}", getattr(e, "status_code", None) == 429, duration_ns, started_at
+
+class Checkpoint:
+    """A JSONL file recording a run's experiment and the rows whose traces were flushed"""
+
+    def __init__(self, path):
+        """
+        Initialize the checkpoint
+
+        Args:
+            path: The checkpoint file
+        """
+        self.path = path
+        self.header = None
+        self.completed = set()
+
+    def load(self):
+        """
+        Read the checkpoint, if there is one
+
+        Returns:
+            True if the checkpoint exists and has a header, False otherwise
+        """
+        try:
+            with open(self.path) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return False
+
+        if not lines or "experiment_id" not in lines[0]:
+            return False
+
+        self.header = lines[0]
+        for line in lines[1:]:
+            self.completed.update(line.get("completed", []))
+        return True
+
+    def start(self, header):
+        """
+        Start a new checkpoint, replacing any existing one
+
+        Args:
+            header: A dictionary with experiment_id, experiment_name and project
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.header = header
+        self.completed = set()
+        with open(self.path, "w") as f:
+            f.write(json.dumps(header) + "\n")
+
+    def record(self, keys):
+        """
+        Record rows that succeeded and whose traces were flushed
+
+        Args:
+            keys: The row keys
+        """
+        if not keys:
+            return
+        self.completed.update(keys)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"completed": list(keys)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+def checkpoint_path(experiment_name, directory=None):
+    """
+    Get the default checkpoint file of an experiment
+
+    Args:
+        experiment_name: The experiment name
+        directory: The checkpoint directory (default: tests/python/.results/experiment_runs)
+
+    Returns:
+        The file path
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "-", experiment_name).strip("-")
+    return os.path.join(directory or DEFAULT_CHECKPOINT_DIR, f"{safe_name}.jsonl")
+
+def _create_experiment(project, experiment_name, metrics):
+    """Create the experiment and register its metrics with the Galileo SDK"""
+    # Imported here, as only live runs need the SDK
+    from galileo.experiments import create_experiment
+    from galileo.projects import Projects
+    from galileo.utils.metrics import create_metric_configs
+
+    project_obj = Projects().get_with_env_fallbacks(name=project)
+    if not project_obj:
+        raise ValueError(f"Project {project} does not exist")
+
+    experiment = create_experiment(project_id=project_obj.id, experiment_name=experiment_name)
+    if metrics:
+        create_metric_configs(project_obj.id, experiment.id, metrics)
+
+    return experiment.id
+
+def _get_logger(project, experiment_id):
+    """Get a Galileo logger that writes into the experiment"""
+    from galileo import GalileoLogger
+
+    return GalileoLogger(project=project, experiment_id=experiment_id)
+
+def run_function_experiment(function, rows, experiment_name, project=None, metrics=None, workers=DEFAULT_WORKERS, executor="thread", rate_limits=None, providers=None, flush_every=DEFAULT_FLUSH_EVERY, max_attempts=DEFAULT_MAX_ATTEMPTS, checkpoint=None, resume=True, logger=None, experiment_id=None, show_progress=True):
+    """
+    Run a function over dataset rows in parallel and log each row into an experiment
+
+    Args:
+        function: The callable, called with each row's (JSON-decoded) input; with the
+                  process executor it must be importable (defined at module level)
+        rows: An iterable of row dictionaries with input, and optionally output,
+              metadata and row_id (see dataset_rows)
+        experiment_name: The experiment name
+        project: The project name (default: GALILEO_PROJECT)
+        metrics: Metrics to score the experiment with, as accepted by run_experiment
+        workers: Maximum rows running at once (default: DEFAULT_WORKERS)
+        executor: "thread" or "process" (default: "thread")
+        rate_limits: A dictionary mapping provider names to RateLimiters (default: parsed
+                     from HARNESS_RATE_LIMITS)
+        providers: The providers each row calls (default: every provider in rate_limits)
+        flush_every: Rows logged between flushes and checkpoints (default: DEFAULT_FLUSH_EVERY)
+        max_attempts: Attempts per row when rate limited; every attempt takes a token from
+                      each limiter (default: DEFAULT_MAX_ATTEMPTS)
+        checkpoint: The checkpoint file (default: checkpoint_path(experiment_name))
+        resume: Whether to continue from an existing checkpoint (default: True)
+        logger: The Galileo logger to log with (default: one for the experiment)
+        experiment_id: An existing experiment to log into (default: from the checkpoint,
+                       or a new experiment)
+        show_progress: Whether to show a progress bar (default: True)
+
+    Returns:
+        A dictionary with experiment_id, rows, skipped, errors, retries, flushes,
+        rate_limit_wait, elapsed and rows_per_second
+    """
+    project = project or os.environ.get("GALILEO_PROJECT")
+    rate_limits = parse_rate_limits(os.environ.get(RATE_LIMITS_ENV)) if rate_limits is None else rate_limits
+    limiters = [rate_limits[provider] for provider in (providers if providers is not None else rate_limits) if provider in rate_limits]
+
+    state = Checkpoint(checkpoint or checkpoint_path(experiment_name))
+    if resume and state.load() and state.header.get("experiment_name") == experiment_name and experiment_id in (None, state.header["experiment_id"]):
+        experiment_id = state.header["experiment_id"]
+        console.print(f"[bold cyan]Resuming experiment {experiment_name} ({experiment_id}): {len(state.completed):,} rows already done[/]")
+    else:
+        experiment_id = experiment_id or _create_experiment(project, experiment_name, metrics)
+        state.start({"experiment_id": experiment_id, "experiment_name": experiment_name, "project": project})
+
+    logger = logger or _get_logger(project, experiment_id)
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+
+    stats = {"experiment_id": experiment_id, "rows": 0, "skipped": 0, "errors": 0, "retries": 0, "flushes": 0, "rate_limit_wait": 0.0, "elapsed": 0.0, "rows_per_second": 0.0}
+    start_time = time.perf_counter()
+    # (key, succeeded) for each row logged since the last flush
+    unflushed = []
+
+    def flush():
+        if not unflushed:
+            return
+        with timings.phase("experiment_flush", rows=len(unflushed)):
+            logger.flush()
+        # Failed rows stay out of the checkpoint, so a resume runs them again
+        state.record([key for key, succeeded in unflushed if succeeded])
+        unflushed.clear()
+        stats["flushes"] += 1
+
+    def log_row(key, row, output, error, duration_ns, started_at):
+        metadata = {name: _as_text(value) for name, value in (row.get("metadata") or {}).items()} if isinstance(row.get("metadata"), dict) else {}
+        if row.get("row_id"):
+            # Lets exports line this row up with the same row in other experiments
+            metadata["row_id"] = str(row["row_id"])
+
+        logger.start_trace(
+            input=_as_text(row.get("input")) or "",
+            name=experiment_name,
+            created_at=started_at,
+            dataset_input=_as_text(row.get("input")),
+            dataset_output=_as_text(row.get("output")),
+            dataset_metadata=metadata,
+        )
+        logger.conclude(output=_as_text(error or output), duration_ns=duration_ns, status_code=500 if error else 200)
+
+        stats["rows"] += 1
+        stats["errors"] += 1 if error else 0
+        unflushed.append((key, not error))
+        if len(unflushed) >= flush_every:
+            flush()
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[bold blue]{task.description}"),
+        TimeElapsedColumn(),
+        console=console,
+        disable=not show_progress,
+    ) as progress, pool_class(max_workers=workers) as pool:
+        task = progress.add_task(f"Running {experiment_name}...", total=None)
+        # future -> (key, row, attempt, started_at of the first attempt, backoff intervals)
+        in_flight = {}
+        # Rate-limited rows waiting for their backoff, as (ready_at, key, row, attempt, started_at, intervals)
+        retries = []
+        rows_iter = iter(enumerate(rows))
+        exhausted = False
+
+        def dispatch(key, row, attempt, started_at, intervals):
+            # Every attempt, retries included, takes a token from each provider's limiter
+            for limiter in limiters:
+                stats["rate_limit_wait"] += limiter.acquire()
+
+            future = pool.submit(_call_row, function, _deserialize(row.get("input")))
+            in_flight[future] = (key, row, attempt, started_at, intervals)
+
+        try:
+            while in_flight or retries or not exhausted:
+                # Dispatch the retries whose backoff has passed before any new row
+                retries.sort(key=lambda retry: retry[0])
+                while retries and retries[0][0] <= time.monotonic() and len(in_flight) < workers * 2:
+                    dispatch(*retries.pop(0)[1:])
+
+                # Keep up to two rows per worker queued, so workers never wait on the driver
+                while not exhausted and len(in_flight) < workers * 2:
+                    try:
+                        index, row = next(rows_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    key = str(row.get("row_id") or index)
+                    if key in state.completed:
+                        stats["skipped"] += 1
+                        continue
+
+                    dispatch(key, row, 1, None, None)
+
+                # Wake up for the next retry, even if no row finishes before it
+                timeout = max(0.0, retries[0][0] - time.monotonic()) if retries else None
+
+                if not in_flight:
+                    if timeout is not None:
+                        time.sleep(timeout)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, row, attempt, started_at, intervals = in_flight.pop(future)
+                    output, error, rate_limited, duration_ns, attempt_started_at = future.result()
+                    started_at = started_at or attempt_started_at
+
+                    if rate_limited and attempt < max_attempts:
+                        intervals = intervals or polling.exponential_backoff(initial=1, max_interval=30)
+                        retries.append((time.monotonic() + next(intervals), key, row, attempt + 1, started_at, intervals))
+                        stats["retries"] += 1
+                        continue
+
+                    log_row(key, row, output, error, duration_ns, started_at)
+
+                elapsed = time.perf_counter() - start_time
+                progress.update(task, description=f"Ran {stats['rows']:,} rows ({stats['rows'] / elapsed:,.1f} rows/s, {stats['errors']} errors, {stats['skipped']:,} skipped)")
+        finally:
+            # Whatever finished is uploaded and checkpointed, even if the run is interrupted
+            for future in list(in_flight):
+                future.cancel()
+            flush()
+
+    stats["elapsed"] = time.perf_counter() - start_time
+    stats["rows_per_second"] = stats["rows"] / stats["elapsed"] if stats["elapsed"] else 0.0
+
+    console.print(
+        f"[bold green]✓ Ran {stats['rows']:,} rows of {experiment_name} in {stats['elapsed']:.1f}s "
+        f"({stats['rows_per_second']:,.1f} rows/s, {stats['errors']} errors, {stats['retries']} retries, {stats['skipped']:,} skipped)[/]"
+    )
+    if stats["errors"]:
+        console.print(f"[bold yellow]⚠ {stats['errors']} rows failed; their traces hold the error message, and resuming runs them again[/]")
+
+    return stats
+
+def load_function(spec):
+    """
+    Import a function from a "module:function" spec
+
+    Args:
+        spec: The spec, e.g. "my_app.pipeline:answer"
+
+    Returns:
+        The function
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Invalid function '{spec}', expected MODULE:FUNCTION")
+
+    function = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        function = getattr(function, part)
+    return function
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if every row ran, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Run a function-based experiment in parallel, with rate limits and resume")
+    parser.add_argument("function", help="The function to run, as MODULE:FUNCTION (importable from the current directory)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dataset-id", default=None, help="The Galileo dataset to run over")
+    source.add_argument("--file", default=None, help="A JSONL, CSV or Parquet file of rows to run over")
+    parser.add_argument("--name", required=True, help="The experiment name")
+    parser.add_argument("--metrics", action="append", default=None, help="A metric to score with (repeatable)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Rows running at once")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread", help="Run rows in threads or processes")
+    parser.add_argument("--rate-limit", action="append", default=None, help="PROVIDER=ROWS_PER_SECOND (repeatable, default: HARNESS_RATE_LIMITS)")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_EVERY, help="Rows logged between flushes")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start a new experiment")
+    args = parser.parse_args()
+
+    config.load_environment()
+    sys.path.insert(0, os.getcwd())
+
+    try:
+        function = load_function(args.function)
+        rate_limits = parse_rate_limits(",".join(args.rate_limit)) if args.rate_limit else None
+
+        if args.dataset_id:
+            harness_session = session.get_session(["GALILEO_CONSOLE_URL", "GALILEO_API_KEY", "GALILEO_PROJECT"])
+            if harness_session is None:
+                return False
+            rows = dataset_rows(harness_session.api_url, harness_session.headers, args.dataset_id)
+        else:
+            rows = dataset_upload.read_rows(args.file)
+
+        stats = run_function_experiment(
+            function, rows, args.name, metrics=args.metrics, workers=args.workers, executor=args.executor,
+            rate_limits=rate_limits, flush_every=args.flush_every, resume=not args.restart,
+        )
+    except (ImportError, AttributeError, ValueError, OSError) as e:
+        console.print(f"[bold red]✗ {e}[/]")
+        return False
+
+    return stats["errors"] == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
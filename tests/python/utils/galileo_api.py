@@ -6,14 +6,14 @@ including authentication, fetching traces, and retrieving metrics.
 """
 
 import os
-import requests
 import json
-import time
-from rich.console import Console
+import threading
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 
-# Initialize rich console
-console = Console()
+from . import clients
+from . import polling
+from . import timings
+from .terminal import console
 
 def get_auth_token(api_url, api_key):
     """
@@ -37,7 +37,7 @@ def get_auth_token(api_url, api_key):
     }
 
     try:
-        response = requests.post(auth_url, headers=auth_headers, json=auth_payload)
+        response = clients.get_http_session().post(auth_url, headers=auth_headers, json=auth_payload)
 
         if response.status_code == 200:
             token_data = response.json()
@@ -83,7 +83,7 @@ def get_project_and_log_stream_ids(api_url, headers, project_name, log_stream_na
 
     # First, try to get projects
     projects_url = f"{api_url}/projects"
-    response = requests.get(projects_url, headers=headers)
+    response = clients.get_http_session().get(projects_url, headers=headers)
 
     if response.status_code == 200:
         projects = response.json()
@@ -103,7 +103,7 @@ def get_project_and_log_stream_ids(api_url, headers, project_name, log_stream_na
 
         # Now get log streams for this project
         log_streams_url = f"{api_url}/projects/{project_id}/log_streams"
-        response = requests.get(log_streams_url, headers=headers)
+        response = clients.get_http_session().get(log_streams_url, headers=headers)
 
         if response.status_code == 200:
             log_streams = response.json()
@@ -131,6 +131,61 @@ def get_project_and_log_stream_ids(api_url, headers, project_name, log_stream_na
         console.print(f"[red]{response.text}[/]")
         return None, None
 
+def create_log_stream(api_url, headers, project_id, log_stream_name):
+    """
+    Create a log stream in a project
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_name: The name of the new log stream
+
+    Returns:
+        The new log stream ID or None if creation fails
+    """
+    console.print(f"[bold cyan]Creating log stream {log_stream_name}...[/]")
+
+    url = f"{api_url}/projects/{project_id}/log_streams"
+
+    try:
+        response = clients.get_http_session().post(url, headers=headers, json={"name": log_stream_name})
+
+        if response.status_code in (200, 201):
+            log_stream_id = response.json().get('id')
+            console.print(f"[bold green]✓ Created log stream ID: {log_stream_id}[/]")
+            return log_stream_id
+        else:
+            console.print(f"[bold red]✗ Error creating log stream: {response.status_code}[/]")
+            console.print(f"[red]{response.text}[/]")
+            return None
+    except Exception as e:
+        console.print(f"[bold red]✗ Error creating log stream: {str(e)}[/]")
+        return None
+
+def delete_log_stream(api_url, headers, project_id, log_stream_id):
+    """
+    Delete a log stream and its traces
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_id: The log stream ID
+
+    Returns:
+        True if the log stream was deleted, False otherwise
+    """
+    url = f"{api_url}/projects/{project_id}/log_streams/{log_stream_id}"
+
+    response = clients.get_http_session().delete(url, headers=headers)
+
+    if response.status_code in (200, 204):
+        return True
+
+    console.print(f"[bold yellow]⚠ Error deleting log stream {log_stream_id}: {response.status_code}[/]")
+    return False
+
 def get_traces_by_query(api_url, headers, project_id, log_stream_id, query_params=None):
     """
     Get traces from the Galileo API with optional query parameters
@@ -162,7 +217,7 @@ def get_traces_by_query(api_url, headers, project_id, log_stream_id, query_param
         params.update(query_params)
 
     # Make the POST request
-    response = requests.post(url, headers=headers, json=params)
+    response = clients.get_http_session().post(url, headers=headers, json=params)
 
     if response.status_code == 200:
         result = response.json()
@@ -234,7 +289,7 @@ def get_trace_data(api_url, headers, project_id, trace_id):
     """
     url = f"{api_url}/projects/{project_id}/traces/{trace_id}"
 
-    response = requests.get(url, headers=headers)
+    response = clients.get_http_session().get(url, headers=headers)
 
     if response.status_code == 200:
         trace_data = response.json()
@@ -268,18 +323,23 @@ def has_target_metric(metrics, target_metric="instruction_adherence"):
 
     return False
 
-def wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=120, polling_interval=10, target_metric="instruction_adherence"):
+def wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=120, polling_interval=10, target_metric="instruction_adherence", show_progress=True):
     """
     Poll for metrics for a specific trace, waiting specifically for the target_metric
 
+    Polls quickly at first and backs off to polling_interval, so metrics that are already
+    computed are found without waiting a full interval.
+
     Args:
         api_url: The Galileo API URL
         headers: The API request headers
         project_id: The project ID
         trace_id: The trace ID
         max_wait_time: Maximum time to wait in seconds (default: 120)
-        polling_interval: Time between polling attempts in seconds (default: 10)
+        polling_interval: Longest time between polling attempts in seconds (default: 10)
         target_metric: The specific metric to wait for (default: "instruction_adherence")
+        show_progress: Whether to show a progress bar (default: True). Disable this when
+                       waiting from several threads, as only one live display can be active.
 
     Returns:
         The metrics when found or empty dict if not found within max_wait_time
@@ -287,85 +347,83 @@ def wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=120,
     console.print(f"[bold cyan]Waiting for '{target_metric}' metric for trace {trace_id}...[/]")
     console.print(f"[bold cyan]Maximum wait time: {max_wait_time} seconds[/]")
 
-    start_time = time.time()
-    attempt = 0
-
-    # Create a progress bar for waiting
-    with Progress(
-        SpinnerColumn(),
-        TextColumn(f"[bold blue]Waiting for '{target_metric}' metric..."),
-        BarColumn(),
-        TextColumn("[bold blue]{task.percentage:.0f}%"),
-        TimeElapsedColumn(),
-        TimeRemainingColumn(),
-        expand=True
-    ) as progress:
-        task = progress.add_task("[cyan]Polling...", total=max_wait_time)
-
-        # Keep trying until we find metrics or time out
-        while time.time() - start_time < max_wait_time:
-            elapsed = time.time() - start_time
-            attempt += 1
-
-            # Update progress bar
-            progress.update(task, completed=min(elapsed, max_wait_time))
+    # The metric endpoints to try on each attempt, with a label for messages
+    metric_sources = [
+        ("runs API", f"{api_url}/projects/{project_id}/runs/{trace_id}/metrics"),
+        ("alternative API endpoint", f"{api_url}/projects/{project_id}/traces/{trace_id}/metrics"),
+    ]
 
-            # Try multiple methods to get metrics
-            metrics = None
+    attempt = 0
 
-            # Method 1: Get trace data and check metrics field
-            try:
-                trace_data = get_trace_data(api_url, headers, project_id, trace_id)
+    def find_metrics():
+        # Method 1: Get trace data and check metrics field
+        try:
+            trace_data = get_trace_data(api_url, headers, project_id, trace_id)
 
-                # Check if trace data has metrics
-                if trace_data and isinstance(trace_data, dict) and 'metrics' in trace_data:
-                    metrics = trace_data['metrics']
+            # Check if trace data has metrics
+            if trace_data and isinstance(trace_data, dict) and 'metrics' in trace_data:
+                metrics = trace_data['metrics']
 
-                    # Check if the target metric exists and has a value
-                    if has_target_metric(metrics, target_metric):
-                        console.print(f"[bold green]✓ Found '{target_metric}' metric in trace data (attempt {attempt})[/]")
-                        return metrics
-                    else:
-                        console.print(f"[bold yellow]⚠ Metrics found but '{target_metric}' not present yet (attempt {attempt})[/]")
-            except Exception as e:
-                pass
+                # Check if the target metric exists and has a value
+                if has_target_metric(metrics, target_metric):
+                    console.print(f"[bold green]✓ Found '{target_metric}' metric in trace data (attempt {attempt})[/]")
+                    return metrics
+                else:
+                    console.print(f"[bold yellow]⚠ Metrics found but '{target_metric}' not present yet (attempt {attempt})[/]")
+        except Exception as e:
+            pass
 
-            # Method 2: Try runs API
+        # Methods 2 and 3: Try the metric endpoints
+        for source, url in metric_sources:
             try:
-                url = f"{api_url}/projects/{project_id}/runs/{trace_id}/metrics"
-                response = requests.get(url, headers=headers)
+                response = clients.get_http_session().get(url, headers=headers)
 
                 if response.status_code == 200:
                     metrics = response.json()
 
                     # Check if the target metric exists and has a value
                     if has_target_metric(metrics, target_metric):
-                        console.print(f"[bold green]✓ Found '{target_metric}' metric in runs API (attempt {attempt})[/]")
+                        console.print(f"[bold green]✓ Found '{target_metric}' metric in {source} (attempt {attempt})[/]")
                         return metrics
                     else:
                         console.print(f"[bold yellow]⚠ Metrics found but '{target_metric}' not present yet (attempt {attempt})[/]")
             except Exception as e:
                 pass
 
-            # Method 3: Try a different endpoint format
-            try:
-                url = f"{api_url}/projects/{project_id}/traces/{trace_id}/metrics"
-                response = requests.get(url, headers=headers)
+        return None
 
-                if response.status_code == 200:
-                    metrics = response.json()
+    def poll_metrics():
+        nonlocal attempt
+        attempt += 1
 
-                    # Check if the target metric exists and has a value
-                    if has_target_metric(metrics, target_metric):
-                        console.print(f"[bold green]✓ Found '{target_metric}' metric in alternative API endpoint (attempt {attempt})[/]")
-                        return metrics
-                    else:
-                        console.print(f"[bold yellow]⚠ Metrics found but '{target_metric}' not present yet (attempt {attempt})[/]")
-            except Exception as e:
-                pass
+        with timings.phase("metric_wait_attempt", metric=target_metric, attempt=attempt):
+            return find_metrics()
 
-            # Wait before trying again
-            time.sleep(polling_interval)
+    # Create a progress bar for waiting
+    with Progress(
+        SpinnerColumn(),
+        TextColumn(f"[bold blue]Waiting for '{target_metric}' metric..."),
+        BarColumn(),
+        TextColumn("[bold blue]{task.percentage:.0f}%"),
+        TimeElapsedColumn(),
+        TimeRemainingColumn(),
+        expand=True,
+        disable=not show_progress
+    ) as progress:
+        task = progress.add_task("[cyan]Polling...", total=max_wait_time)
+
+        metrics = polling.eventually(
+            poll_metrics,
+            deadline=max_wait_time,
+            backoff=polling.exponential_backoff(initial=1.0, max_interval=polling_interval),
+            description=f"'{target_metric}' metric for trace {trace_id}",
+            on_attempt=lambda _, elapsed: progress.update(task, completed=min(elapsed, max_wait_time)),
+            quiet=True,
+            phase="metric_wait",
+        )
+
+    if metrics:
+        return metrics
 
     console.print(f"[bold yellow]⚠ Timed out after {max_wait_time} seconds. '{target_metric}' metric not found.[/]")
     # Return an empty dict as a fallback
@@ -388,7 +446,7 @@ def get_datasets(api_url, headers, project_id):
     url = f"{api_url}/projects/{project_id}/datasets"
 
     try:
-        response = requests.get(url, headers=headers)
+        response = clients.get_http_session().get(url, headers=headers)
 
         if response.status_code == 200:
             result = response.json()
@@ -413,7 +471,78 @@ def get_datasets(api_url, headers, project_id):
         console.print(f"[bold red]✗ Error fetching datasets: {str(e)}[/]")
         return []
 
-def get_dataset_details(api_url, headers, project_id, dataset_id):
+def find_dataset(api_url, headers, project_id, dataset_name):
+    """
+    Find a dataset by its exact name
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        dataset_name: The dataset name
+
+    Returns:
+        The dataset or None if no dataset has exactly that name
+    """
+    for dataset in get_datasets(api_url, headers, project_id):
+        if dataset.get('name') == dataset_name:
+            return dataset
+
+    return None
+
+def find_dataset_by_name(api_url, headers, dataset_name):
+    """
+    Find a dataset by its exact name, in any project
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_name: The dataset name
+
+    Returns:
+        The dataset or None if no dataset has exactly that name or the lookup fails
+    """
+    body = {"filters": [{"name": "name", "operator": "eq", "value": dataset_name}]}
+
+    try:
+        response = clients.get_http_session().post(f"{api_url}/datasets/query", headers=headers, params={"starting_token": 0, "limit": 100}, json=body)
+
+        if response.status_code != 200:
+            console.print(f"[bold red]✗ Error finding dataset {dataset_name}: {response.status_code}[/]")
+            console.print(f"[red]{response.text}[/]")
+            return None
+
+        for dataset in response.json().get('datasets', []):
+            if dataset.get('name') == dataset_name:
+                return dataset
+        return None
+    except Exception as e:
+        console.print(f"[bold red]✗ Error finding dataset {dataset_name}: {str(e)}[/]")
+        return None
+
+def delete_dataset(api_url, headers, dataset_id):
+    """
+    Delete a dataset
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+
+    Returns:
+        True if the dataset was deleted, False otherwise
+    """
+    url = f"{api_url}/datasets/{dataset_id}"
+
+    response = clients.get_http_session().delete(url, headers=headers)
+
+    if response.status_code in (200, 204):
+        return True
+
+    console.print(f"[bold yellow]⚠ Error deleting dataset {dataset_id}: {response.status_code}[/]")
+    return False
+
+def get_dataset_details(api_url, headers, project_id, dataset_id, include_entries=False, page_size=1000):
     """
     Get detailed information about a specific dataset
 
@@ -422,6 +551,10 @@ def get_dataset_details(api_url, headers, project_id, dataset_id):
         headers: The API request headers
         project_id: The project ID
         dataset_id: The dataset ID
+        include_entries: Whether to also fetch every entry into the 'entries' key (default: False).
+                         Leave this off for metadata lookups, and use iter_dataset_entries to
+                         process the entries of large datasets page by page.
+        page_size: Entries per request when include_entries is set (default: 1000)
 
     Returns:
         The dataset details or None if the dataset is not found
@@ -431,27 +564,16 @@ def get_dataset_details(api_url, headers, project_id, dataset_id):
     url = f"{api_url}/projects/{project_id}/datasets/{dataset_id}"
 
     try:
-        response = requests.get(url, headers=headers)
+        response = clients.get_http_session().get(url, headers=headers)
 
         if response.status_code == 200:
             dataset_data = response.json()
             console.print(f"[bold green]✓ Successfully retrieved dataset details[/]")
 
-            # Get dataset entries if they're not included in the response
-            if 'entries' not in dataset_data:
-                entries_url = f"{url}/entries"
-                entries_response = requests.get(entries_url, headers=headers)
-
-                if entries_response.status_code == 200:
-                    entries_result = entries_response.json()
-
-                    # Check different possible response formats
-                    if isinstance(entries_result, dict) and 'entries' in entries_result:
-                        dataset_data['entries'] = entries_result['entries']
-                    elif isinstance(entries_result, list):
-                        dataset_data['entries'] = entries_result
-
-                    console.print(f"[bold green]✓ Retrieved {len(dataset_data.get('entries', []))} dataset entries[/]")
+            # Get dataset entries if requested and not included in the response
+            if include_entries and 'entries' not in dataset_data:
+                dataset_data['entries'] = list(iter_dataset_entries(api_url, headers, project_id, dataset_id, page_size=page_size))
+                console.print(f"[bold green]✓ Retrieved {len(dataset_data['entries'])} dataset entries[/]")
 
             return dataset_data
         else:
@@ -462,6 +584,196 @@ def get_dataset_details(api_url, headers, project_id, dataset_id):
         console.print(f"[bold red]✗ Error fetching dataset details: {str(e)}[/]")
         return None
 
+def get_dataset(api_url, headers, dataset_id):
+    """
+    Get a dataset's metadata, including its current version
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+
+    Returns:
+        The dataset (with current_version_index, num_rows and column_names) or None if not found
+    """
+    try:
+        response = clients.get_http_session().get(f"{api_url}/datasets/{dataset_id}", headers=headers)
+
+        if response.status_code == 200:
+            return response.json()
+
+        console.print(f"[bold red]✗ Error fetching dataset {dataset_id}: {response.status_code}[/]")
+        console.print(f"[red]{response.text}[/]")
+        return None
+    except Exception as e:
+        console.print(f"[bold red]✗ Error fetching dataset {dataset_id}: {str(e)}[/]")
+        return None
+
+def get_dataset_versions(api_url, headers, dataset_id, page_size=100):
+    """
+    Get the version history of a dataset
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        page_size: Versions per request (default: 100)
+
+    Returns:
+        A list of versions (version_index, num_rows, rows_added, rows_removed, rows_edited,
+        columns_added, ...), or None if the history can't be fetched
+    """
+    url = f"{api_url}/datasets/{dataset_id}/versions/query"
+    versions = []
+    starting_token = 0
+
+    try:
+        while starting_token is not None:
+            response = clients.get_http_session().post(url, headers=headers, params={"starting_token": starting_token, "limit": page_size}, json={})
+
+            if response.status_code != 200:
+                console.print(f"[bold red]✗ Error fetching dataset versions: {response.status_code}[/]")
+                console.print(f"[red]{response.text}[/]")
+                return None
+
+            result = response.json()
+            versions.extend(result.get('versions', []))
+            starting_token = result.get('next_starting_token')
+    except Exception as e:
+        console.print(f"[bold red]✗ Error fetching dataset versions: {str(e)}[/]")
+        return None
+
+    return sorted(versions, key=lambda version: version.get('version_index', 0))
+
+def get_dataset_page(api_url, headers, dataset_id, starting_token=0, page_size=1000, version_index=None):
+    """
+    Get one page of dataset entries
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        dataset_id: The dataset ID
+        starting_token: The pagination token of the page (default: 0, the first page)
+        page_size: Maximum entries in the page (default: 1000)
+        version_index: Read this version of the dataset instead of the current one (optional)
+
+    Returns:
+        A tuple of (entries, next_starting_token); the token is None on the last page
+
+    Raises:
+        requests.HTTPError: If the page can't be fetched, so a partial read is never
+                            mistaken for the whole dataset
+    """
+    if version_index is None:
+        url = f"{api_url}/datasets/{dataset_id}/content"
+    else:
+        url = f"{api_url}/datasets/{dataset_id}/versions/{version_index}/content"
+
+    response = clients.get_http_session().get(url, headers=headers, params={"starting_token": starting_token, "limit": page_size})
+
+    if response.status_code != 200:
+        console.print(f"[bold red]✗ Error fetching dataset entries at {starting_token}: {response.status_code}[/]")
+        console.print(f"[red]{response.text}[/]")
+        response.raise_for_status()
+
+    result = response.json()
+
+    # Check different possible response formats
+    if isinstance(result, dict):
+        return result.get('rows', result.get('entries', [])), result.get('next_starting_token')
+
+    # A plain list isn't paginated
+    return result, None
+
+def _iter_pages(fetch_page, starting_token, prefetch, phase_name, page_size):
+    """
+    Iterate over paginated results, optionally fetching the next page in the background
+
+    Args:
+        fetch_page: A function taking a starting token and returning (items, next_starting_token)
+        starting_token: The token of the first page
+        prefetch: Whether to fetch the next page while the current one is processed
+        phase_name: The timings phase recorded for each page
+        page_size: The page size, recorded as a timings label
+
+    Yields:
+        Lists of items
+    """
+    # Imported here, as only paginated reads need a background thread
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+    try:
+        with timings.phase(phase_name, page_size=page_size):
+            items, next_starting_token = fetch_page(starting_token)
+
+        while items:
+            has_next = next_starting_token is not None
+
+            # Start fetching the next page before handing this one to the caller
+            following = None
+            if executor and has_next:
+                following = executor.submit(fetch_page, next_starting_token)
+
+            yield items
+
+            if not has_next:
+                return
+
+            with timings.phase(phase_name, page_size=page_size):
+                if following:
+                    items, next_starting_token = following.result()
+                else:
+                    items, next_starting_token = fetch_page(next_starting_token)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_dataset_pages(api_url, headers, project_id, dataset_id, page_size=1000, prefetch=True, starting_token=0, version_index=None):
+    """
+    Iterate over the entries of a dataset one page at a time
+
+    Only the current page (and, with prefetch, the next one) is held in memory, so this
+    works for datasets of any size.
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID (dataset content isn't project-scoped, so this may be None)
+        dataset_id: The dataset ID
+        page_size: Maximum entries per page (default: 1000)
+        prefetch: Whether to fetch the next page while the current one is processed (default: True)
+        starting_token: The pagination token to start from, i.e. the number of entries to
+                        skip (default: 0)
+        version_index: Read this version of the dataset instead of the current one (optional)
+
+    Yields:
+        Lists of entries
+    """
+    def fetch_page(token):
+        return get_dataset_page(api_url, headers, dataset_id, token, page_size, version_index)
+
+    yield from _iter_pages(fetch_page, starting_token, prefetch, "dataset_page", page_size)
+
+def iter_dataset_entries(api_url, headers, project_id, dataset_id, page_size=1000, prefetch=True):
+    """
+    Iterate over the entries of a dataset, fetched page by page
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID (dataset content isn't project-scoped, so this may be None)
+        dataset_id: The dataset ID
+        page_size: Maximum entries per request (default: 1000)
+        prefetch: Whether to fetch the next page while the current one is processed (default: True)
+
+    Yields:
+        Entry dictionaries
+    """
+    for entries in iter_dataset_pages(api_url, headers, project_id, dataset_id, page_size, prefetch):
+        yield from entries
+
 def get_experiments(api_url, headers, project_id):
     """
     Get experiments from the Galileo API
@@ -503,7 +815,7 @@ def get_experiments(api_url, headers, project_id):
             url = f"{api_url}{endpoint}"
 
             console.print(f"[bold cyan]Trying endpoint: {url}[/]")
-            response = requests.get(url, headers=headers, params=params)
+            response = clients.get_http_session().get(url, headers=headers, params=params)
 
             if response.status_code == 200:
                 result = response.json()
@@ -528,6 +840,29 @@ def get_experiments(api_url, headers, project_id):
     console.print(f"[bold red]✗ Could not fetch experiments from any endpoint[/]")
     return []
 
+def delete_experiment(api_url, headers, project_id, experiment_id):
+    """
+    Delete an experiment and its traces
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        experiment_id: The experiment ID
+
+    Returns:
+        True if the experiment was deleted, False otherwise
+    """
+    url = f"{api_url}/projects/{project_id}/experiments/{experiment_id}"
+
+    response = clients.get_http_session().delete(url, headers=headers)
+
+    if response.status_code in (200, 204):
+        return True
+
+    console.print(f"[bold yellow]⚠ Error deleting experiment {experiment_id}: {response.status_code}[/]")
+    return False
+
 def get_experiment_details(api_url, headers, project_id, experiment_id):
     """
     Get detailed information about a specific experiment
@@ -578,7 +913,7 @@ def get_experiment_details(api_url, headers, project_id, experiment_id):
             url = f"{api_url}{endpoint}"
 
             console.print(f"[bold cyan]Trying endpoint: {url}[/]")
-            response = requests.get(url, headers=headers, params=params)
+            response = clients.get_http_session().get(url, headers=headers, params=params)
 
             if response.status_code == 200:
                 experiment_data = response.json()
@@ -592,3 +927,177 @@ def get_experiment_details(api_url, headers, project_id, experiment_id):
     # If we've tried all endpoints and none worked, return None
     console.print(f"[bold red]✗ Could not fetch experiment details from any endpoint[/]")
     return None
+
+# Projects whose experiment search endpoint is missing, keyed by (api_url, project_id)
+_experiment_search_unsupported = set()
+
+# Experiments seen so far per (api_url, project_id): {"by_id": {id: experiment}, "complete": bool}
+_experiment_indexes = {}
+_experiment_index_lock = threading.Lock()
+
+def _experiment_name_matches(experiment, name, exact):
+    """Check an experiment's name against an exact name or a case-insensitive substring"""
+    experiment_name = experiment.get('name') or ""
+    return experiment_name == name if exact else name.lower() in experiment_name.lower()
+
+def _newest_match(experiments, name, exact):
+    """Get the most recently created experiment with a matching name"""
+    matches = [experiment for experiment in experiments if _experiment_name_matches(experiment, name, exact)]
+    return max(matches, key=lambda experiment: experiment.get('created_at') or "", default=None)
+
+def search_experiments(api_url, headers, project_id, name, exact=True, page_size=100):
+    """
+    Search a project's experiments by name on the server
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        name: The experiment name, or a substring of it if exact is False
+        exact: Whether the name must match exactly (default: True)
+        page_size: Experiments per request (default: 100)
+
+    Returns:
+        A list of matching experiments, or None if the server doesn't support searching
+    """
+    if (api_url, project_id) in _experiment_search_unsupported:
+        return None
+
+    name_filter = {"filter_type": "string", "name": "name", "operator": "eq" if exact else "contains", "value": name, "case_sensitive": exact}
+    url = f"{api_url}/projects/{project_id}/experiments/search"
+    experiments = []
+    starting_token = 0
+
+    while starting_token is not None:
+        response = clients.get_http_session().post(url, headers=headers, json={"filters": [name_filter], "starting_token": starting_token, "limit": page_size})
+
+        if response.status_code in (404, 405, 422):
+            # Remember it, so later lookups go straight to the local index
+            _experiment_search_unsupported.add((api_url, project_id))
+            return None
+        response.raise_for_status()
+
+        result = response.json()
+        experiments.extend(result.get('experiments', []))
+        starting_token = result.get('next_starting_token')
+
+    # Filter again, in case the server ignored a filter it doesn't know
+    return [experiment for experiment in experiments if _experiment_name_matches(experiment, name, exact)]
+
+def _refresh_experiment_index(api_url, headers, project_id, index, name, exact, page_size):
+    """
+    Page through the experiment listing into the index until name is found
+
+    The listing is newest first, so once a whole page is already indexed, every
+    experiment after it is too and paging stops.
+    """
+    url = f"{api_url}/projects/{project_id}/experiments/paginated"
+    starting_token = 0
+
+    while starting_token is not None:
+        response = clients.get_http_session().get(url, headers=headers, params={"starting_token": starting_token, "limit": page_size})
+        response.raise_for_status()
+
+        result = response.json()
+        page = result.get('experiments', [])
+        new = [experiment for experiment in page if experiment.get('id') not in index["by_id"]]
+        index["by_id"].update((experiment.get('id'), experiment) for experiment in page)
+
+        starting_token = result.get('next_starting_token')
+        if starting_token is None:
+            index["complete"] = True
+
+        if _newest_match(new, name, exact) or (page and not new and index["complete"]):
+            return
+
+def find_experiment(api_url, headers, project_id, name, exact=True, page_size=100):
+    """
+    Find an experiment by name
+
+    The server-side search is used when available. Otherwise the experiment listing is
+    paged into a local name index, kept per project for the life of the process: a
+    repeated lookup (e.g. while polling for a new experiment) only fetches the pages
+    newer than the last lookup, and paging stops as soon as the name is found.
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        name: The experiment name, or a substring of it if exact is False
+        exact: Whether the name must match exactly; otherwise matching is a
+               case-insensitive substring (default: True)
+        page_size: Experiments per request (default: 100)
+
+    Returns:
+        The most recently created matching experiment, or None if there is none
+    """
+    with timings.phase("experiment_find"):
+        try:
+            matches = search_experiments(api_url, headers, project_id, name, exact, page_size)
+            if matches is not None:
+                return _newest_match(matches, name, exact)
+
+            with _experiment_index_lock:
+                index = _experiment_indexes.setdefault((api_url, project_id), {"by_id": {}, "complete": False})
+                _refresh_experiment_index(api_url, headers, project_id, index, name, exact, page_size)
+                return _newest_match(index["by_id"].values(), name, exact)
+        except Exception as e:
+            # Fall back to a full listing from whichever endpoint answers
+            console.print(f"[bold yellow]⚠ Indexed experiment lookup failed ({str(e)}), scanning every experiment[/]")
+            return _newest_match(get_experiments(api_url, headers, project_id), name, exact)
+
+def get_experiment_records_page(api_url, headers, project_id, experiment_id, starting_token=0, page_size=500):
+    """
+    Get one page of an experiment's per-row trace records
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        experiment_id: The experiment ID
+        starting_token: The pagination token of the page (default: 0, the first page)
+        page_size: Maximum records in the page (default: 500)
+
+    Returns:
+        A tuple of (records, next_starting_token); the token is None on the last page
+
+    Raises:
+        requests.HTTPError: If the page can't be fetched, so a partial export is never
+                            mistaken for the whole experiment
+    """
+    url = f"{api_url}/projects/{project_id}/traces/search"
+    params = {"experiment_id": experiment_id, "starting_token": starting_token, "limit": page_size}
+
+    response = clients.get_http_session().post(url, headers=headers, json=params)
+
+    if response.status_code != 200:
+        console.print(f"[bold red]✗ Error fetching experiment records at {starting_token}: {response.status_code}[/]")
+        console.print(f"[red]{response.text}[/]")
+        response.raise_for_status()
+
+    result = response.json()
+
+    if isinstance(result, dict):
+        return result.get('records', result.get('traces', [])), result.get('next_starting_token')
+
+    return result, None
+
+def iter_experiment_record_pages(api_url, headers, project_id, experiment_id, page_size=500, prefetch=True):
+    """
+    Iterate over an experiment's per-row trace records one page at a time
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        experiment_id: The experiment ID
+        page_size: Maximum records per page (default: 500)
+        prefetch: Whether to fetch the next page while the current one is processed (default: True)
+
+    Yields:
+        Lists of trace records
+    """
+    def fetch_page(token):
+        return get_experiment_records_page(api_url, headers, project_id, experiment_id, token, page_size)
+
+    yield from _iter_pages(fetch_page, 0, prefetch, "experiment_page", page_size)
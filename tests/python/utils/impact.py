@@ -0,0 +1,317 @@
+"""
+Change Impact Utilities
+
+This module selects the harness tests affected by a change. Each test depends on:
+
+- the files in its own directory (test.py, app.py, before.py, after.py, requirements.txt)
+- the docs pages it covers, plus the snippets those pages import
+- the utility modules it imports, directly or through other utility modules
+
+The changed files come from the git diff against the base branch (including uncommitted and
+untracked files), and a test is selected when any of its dependencies changed.
+
+    python -m tests.python.utils.impact --base origin/main
+"""
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+
+from rich.table import Table
+
+from .terminal import console
+
+# The tests/python directory that holds every harness, and the docs repository root
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPO_ROOT = os.path.abspath(os.path.join(TESTS_ROOT, "..", ".."))
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The docs pages each test covers, relative to the repository root
+TEST_PAGES = {
+    "getting-started": [
+        "getting-started/quickstart.mdx",
+    ],
+    "how-to-guides/conversational-ai/fixing-hallucinations": [
+        "how-to-guides/conversational-ai/fixing-hallucinations-and-factual-errors.mdx",
+    ],
+    "sdk/context-manager": [
+        "sdk-api/python/logging/galileo-context.mdx",
+        "sdk-api/python/wrappers/openai.mdx",
+    ],
+    "sdk/datasets": [
+        "sdk-api/python/datasets.mdx",
+        "sdk-api/python/experimentation/datasets.mdx",
+    ],
+    "sdk/experiments": [
+        "sdk-api/python/experiments.mdx",
+    ],
+    "sdk/langchain": [
+        "sdk-api/python/wrappers/langchain.mdx",
+    ],
+    "sdk/openai-wrapper": [
+        "sdk-api/python/wrappers/openai.mdx",
+        "sdk-api/python/wrappers/wrappers-overview.mdx",
+    ],
+}
+
+# Candidate base branches, in order of preference, when none is given
+BASE_BRANCH_CANDIDATES = ["origin/main", "main", "origin/master", "master"]
+
+# MDX imports such as: import Snippet from "/snippets/code/python/sdk/datasets/create.mdx";
+MDX_IMPORT_PATTERN = re.compile(r'^import\s+\w+\s+from\s+["\'](/[^"\']+)["\']', re.MULTILINE)
+
+def page_dependencies(page, repo_root=REPO_ROOT):
+    """
+    Get a docs page and every snippet it imports, recursively
+
+    Args:
+        page: The page path relative to the repository root
+        repo_root: The repository root (default: the docs repository)
+
+    Returns:
+        A set of paths relative to the repository root
+    """
+    found = set()
+    pending = [page]
+
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+
+        try:
+            with open(os.path.join(repo_root, path)) as f:
+                content = f.read()
+        except OSError:
+            continue
+
+        pending.extend(match.lstrip("/") for match in MDX_IMPORT_PATTERN.findall(content))
+
+    return found
+
+def _imported_utils(path):
+    """
+    Get the utility modules a Python file imports
+
+    Handles `from tests.python.utils import x`, `from tests.python.utils.x import ...`,
+    `import tests.python.utils.x` and, inside utils, `from . import x` and `from .x import ...`.
+    Importing the package itself also runs utils/__init__.py, so that counts as "__init__".
+
+    Args:
+        path: The Python file path
+
+    Returns:
+        A set of module names, e.g. {"__init__", "config", "galileo_api"}
+    """
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError):
+        return set()
+
+    in_utils = os.path.dirname(os.path.abspath(path)) == UTILS_DIR
+    modules = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.module == "tests.python.utils" or (in_utils and node.level == 1 and not node.module):
+                modules.add("__init__")
+                modules.update(alias.name for alias in node.names)
+            elif node.module and node.module.startswith("tests.python.utils."):
+                modules.add("__init__")
+                modules.add(node.module.split(".")[3])
+            elif in_utils and node.level == 1 and node.module:
+                modules.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith("tests.python.utils"):
+                    modules.add("__init__")
+                    parts = alias.name.split(".")
+                    if len(parts) > 3:
+                        modules.add(parts[3])
+
+    # Keep only names that are utility modules (not functions imported from them)
+    return {name for name in modules if os.path.exists(os.path.join(UTILS_DIR, f"{name}.py"))}
+
+def utils_dependencies(test_id, root=TESTS_ROOT):
+    """
+    Get every utility module a test depends on, following imports between utility modules
+
+    Args:
+        test_id: The test ID
+        root: The tests root (default: tests/python)
+
+    Returns:
+        A sorted list of module names
+    """
+    test_dir = os.path.join(root, test_id)
+    pending = set()
+
+    for filename in os.listdir(test_dir):
+        if filename.endswith(".py"):
+            pending.update(_imported_utils(os.path.join(test_dir, filename)))
+
+    found = set()
+    while pending:
+        module = pending.pop()
+        if module in found:
+            continue
+        found.add(module)
+        pending.update(_imported_utils(os.path.join(UTILS_DIR, f"{module}.py")) - found)
+
+    return sorted(found)
+
+def test_dependencies(test_id, root=TESTS_ROOT, repo_root=REPO_ROOT):
+    """
+    Get the dependencies of a test
+
+    Args:
+        test_id: The test ID
+        root: The tests root (default: tests/python)
+        repo_root: The repository root (default: the docs repository)
+
+    Returns:
+        A dictionary with directory (a path prefix), pages and utils (sets of paths),
+        all relative to the repository root
+    """
+    pages = set()
+    for page in TEST_PAGES.get(test_id, []):
+        pages.update(page_dependencies(page, repo_root))
+
+    utils = {os.path.relpath(os.path.join(UTILS_DIR, f"{module}.py"), repo_root).replace(os.sep, "/") for module in utils_dependencies(test_id, root)}
+
+    return {
+        "directory": os.path.relpath(os.path.join(root, test_id), repo_root).replace(os.sep, "/") + "/",
+        "pages": pages,
+        "utils": utils,
+    }
+
+def _git(args, repo_root=REPO_ROOT):
+    """Run a git command and return its stdout lines, or None if it fails"""
+    result = subprocess.run(["git", *args], cwd=repo_root, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        return None
+
+    return [line for line in result.stdout.splitlines() if line]
+
+def detect_base_branch(repo_root=REPO_ROOT):
+    """
+    Find the base branch to diff against
+
+    Returns:
+        HARNESS_BASE_BRANCH if set, otherwise the first existing branch of
+        BASE_BRANCH_CANDIDATES, or None if there is none
+    """
+    if os.environ.get("HARNESS_BASE_BRANCH"):
+        return os.environ["HARNESS_BASE_BRANCH"]
+
+    for candidate in BASE_BRANCH_CANDIDATES:
+        if _git(["rev-parse", "--verify", "--quiet", candidate], repo_root) is not None:
+            return candidate
+
+    return None
+
+def changed_files(base=None, repo_root=REPO_ROOT):
+    """
+    Get the files changed since the branch point with the base branch
+
+    Includes committed, staged, unstaged and untracked changes.
+
+    Args:
+        base: The base branch or commit (default: detect_base_branch())
+        repo_root: The repository root (default: the docs repository)
+
+    Returns:
+        A sorted list of paths relative to the repository root, or None if the diff
+        could not be computed
+    """
+    base = base or detect_base_branch(repo_root)
+    if not base:
+        return None
+
+    merge_base = _git(["merge-base", base, "HEAD"], repo_root)
+    if not merge_base:
+        return None
+
+    # Diffing the merge base against the working tree covers commits and local changes
+    changed = _git(["diff", "--name-only", merge_base[0]], repo_root)
+    untracked = _git(["ls-files", "--others", "--exclude-standard"], repo_root)
+
+    if changed is None:
+        return None
+
+    return sorted(set(changed) | set(untracked or []))
+
+def select_impacted_tests(test_ids, changed, root=TESTS_ROOT, repo_root=REPO_ROOT):
+    """
+    Select the tests affected by a set of changed files
+
+    Args:
+        test_ids: The candidate test IDs
+        changed: Changed paths relative to the repository root
+        root: The tests root (default: tests/python)
+        repo_root: The repository root (default: the docs repository)
+
+    Returns:
+        A dictionary mapping each impacted test ID to the changed files that selected it
+    """
+    impacted = {}
+
+    for test_id in test_ids:
+        dependencies = test_dependencies(test_id, root, repo_root)
+        reasons = [
+            path for path in changed
+            if path.startswith(dependencies["directory"]) or path in dependencies["pages"] or path in dependencies["utils"]
+        ]
+
+        if reasons:
+            impacted[test_id] = reasons
+
+    return impacted
+
+def display_impact(impacted, test_ids):
+    """
+    Display the impacted tests and why they were selected
+
+    Args:
+        impacted: The result of select_impacted_tests
+        test_ids: The candidate test IDs
+    """
+    table = Table(title="Impacted Tests", show_header=True, header_style="bold cyan")
+    table.add_column("Test", style="cyan")
+    table.add_column("Selected by", style="cyan")
+
+    for test_id in test_ids:
+        if test_id in impacted:
+            reasons = impacted[test_id]
+            summary = ", ".join(reasons[:3]) + (f" (+{len(reasons) - 3} more)" if len(reasons) > 3 else "")
+            table.add_row(f"[green]{test_id}[/]", summary)
+        else:
+            table.add_row(f"[dim]{test_id}[/]", "[dim]not impacted[/]")
+
+    console.print(table)
+    console.print(f"[bold cyan]{len(impacted)}/{len(test_ids)} tests impacted[/]")
+
+def main():
+    """Main function"""
+    # Imported here to avoid a circular import, as the suite runner uses this module
+    from .suite_runner import discover_tests
+
+    parser = argparse.ArgumentParser(description="List the harness tests affected by changes against a base branch")
+    parser.add_argument("--base", default=None, help="Base branch or commit (default: HARNESS_BASE_BRANCH or main/master)")
+    args = parser.parse_args()
+
+    changed = changed_files(args.base)
+    if changed is None:
+        console.print("[bold red]✗ Could not compute the diff against the base branch[/]")
+        return
+
+    test_ids = discover_tests()
+    display_impact(select_impacted_tests(test_ids, changed), test_ids)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Import Time Utilities
+
+This module measures how long each utility module takes to import, using `python -X importtime`
+in a fresh interpreter per module, and guards against regressions. The check command fails
+when a lightweight module pulls in a heavy package (galileo, openai, numpy, ...), when a
+submodule is missing from the package's `__all__` (and so can't be accessed lazily) or, given
+a baseline, when a module's import time grows beyond a threshold.
+
+    python -m tests.python.utils.import_time show
+    python -m tests.python.utils.import_time save import-baseline.json
+    python -m tests.python.utils.import_time check --baseline import-baseline.json --threshold 0.5
+"""
+
+import argparse
+import functools
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+
+from rich.table import Table
+
+from . import __all__ as PACKAGE_ALL
+from . import timings
+from .terminal import console
+
+# The repository root, so that `tests.python.utils` is importable in the child interpreter
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+PACKAGE = "tests.python.utils"
+
+# Packages that are slow to import and should only be loaded by the modules that need them
+HEAVY_PACKAGES = ("galileo", "openai", "langchain", "langchain_openai", "numpy", "pandas", "pyarrow")
+
+# Modules that must import without any heavy package ("" is the package itself)
+LIGHT_MODULES = (
+    "", "app_runner", "clients", "config", "dataset_upload", "display", "experiment_runner", "galileo_api", "impact",
+    "import_time", "polling", "resource_cache", "result_cache", "run_scope", "session", "sharding", "stub_server",
+    "suite_runner", "terminal", "timings", "usage",
+)
+
+# Modules measured by default
+DEFAULT_MODULES = LIGHT_MODULES + ("benchmark", "dataset_cache", "dataset_dedup", "dataset_sync", "experiment_compare", "experiment_export", "prompt_runner", "stats")
+
+# Standalone scripts in the package directory, which exit at import without credentials
+SCRIPTS = ("register_scorer", "setup_project")
+
+def unregistered_modules():
+    """
+    Compare the package's `__all__` with the modules in its directory
+
+    Returns:
+        A tuple of (missing, unknown) sorted lists: modules in the directory that are not in
+        `__all__`, and names in `__all__` that are not modules in the directory
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    modules = {info.name for info in pkgutil.iter_modules([package_dir])} - set(SCRIPTS)
+
+    return sorted(modules - set(PACKAGE_ALL)), sorted(set(PACKAGE_ALL) - modules)
+
+def parse_importtime(output):
+    """
+    Parse the stderr of `python -X importtime`
+
+    Args:
+        output: The stderr text
+
+    Returns:
+        A dictionary mapping module names to (self, cumulative) import times in seconds
+    """
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+
+        # Times are reported in microseconds
+        modules[fields[2].strip()] = (int(fields[0]) / 1e6, int(fields[1]) / 1e6)
+
+    return modules
+
+def _run_importtime(code):
+    """Run code in a fresh interpreter with -X importtime"""
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+
+@functools.lru_cache(maxsize=None)
+def startup_modules():
+    """
+    Get the modules every interpreter imports before running any code (site, .pth hooks, ...)
+
+    Returns:
+        A frozenset of module names, excluded from every measurement
+    """
+    return frozenset(parse_importtime(_run_importtime("pass").stderr))
+
+def measure(module, repeats=3):
+    """
+    Measure the import of a utility module in fresh interpreters
+
+    Args:
+        module: The utility module name, or "" for the package itself
+        repeats: Number of interpreters to measure in; the fastest run is kept (default: 3)
+
+    Returns:
+        A dictionary with module, seconds (cumulative import time), heavy (heavy packages
+        imported) and slowest (the five slowest dependencies as (name, seconds) pairs),
+        or None if the import failed
+    """
+    name = f"{PACKAGE}.{module}" if module else PACKAGE
+    best = None
+
+    for _ in range(max(1, repeats)):
+        result = _run_importtime(f"import {name}")
+
+        if result.returncode != 0:
+            console.print(f"[bold red]✗ Could not import {name}: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode}[/]")
+            return None
+
+        modules = parse_importtime(result.stderr)
+        if name in modules and (best is None or modules[name][1] < best[name][1]):
+            best = modules
+
+    if best is None:
+        return None
+
+    imported_by_module = {imported: times for imported, times in best.items() if imported not in startup_modules()}
+    top_level = {imported.split(".")[0] for imported in imported_by_module}
+    dependencies = [(imported, times[1]) for imported, times in imported_by_module.items() if not imported.startswith(PACKAGE) and "." not in imported]
+
+    return {
+        "module": module or "(package)",
+        "seconds": best[name][1],
+        "heavy": sorted(top_level & set(HEAVY_PACKAGES)),
+        "slowest": sorted(dependencies, key=lambda dependency: -dependency[1])[:5],
+    }
+
+def to_summary(measurements):
+    """
+    Convert measurements to the per-phase summary format of timings.py
+
+    Args:
+        measurements: Results of measure
+
+    Returns:
+        A dictionary mapping "import/<module>" to count, total, mean and max, so that the
+        comparison helpers of timings.py can be reused
+    """
+    return {
+        f"import/{measurement['module']}": {"count": 1, "total": measurement["seconds"], "mean": measurement["seconds"], "max": measurement["seconds"]}
+        for measurement in measurements
+    }
+
+def heavy_violations(measurements):
+    """
+    Find lightweight modules that import heavy packages
+
+    Args:
+        measurements: Results of measure
+
+    Returns:
+        A list of (module, heavy packages) pairs
+    """
+    light = {module or "(package)" for module in LIGHT_MODULES}
+    return [(measurement["module"], measurement["heavy"]) for measurement in measurements if measurement["module"] in light and measurement["heavy"]]
+
+def display_measurements(measurements):
+    """
+    Display import times
+
+    Args:
+        measurements: Results of measure
+    """
+    table = Table(title="Import Times", show_header=True, header_style="bold cyan")
+    table.add_column("Module", style="cyan")
+    table.add_column("Import Time", style="cyan")
+    table.add_column("Heavy Packages", style="cyan")
+    table.add_column("Slowest Dependencies", style="cyan")
+
+    for measurement in sorted(measurements, key=lambda measurement: -measurement["seconds"]):
+        heavy = f"[red]{', '.join(measurement['heavy'])}[/]" if measurement["heavy"] else "-"
+        slowest = ", ".join(f"{name} ({seconds * 1000:.0f}ms)" for name, seconds in measurement["slowest"][:3])
+        table.add_row(measurement["module"], f"{measurement['seconds'] * 1000:.0f}ms", heavy, slowest or "-")
+
+    console.print(table)
+
+def main():
+    """
+    Main function
+
+    Returns:
+        False if the check command found a regression, True otherwise
+    """
+    parser = argparse.ArgumentParser(description="Measure and guard the import time of the harness utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    show_parser = subparsers.add_parser("show", help="Show the import time of each module")
+    save_parser = subparsers.add_parser("save", help="Save import times as a baseline")
+    save_parser.add_argument("path")
+    check_parser = subparsers.add_parser("check", help="Fail on heavy imports in lightweight modules, or on regressions against a baseline")
+    check_parser.add_argument("--baseline", default=None, help="Baseline written by the save command")
+    check_parser.add_argument("--threshold", type=float, default=0.5, help="Allowed relative growth per module, e.g. 0.5 for 50%%")
+    check_parser.add_argument("--min-delta", type=float, default=0.05, help="Growth in seconds below which a module never fails")
+
+    for subparser in (show_parser, save_parser, check_parser):
+        subparser.add_argument("--module", action="append", default=None, help="Module to measure (repeatable, default: every utility module)")
+        subparser.add_argument("--repeats", type=int, default=3, help="Interpreters per module; the fastest run is kept")
+
+    args = parser.parse_args()
+
+    modules = args.module or DEFAULT_MODULES
+    measurements = [measurement for measurement in (measure(module, args.repeats) for module in modules) if measurement]
+    display_measurements(measurements)
+
+    if len(measurements) != len(modules):
+        return False
+
+    if args.command == "save":
+        os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+        with open(args.path, "w") as f:
+            json.dump({"python": sys.version.split()[0], "summary": to_summary(measurements)}, f, indent=2)
+        console.print(f"[bold green]✓ Baseline written to {args.path}[/]")
+        return True
+
+    if args.command == "show":
+        return True
+
+    passed = True
+
+    violations = heavy_violations(measurements)
+    for module, heavy in violations:
+        console.print(f"[bold red]✗ {module} imports {', '.join(heavy)} at import time[/]")
+        passed = False
+    if not violations:
+        console.print("[bold green]✓ No lightweight module imports a heavy package[/]")
+
+    missing, unknown = unregistered_modules()
+    for module in missing:
+        console.print(f"[bold red]✗ {module} is missing from {PACKAGE}.__all__[/]")
+    for module in unknown:
+        console.print(f"[bold red]✗ {PACKAGE}.__all__ lists {module}, which is not a module[/]")
+    if missing or unknown:
+        passed = False
+    else:
+        console.print(f"[bold green]✓ Every submodule is listed in {PACKAGE}.__all__[/]")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["summary"]
+        rows = timings.compare(to_summary(measurements), baseline, threshold=args.threshold, min_delta=args.min_delta)
+        timings.display_comparison(rows, args.threshold)
+        passed = passed and not any(row["regressed"] for row in rows)
+
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,128 @@
+"""
+Polling Utilities
+
+This module provides eventually(), a poller for checks that only pass once the backend has
+caught up (new traces, datasets, experiments or metrics). It polls quickly at first and
+backs off, returns as soon as the check passes, and records the attempt count and latency
+of every poll so slow verifications show up in the output.
+"""
+
+import threading
+import time
+
+from . import timings
+from .terminal import console
+
+_records_lock = threading.Lock()
+_records = []
+
+def exponential_backoff(initial=0.25, factor=2.0, max_interval=5.0):
+    """
+    Generate exponentially growing sleep intervals
+
+    Args:
+        initial: The first interval in seconds (default: 0.25)
+        factor: The growth factor between intervals (default: 2.0)
+        max_interval: The largest interval in seconds (default: 5.0)
+
+    Yields:
+        Sleep intervals in seconds
+    """
+    interval = initial
+    while True:
+        yield min(interval, max_interval)
+        interval *= factor
+
+class PollRecord:
+    """The outcome of one eventually() call"""
+
+    def __init__(self, description, attempts, elapsed, succeeded):
+        """
+        Initialize the record
+
+        Args:
+            description: What was polled for
+            attempts: Number of times the predicate ran
+            elapsed: Seconds from the first attempt until success or the deadline
+            succeeded: Whether the predicate became truthy before the deadline
+        """
+        self.description = description
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.succeeded = succeeded
+
+    def to_dict(self):
+        """
+        Serialize the record
+
+        Returns:
+            A dictionary with description, attempts, elapsed and succeeded
+        """
+        return {"description": self.description, "attempts": self.attempts, "elapsed": self.elapsed, "succeeded": self.succeeded}
+
+def eventually(predicate, deadline=60, backoff=None, description="condition", on_attempt=None, quiet=False, phase=None):
+    """
+    Poll a predicate until it returns a truthy value or the deadline passes
+
+    The predicate always runs at least once, and the last sleep is cut short so the final
+    attempt happens right at the deadline rather than after it.
+
+    Args:
+        predicate: A function taking no arguments; its truthy return value ends the poll
+        deadline: Maximum time to keep polling in seconds (default: 60)
+        backoff: An iterable of sleep intervals in seconds (default: exponential_backoff())
+        description: What is being polled for, used in messages and records (default: "condition")
+        on_attempt: Called with (attempt, elapsed) before each attempt, e.g. to update a
+                    progress bar (optional)
+        quiet: Whether to skip the result message (default: False)
+        phase: A timings phase name to record the whole poll under, e.g. "trace_lookup" (optional)
+
+    Returns:
+        The predicate's first truthy value, or its last value if the deadline passed
+    """
+    intervals = iter(backoff if backoff is not None else exponential_backoff())
+    start_time = time.monotonic()
+    attempts = 0
+
+    while True:
+        attempts += 1
+        if on_attempt:
+            on_attempt(attempts, time.monotonic() - start_time)
+
+        value = predicate()
+        elapsed = time.monotonic() - start_time
+
+        if value:
+            _record(PollRecord(description, attempts, elapsed, True), phase)
+            if not quiet:
+                console.print(f"[bold green]✓ {description} after {attempts} attempt(s) in {elapsed:.1f}s[/]")
+            return value
+
+        remaining = deadline - elapsed
+        if remaining <= 0:
+            break
+
+        time.sleep(min(next(intervals, remaining), remaining))
+
+    _record(PollRecord(description, attempts, elapsed, False), phase)
+    if not quiet:
+        console.print(f"[bold yellow]⚠ {description} not met after {attempts} attempt(s) in {elapsed:.1f}s[/]")
+    return value
+
+def _record(record, phase=None):
+    """Store a poll record, and time it as a phase if one is given"""
+    with _records_lock:
+        _records.append(record)
+
+    if phase:
+        timings.record(phase, record.elapsed, attempts=record.attempts, succeeded=record.succeeded)
+
+def get_records():
+    """
+    Get the records of every eventually() call in this process
+
+    Returns:
+        A list of PollRecord, oldest first
+    """
+    with _records_lock:
+        return list(_records)
@@ -3,20 +3,55 @@ Prompt Runner Utilities
 
 This module provides reusable functions for running prompts and collecting metrics,
 including running prompts with Galileo tracking and waiting for metrics.
+
+Setting HARNESS_TRIALS to a number above 1 makes the before/after testbeds run that many
+trials of each prompt (see run_trial_comparison) instead of a single run.
 """
 
+import os
 import time
-from rich.console import Console
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from rich.panel import Panel
 from rich.status import Status
 
-from galileo import galileo_context
+from . import display
 from . import galileo_api
+from . import stats
+from . import timings
+from . import usage
+from .terminal import console
+
+# Environment variable with the number of trials per prompt in the before/after testbeds
+TRIALS_ENV = "HARNESS_TRIALS"
+
+def get_trials(trials=None):
+    """
+    Resolve the number of trials per prompt
+
+    Args:
+        trials: An explicit number of trials (optional)
+
+    Returns:
+        The number of trials, from the argument, HARNESS_TRIALS or 1 (a single run)
+    """
+    if trials is None:
+        value = os.environ.get(TRIALS_ENV)
+        try:
+            trials = int(value) if value else 1
+        except ValueError:
+            console.print(f"[bold yellow]⚠ Ignoring {TRIALS_ENV}={value}: expected a whole number[/]")
+            trials = 1
 
-# Initialize rich console
-console = Console()
+    return max(1, trials)
 
-def run_prompt(client, prompt, model="gpt-4o"):
+def _flush_galileo():
+    """Flush the Galileo logger, importing galileo only when there's something to flush"""
+    from galileo import galileo_context
+    galileo_context.flush()
+
+def run_prompt(client, prompt, model="gpt-4o", show_status=True, usage_tracker=None):
     """
     Run a prompt using the Galileo OpenAI client
 
@@ -24,17 +59,40 @@ def run_prompt(client, prompt, model="gpt-4o"):
         client: An initialized Galileo OpenAI client
         prompt: The prompt to run
         model: The model to use (default: "gpt-4o")
+        show_status: Whether to show a spinner while waiting (default: True)
+        usage_tracker: A usage.UsageTracker to record token usage in (optional)
 
     Returns:
         The model's response content
     """
+    content, _ = run_prompt_with_usage(client, prompt, model, show_status=show_status, usage_tracker=usage_tracker)
+    return content
+
+def run_prompt_with_usage(client, prompt, model="gpt-4o", show_status=True, usage_tracker=None):
+    """
+    Run a prompt using the Galileo OpenAI client and report its token usage
+
+    Args:
+        client: An initialized Galileo OpenAI client
+        prompt: The prompt to run
+        model: The model to use (default: "gpt-4o")
+        show_status: Whether to show a spinner while waiting (default: True)
+        usage_tracker: A usage.UsageTracker to record token usage in (optional)
+
+    Returns:
+        A tuple of (response_content, run_usage) where run_usage is a usage totals dictionary
+    """
+    if usage_tracker is None:
+        usage_tracker = usage.UsageTracker()
+
     console.print(f"[bold blue]ℹ Prompt:[/] {prompt}")
 
     # Make API call with Galileo tracking
     console.print("\n[bold cyan]Making API call to OpenAI[/]")
 
     try:
-        with console.status("[bold green]Sending request to OpenAI...", spinner="dots"):
+        status = console.status("[bold green]Sending request to OpenAI...", spinner="dots") if show_status else nullcontext()
+        with status, timings.phase("llm_call", model=model):
             start_time = time.time()
             response = client.chat.completions.create(
                 model=model,
@@ -45,18 +103,60 @@ def run_prompt(client, prompt, model="gpt-4o"):
         console.print(f"[bold green]✓ API call completed in {elapsed:.2f} seconds[/]")
     except Exception as e:
         console.print(f"[bold red]✗ Error making API call: {str(e)}[/]")
-        return None
+        return None, None
+
+    # Record token usage for this run
+    record = usage_tracker.record_response(response, model=model, prompt=usage.prompt_label([{"content": prompt}]))
+    run_usage = usage_tracker.totals([record] if record else [])
+    console.print(f"[bold cyan]Tokens:[/] {run_usage['prompt_tokens']} prompt + {run_usage['completion_tokens']} completion")
 
     # Return the response content
-    return response.choices[0].message.content.strip()
+    return response.choices[0].message.content.strip(), run_usage
 
-def run_with_metrics(client, prompt, api_url, headers, project_id, log_stream_id, model="gpt-4o", description=None, max_wait_time=120, target_metric="instruction_adherence"):
+def _run_function_with_usage(client, run_function, show_status=True, usage_tracker=None):
+    """
+    Call a run function with a client that records its token usage
+
+    Args:
+        client: An initialized Galileo OpenAI client
+        run_function: A function that takes the client and returns the response content
+        show_status: Whether to show a spinner while waiting (default: True)
+        usage_tracker: A usage.UsageTracker to record token usage in (optional)
+
+    Returns:
+        A tuple of (response_content, run_usage) where run_usage is a usage totals dictionary
+    """
+    if usage_tracker is None:
+        usage_tracker = usage.UsageTracker()
+
+    console.print("\n[bold cyan]Making API call to OpenAI[/]")
+
+    try:
+        status = console.status("[bold green]Sending request to OpenAI...", spinner="dots") if show_status else nullcontext()
+        with status, timings.phase("llm_call"):
+            first_record = len(usage_tracker.records)
+            start_time = time.time()
+            content = run_function(usage_tracker.wrap(client))
+            elapsed = time.time() - start_time
+
+        console.print(f"[bold green]✓ API call completed in {elapsed:.2f} seconds[/]")
+    except Exception as e:
+        console.print(f"[bold red]✗ Error making API call: {str(e)}[/]")
+        return None, None
+
+    run_usage = usage_tracker.totals(usage_tracker.records[first_record:])
+    console.print(f"[bold cyan]Tokens:[/] {run_usage['prompt_tokens']} prompt + {run_usage['completion_tokens']} completion")
+
+    return content, run_usage
+
+def run_with_metrics(client, prompt, api_url, headers, project_id, log_stream_id, model="gpt-4o", description=None, max_wait_time=120, target_metric="instruction_adherence", show_progress=True, trace_lock=None, usage_tracker=None):
     """
     Run a prompt and wait for metrics to be available
 
     Args:
         client: An initialized Galileo OpenAI client
-        prompt: The prompt to run
+        prompt: The prompt to run, or a run function that takes the client and returns the
+                response content (as in run_batch_with_metrics)
         api_url: The Galileo API URL
         headers: The API request headers
         project_id: The project ID
@@ -65,6 +165,12 @@ def run_with_metrics(client, prompt, api_url, headers, project_id, log_stream_id
         description: A description of the prompt (optional)
         max_wait_time: Maximum time to wait for metrics in seconds (default: 120)
         target_metric: The specific metric to wait for (default: "instruction_adherence")
+        show_progress: Whether to show spinners and progress bars (default: True)
+        trace_lock: A lock held while running, flushing and looking up the trace (optional).
+                    Concurrent runs must share one, since the trace is found as the latest
+                    one in the log stream.
+        usage_tracker: A usage.UsageTracker to record token usage in and check the budget
+                       against (optional). The run's usage is added to its records.
 
     Returns:
         A tuple of (response_content, metrics)
@@ -72,26 +178,36 @@ def run_with_metrics(client, prompt, api_url, headers, project_id, log_stream_id
     if description:
         console.rule(f"[bold blue]{description}", style="blue")
 
-    # Run the prompt
-    content = run_prompt(client, prompt, model)
-
-    if not content:
+    if usage_tracker and usage_tracker.exceeded():
+        console.print("[bold yellow]⚠ Token or cost budget reached. Skipping this run.[/]")
         return None, None
 
-    # Print the response
-    console.print("\n[bold cyan]Model Response[/]")
-    console.print(Panel(content, border_style="green", expand=False))
+    with trace_lock or nullcontext():
+        # Run the prompt
+        if callable(prompt):
+            content, _ = _run_function_with_usage(client, prompt, show_status=show_progress, usage_tracker=usage_tracker)
+        else:
+            content, _ = run_prompt_with_usage(client, prompt, model, show_status=show_progress, usage_tracker=usage_tracker)
 
-    # Flush the logger to ensure all logs are sent to Galileo
-    console.print("[bold cyan]Flushing Galileo logger...[/]")
-    try:
-        galileo_context.flush()
-        console.print("[bold green]✓ Galileo logger flushed successfully[/]")
-    except Exception as e:
-        console.print(f"[bold yellow]⚠ Continuing without flush. Metrics may be delayed.[/]")
+        if not content:
+            return None, None
+
+        # Print the response
+        console.print("\n[bold cyan]Model Response[/]")
+        console.print(Panel(content, border_style="green", expand=False))
+
+        # Flush the logger to ensure all logs are sent to Galileo
+        console.print("[bold cyan]Flushing Galileo logger...[/]")
+        try:
+            with timings.phase("flush"):
+                _flush_galileo()
+            console.print("[bold green]✓ Galileo logger flushed successfully[/]")
+        except Exception as e:
+            console.print(f"[bold yellow]⚠ Continuing without flush. Metrics may be delayed.[/]")
 
-    # Get the latest trace ID (should be the one we just created)
-    trace_id = galileo_api.get_latest_trace(api_url, headers, project_id, log_stream_id)
+        # Get the latest trace ID (should be the one we just created)
+        with timings.phase("trace_lookup"):
+            trace_id = galileo_api.get_latest_trace(api_url, headers, project_id, log_stream_id)
 
     if not trace_id:
         console.print("[bold red]✗ Could not find the trace for this run[/]")
@@ -101,16 +217,323 @@ def run_with_metrics(client, prompt, api_url, headers, project_id, log_stream_id
 
     # Wait for the target metric to be available
     console.print(f"\n[bold cyan]Waiting for {target_metric} metric to be available...[/]")
-    metrics = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time, target_metric=target_metric)
+    metrics = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time, target_metric=target_metric, show_progress=show_progress)
 
     # If target metric not found, try again with a longer timeout
     if not galileo_api.has_target_metric(metrics, target_metric):
         console.print(f"[bold yellow]⚠ {target_metric} metric not found on first attempt. Trying again with longer timeout...[/]")
-        metrics = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time * 1.5, target_metric=target_metric)  # 50% longer timeout
+        metrics = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time * 1.5, target_metric=target_metric, show_progress=show_progress)  # 50% longer timeout
 
     return content, metrics
 
-def run_comparison(client, original_prompt, improved_prompt, api_url, headers, project_id, log_stream_id, model="gpt-4o", max_wait_time=120, target_metric="instruction_adherence", delay_between_runs=5):
+class BatchFlusher:
+    """
+    Flush the Galileo logger once per batch of runs instead of after every run
+
+    Runs are recorded with record() after they finish. If max_batch_size runs are pending,
+    or max_flush_interval seconds have passed since the last flush, a background thread
+    flushes the logger. close() stops the thread and flushes whatever is still pending, so
+    every recorded run has been uploaded when it returns.
+
+    The lock is held for each flush. Hold it while generating too, so that a background
+    flush never runs while the logger is recording a trace.
+    """
+
+    def __init__(self, max_batch_size=None, max_flush_interval=None):
+        """
+        Initialize the flusher
+
+        Args:
+            max_batch_size: Flush in the background once this many runs are pending (optional)
+            max_flush_interval: Flush in the background once this many seconds have passed
+                                since the last flush (optional)
+        """
+        self.max_batch_size = max_batch_size
+        self.max_flush_interval = max_flush_interval
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.flush_count = 0
+        self.last_flush = time.time()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        # Only start a background thread if there is a threshold to act on
+        if max_batch_size or max_flush_interval:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def record(self):
+        """Record a finished run, waking the background thread if the batch is full"""
+        with self.lock:
+            self.pending += 1
+            full = self.max_batch_size and self.pending >= self.max_batch_size
+
+        if full:
+            self._wake.set()
+
+    def _is_due(self):
+        """Check whether a size or time threshold has been reached"""
+        if not self.pending:
+            return False
+        if self.max_batch_size and self.pending >= self.max_batch_size:
+            return True
+        return bool(self.max_flush_interval) and time.time() - self.last_flush >= self.max_flush_interval
+
+    def _run(self):
+        """Background loop that flushes whenever a threshold is reached"""
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=self.max_flush_interval)
+            self._wake.clear()
+
+            if not self._stopped.is_set() and self._is_due():
+                self.flush()
+
+    def flush(self):
+        """
+        Flush all pending runs as one batch
+
+        Returns:
+            True if the flush succeeded or nothing was pending, False otherwise
+        """
+        with self.lock:
+            if not self.pending:
+                return True
+
+            try:
+                with timings.phase("flush", runs=self.pending):
+                    _flush_galileo()
+            except Exception:
+                return False
+
+            self.pending = 0
+            self.flush_count += 1
+            self.last_flush = time.time()
+            return True
+
+    def close(self):
+        """
+        Stop the background thread and flush any pending runs
+
+        Returns:
+            True if the final flush succeeded or nothing was pending, False otherwise
+        """
+        self._stopped.set()
+        self._wake.set()
+
+        if self._thread:
+            self._thread.join()
+
+        return self.flush()
+
+def correlate_traces(api_url, headers, project_id, log_stream_id, contents):
+    """
+    Match the most recent traces to the runs of a batch
+
+    Each run is matched to the trace whose output contains its response content. Runs that
+    can't be matched this way are assigned the remaining traces in generation order.
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_id: The log stream ID
+        contents: The response content of each run, in generation order (None for failed runs)
+
+    Returns:
+        A list of trace IDs (or None) aligned with contents
+    """
+    run_count = sum(1 for content in contents if content)
+    trace_ids = [None] * len(contents)
+
+    if run_count == 0:
+        return trace_ids
+
+    console.print(f"[bold cyan]Fetching the {run_count} most recent traces...[/]")
+    with timings.phase("trace_lookup", runs=run_count):
+        traces = galileo_api.get_traces_by_query(api_url, headers, project_id, log_stream_id, {"limit": run_count})
+
+    # Traces come back newest first; reverse them into generation order
+    unmatched = list(reversed(traces))
+
+    for i, content in enumerate(contents):
+        if not content:
+            continue
+        for trace in unmatched:
+            if content in str(trace.get('output', '')):
+                trace_ids[i] = trace.get('id')
+                unmatched.remove(trace)
+                break
+
+    # Fall back to generation order for runs that couldn't be matched by output
+    for i, content in enumerate(contents):
+        if content and trace_ids[i] is None and unmatched:
+            trace_ids[i] = unmatched.pop(0).get('id')
+
+    return trace_ids
+
+def wait_for_target_metrics(api_url, headers, project_id, trace_id, target_metrics, max_wait_time=120, show_progress=True):
+    """
+    Wait for several metrics on one trace, retrying each with a longer timeout if needed
+
+    Args:
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        trace_id: The trace ID
+        target_metrics: The list of metrics to wait for
+        max_wait_time: Maximum time to wait for each metric in seconds (default: 120)
+        show_progress: Whether to show progress bars (default: True)
+
+    Returns:
+        The metrics found for the trace
+    """
+    metrics = {}
+
+    for metric_name in target_metrics:
+        console.print(f"\n[bold cyan]Waiting for '{metric_name}' metric to be available...[/]")
+        metric_result = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time, target_metric=metric_name, show_progress=show_progress)
+
+        # If metric not found, try again with a longer timeout
+        if not galileo_api.has_target_metric(metric_result, metric_name):
+            console.print(f"[bold yellow]⚠ '{metric_name}' metric not found on first attempt. Trying again with longer timeout...[/]")
+            metric_result = galileo_api.wait_for_metrics(api_url, headers, project_id, trace_id, max_wait_time=max_wait_time * 1.5, target_metric=metric_name, show_progress=show_progress)  # 50% longer timeout
+
+        # Merge metrics
+        if isinstance(metric_result, dict):
+            metrics.update(metric_result)
+        elif metric_result:
+            metrics = metric_result
+
+    return metrics
+
+def run_batch_with_metrics(client, runs, api_url, headers, project_id, log_stream_id, max_wait_time=120, target_metrics=None, max_batch_size=None, max_flush_interval=None, usage_tracker=None):
+    """
+    Generate a batch of runs, flush the Galileo logger once, then wait for metrics
+
+    Unlike calling run_with_metrics for each prompt, no upload happens between generations.
+    The logger is flushed once for the whole batch (or in the background when a size or
+    time threshold is given), and the final flush always completes before any metric wait
+    begins. Traces are then correlated back to their runs.
+
+    Args:
+        client: An initialized Galileo OpenAI client
+        runs: A list of (description, run_function) tuples, where run_function takes the
+              client and returns the response content
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_id: The log stream ID
+        max_wait_time: Maximum time to wait for each metric in seconds (default: 120)
+        target_metrics: List of metrics to wait for (default: ["instruction_adherence"])
+        max_batch_size: Flush in the background once this many runs are pending (optional)
+        max_flush_interval: Flush in the background after this many seconds (optional)
+        usage_tracker: A usage.UsageTracker to record token usage in. Once its budget is
+                       reached, the remaining runs are skipped (optional)
+
+    Returns:
+        A list of (response_content, metrics) tuples aligned with runs
+    """
+    if target_metrics is None:
+        target_metrics = ["instruction_adherence"]
+
+    if usage_tracker is None:
+        usage_tracker = usage.UsageTracker()
+
+    # Record the usage of every completion the run functions make
+    tracked_client = usage_tracker.wrap(client)
+
+    flusher = BatchFlusher(max_batch_size=max_batch_size, max_flush_interval=max_flush_interval)
+    contents = []
+
+    try:
+        for description, run_function in runs:
+            console.rule(f"[bold blue]{description}", style="blue")
+
+            if usage_tracker.exceeded():
+                console.print("[bold yellow]⚠ Token or cost budget reached. Skipping this run.[/]")
+                contents.append(None)
+                continue
+
+            # Make API call with Galileo tracking
+            console.print("\n[bold cyan]Making API call to OpenAI[/]")
+
+            try:
+                with flusher.lock, console.status("[bold green]Sending request to OpenAI...", spinner="dots"), timings.phase("llm_call", run=description):
+                    first_record = len(usage_tracker.records)
+                    start_time = time.time()
+                    content = run_function(tracked_client)
+                    elapsed = time.time() - start_time
+                    run_usage = usage_tracker.totals(usage_tracker.records[first_record:])
+
+                console.print(f"[bold green]✓ API call completed in {elapsed:.2f} seconds[/]")
+                console.print(f"[bold cyan]Tokens:[/] {run_usage['prompt_tokens']} prompt + {run_usage['completion_tokens']} completion")
+            except Exception as e:
+                console.print(f"[bold red]✗ Error making API call: {str(e)}[/]")
+                contents.append(None)
+                continue
+
+            # Print the response
+            console.print("\n[bold cyan]Model Response[/]")
+            console.print(Panel(content, border_style="green", expand=False))
+
+            contents.append(content)
+            flusher.record()
+    finally:
+        # Flush the whole batch before any metric wait begins
+        console.print("[bold cyan]Flushing Galileo logger...[/]")
+        if flusher.close():
+            console.print(f"[bold green]✓ Galileo logger flushed successfully ({len(runs)} runs, {flusher.flush_count} flushes)[/]")
+        else:
+            console.print("[bold yellow]⚠ Continuing without flush. Metrics may be delayed.[/]")
+
+    trace_ids = correlate_traces(api_url, headers, project_id, log_stream_id, contents)
+
+    results = []
+    for (description, _), content, trace_id in zip(runs, contents, trace_ids):
+        if not content:
+            results.append((None, None))
+            continue
+
+        console.rule(f"[bold blue]Metrics: {description}", style="blue")
+
+        if not trace_id:
+            console.print("[bold red]✗ Could not find the trace for this run[/]")
+            results.append((content, None))
+            continue
+
+        console.print(f"[bold green]✓ Found trace ID: {trace_id}[/]")
+
+        metrics = wait_for_target_metrics(api_url, headers, project_id, trace_id, target_metrics, max_wait_time=max_wait_time)
+
+        # Display metrics
+        display.display_metrics(metrics)
+
+        results.append((content, metrics))
+
+    return results
+
+def prompt_run_function(prompt, model="gpt-4o"):
+    """
+    Wrap a prompt as a run function for run_batch_with_metrics
+
+    Args:
+        prompt: The prompt to run
+        model: The model to use (default: "gpt-4o")
+
+    Returns:
+        A function that takes the client and returns the response content
+    """
+    def run_function(client):
+        response = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "system", "content": prompt}],
+        )
+        return response.choices[0].message.content.strip()
+
+    return run_function
+
+def run_comparison(client, original_prompt, improved_prompt, api_url, headers, project_id, log_stream_id, model="gpt-4o", max_wait_time=120, target_metric="instruction_adherence", delay_between_runs=5, batch=False, usage_tracker=None):
     """
     Run both original and improved prompts and compare their metrics
 
@@ -126,10 +549,31 @@ def run_comparison(client, original_prompt, improved_prompt, api_url, headers, p
         max_wait_time: Maximum time to wait for metrics in seconds (default: 120)
         target_metric: The specific metric to wait for (default: "instruction_adherence")
         delay_between_runs: Time to wait between runs in seconds (default: 5)
+        batch: Whether to generate both prompts and flush once before waiting for metrics,
+               using run_batch_with_metrics (default: False)
+        usage_tracker: A usage.UsageTracker to record token usage in (optional)
 
     Returns:
-        A tuple of (original_result, improved_result) where each result is a tuple of (content, metrics)
+        A tuple of (original_result, improved_result) where each result is a tuple of
+        (content, metrics)
     """
+    if batch:
+        original_result, improved_result = run_batch_with_metrics(
+            client,
+            [
+                ("Testing Original Prompt", prompt_run_function(original_prompt, model)),
+                ("Testing Improved Prompt", prompt_run_function(improved_prompt, model)),
+            ],
+            api_url,
+            headers,
+            project_id,
+            log_stream_id,
+            max_wait_time=max_wait_time,
+            target_metrics=[target_metric],
+            usage_tracker=usage_tracker
+        )
+        return original_result, improved_result
+
     # Run the original prompt
     original_result = run_with_metrics(
         client,
@@ -141,7 +585,8 @@ def run_comparison(client, original_prompt, improved_prompt, api_url, headers, p
         model=model,
         description="Testing Original Prompt",
         max_wait_time=max_wait_time,
-        target_metric=target_metric
+        target_metric=target_metric,
+        usage_tracker=usage_tracker
     )
 
     # Add a delay between tests
@@ -160,7 +605,169 @@ def run_comparison(client, original_prompt, improved_prompt, api_url, headers, p
         model=model,
         description="Testing Improved Prompt",
         max_wait_time=max_wait_time,
-        target_metric=target_metric
+        target_metric=target_metric,
+        usage_tracker=usage_tracker
     )
 
     return original_result, improved_result
+
+def run_trial(client, prompt, api_url, headers, project_id, log_stream_id, trace_lock, model="gpt-4o", max_wait_time=120, target_metric="instruction_adherence", usage_tracker=None):
+    """
+    Run a single trial of a prompt and extract the target metric value
+
+    Args:
+        client: An initialized Galileo OpenAI client
+        prompt: The prompt to run, or a run function (see run_with_metrics)
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_id: The log stream ID
+        trace_lock: The lock shared by all concurrent trials
+        model: The model to use (default: "gpt-4o")
+        max_wait_time: Maximum time to wait for metrics in seconds (default: 120)
+        target_metric: The specific metric to wait for (default: "instruction_adherence")
+        usage_tracker: A usage.UsageTracker to record token usage in (optional)
+
+    Returns:
+        The metric value or None if the run or the metric wait failed
+    """
+    _, metrics = run_with_metrics(
+        client,
+        prompt,
+        api_url,
+        headers,
+        project_id,
+        log_stream_id,
+        model=model,
+        max_wait_time=max_wait_time,
+        target_metric=target_metric,
+        show_progress=False,
+        trace_lock=trace_lock,
+        usage_tracker=usage_tracker
+    )
+
+    return display.extract_metric_value(metrics, target_metric)
+
+def planned_looks(trials, min_trials, looks):
+    """
+    Plan the trial counts at which an early-stopping comparison is made
+
+    The looks are spread evenly from min_trials to trials, and the last one is always at
+    trials.
+
+    Args:
+        trials: Maximum number of trials per prompt
+        min_trials: Number of trials per prompt at the first look
+        looks: Number of looks, including the final one
+
+    Returns:
+        A sorted list of trial counts
+    """
+    first = min(min_trials, trials)
+    if looks <= 1 or first == trials:
+        return [trials]
+
+    step = (trials - first) / (looks - 1)
+    return sorted({first + round(step * index) for index in range(looks)})
+
+def run_trial_comparison(client, original_prompt, improved_prompt, api_url, headers, project_id, log_stream_id, model="gpt-4o", max_wait_time=120, target_metric="instruction_adherence", trials=20, min_trials=10, looks=2, batch_size=None, max_workers=4, early_stop=True, confidence=0.95, seed=None, usage_tracker=None):
+    """
+    Run repeated trials of both prompts concurrently and compare their metric distributions
+
+    Trials are run in batches of paired original/improved runs. The LLM call, flush and
+    trace lookup of each run are serialized, while the metric waits overlap.
+
+    When early_stop is set, the comparison is only made at a fixed number of looks planned
+    before sampling starts, spread evenly from min_trials to trials (see planned_looks), and
+    sampling ends at the first look where the bootstrap confidence interval for the
+    difference in means excludes zero. Testing after every batch would inflate the false
+    positive rate well beyond 1 - confidence, so each look uses a Bonferroni-adjusted
+    confidence of 1 - (1 - confidence) / looks, which keeps the overall error rate at most
+    1 - confidence. Without early_stop, the comparison is made once after all trials at the
+    given confidence.
+
+    Args:
+        client: An initialized Galileo OpenAI client
+        original_prompt: The original prompt to run, or a run function (see run_with_metrics)
+        improved_prompt: The improved prompt to run, or a run function
+        api_url: The Galileo API URL
+        headers: The API request headers
+        project_id: The project ID
+        log_stream_id: The log stream ID
+        model: The model to use (default: "gpt-4o")
+        max_wait_time: Maximum time to wait for metrics in seconds (default: 120)
+        target_metric: The specific metric to wait for (default: "instruction_adherence")
+        trials: Maximum number of trials per prompt (default: 20)
+        min_trials: Number of trials per prompt at the first look (default: 10)
+        looks: Number of planned looks when early stopping, including the final one (default: 2)
+        batch_size: Number of trials per prompt in each batch (default: max_workers // 2)
+        max_workers: Maximum number of concurrent runs (default: 4)
+        early_stop: Whether to stop at a planned look once the difference is significant
+                    (default: True)
+        confidence: The overall confidence level for the comparison (default: 0.95)
+        seed: An optional random seed for reproducible bootstrap intervals
+        usage_tracker: A usage.UsageTracker to record token usage in. No new batch is
+                       started once its budget is reached (optional)
+
+    Returns:
+        A tuple of (original_values, improved_values, comparison) where the values are NumPy
+        arrays of the collected metric values and comparison is from stats.compare_trials
+    """
+    if batch_size is None:
+        batch_size = max(1, max_workers // 2)
+
+    if early_stop:
+        look_points = planned_looks(trials, min_trials, looks)
+        look_confidence = 1 - (1 - confidence) / len(look_points)
+    else:
+        look_points = [trials]
+        look_confidence = confidence
+
+    trace_lock = threading.Lock()
+    original_values = []
+    improved_values = []
+    trials_run = 0
+    compared_at = 0
+    comparison = None
+
+    console.rule(f"[bold blue]Running up to {trials} trials per prompt", style="blue")
+    if len(look_points) > 1:
+        console.print(f"[bold cyan]Comparing after {', '.join(str(point) for point in look_points)} trials at {look_confidence:.1%} confidence each[/]")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while trials_run < trials:
+            if usage_tracker and usage_tracker.exceeded():
+                console.print(f"[bold yellow]⚠ Token or cost budget reached after {trials_run} trials. Stopping.[/]")
+                break
+
+            # Never run past the next look, so every look sees exactly its planned count
+            next_look = next(point for point in look_points if point > trials_run)
+            batch = min(batch_size, next_look - trials_run)
+            console.print(f"[bold cyan]Running trials {trials_run + 1}-{trials_run + batch} of {trials}...[/]")
+
+            original_futures = []
+            improved_futures = []
+            for _ in range(batch):
+                original_futures.append(executor.submit(run_trial, client, original_prompt, api_url, headers, project_id, log_stream_id, trace_lock, model, max_wait_time, target_metric, usage_tracker))
+                improved_futures.append(executor.submit(run_trial, client, improved_prompt, api_url, headers, project_id, log_stream_id, trace_lock, model, max_wait_time, target_metric, usage_tracker))
+
+            original_values.extend(future.result() for future in original_futures)
+            improved_values.extend(future.result() for future in improved_futures)
+            trials_run += batch
+
+            if trials_run not in look_points:
+                continue
+
+            comparison = stats.compare_trials(original_values, improved_values, confidence=look_confidence, seed=seed)
+            compared_at = trials_run
+
+            if early_stop and trials_run < trials and comparison["significant"]:
+                console.print(f"[bold green]✓ Difference is significant after {trials_run} trials. Stopping early.[/]")
+                break
+
+    # A budget stop can end sampling between looks. The final comparison still covers every
+    # trial collected, but it is not used to stop early
+    if trials_run > compared_at:
+        comparison = stats.compare_trials(original_values, improved_values, confidence=look_confidence, seed=seed)
+
+    return stats.to_array(original_values), stats.to_array(improved_values), comparison
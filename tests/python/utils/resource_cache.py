@@ -0,0 +1,467 @@
+"""
+Resource Cache Utilities
+
+This module resolves the prompt templates and datasets an experiment script needs,
+getting each one if it exists and creating it only if it doesn't. It replaces the usual
+pattern of a lookup by name with a create in a bare `except:`. That pattern costs a name
+query every time, and it turns any failure (a timeout, an auth error, a changed SDK
+signature) into a silent create.
+
+A local index maps each resource, keyed by kind, name and a hash of its content, to the
+remote ID and version last seen, per Galileo environment. Resolving a known resource is
+one get by ID, which also validates it: if the remote version moved on, a warning is
+shown. Within a process, each resource is fetched once, however often it is resolved.
+
+A resource missing from the index is looked up by name. If one is found, its content is
+checked against the local content:
+- a prompt template's messages are compared with the local messages;
+- for a dataset, its row count and columns are compared, which avoids fetching its rows.
+
+If the content differs, the resource is resolved under a name suffixed with the content
+hash, so an experiment never silently runs against stale content. A resource is created
+only when the lookup confirms that it doesn't exist; errors are raised, never treated as
+a not-found.
+
+    from tests.python.utils import resource_cache
+    resolver = resource_cache.get_resolver()
+    prompt = resolver.prompt("storyteller-prompt", messages, project="my-project")
+    dataset = resolver.dataset("storyteller-dataset", rows)
+
+The resolver's own behavior (index hits, deleted resources, content changes) can be
+checked offline against an in-memory stand-in for the API:
+
+    python -m tests.python.utils.resource_cache check
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from .terminal import console
+
+# Environment variable overriding the index file
+CACHE_FILE_ENV = "HARNESS_RESOURCE_CACHE"
+
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_CACHE_FILE = os.path.join(TESTS_ROOT, ".results", "resource_cache.json")
+
+# Hex digits of the content hash appended to the name of a changed resource
+SUFFIX_LENGTH = 8
+
+def prompt_content(messages):
+    """
+    Canonicalize prompt template messages
+
+    Args:
+        messages: A list of message dictionaries or SDK Message objects, or their JSON
+
+    Returns:
+        A list of {"role", "content"} dictionaries
+    """
+    if isinstance(messages, str):
+        try:
+            messages = json.loads(messages)
+        except ValueError:
+            return [{"role": "user", "content": messages}]
+
+    canonical = []
+    for message in messages or []:
+        if not isinstance(message, dict):
+            message = {"role": getattr(message, "role", None), "content": getattr(message, "content", None)}
+        role = message.get("role")
+        canonical.append({"role": str(getattr(role, "value", role)), "content": message.get("content")})
+
+    return canonical
+
+def content_hash(content):
+    """
+    Hash a resource's content
+
+    Args:
+        content: JSON-serializable content
+
+    Returns:
+        The SHA-256 hex digest of its canonical JSON
+    """
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _dataset_shape(rows):
+    """Get the row count and sorted column names of local dataset content"""
+    columns = set()
+    for row in rows:
+        columns.update(row)
+    # The SDK stores ground_truth as output
+    return len(rows), sorted("output" if column == "ground_truth" else column for column in columns)
+
+def _get_or_none(get, identifier):
+    """Get a resource, or None if the API confirms it doesn't exist"""
+    from galileo.exceptions import NotFoundError
+
+    # The SDK returns None for some misses and raises NotFoundError on a 404
+    try:
+        return get(identifier)
+    except NotFoundError:
+        return None
+
+class _Prompts:
+    """Prompt template operations of the Galileo SDK"""
+
+    kind = "prompt"
+
+    @staticmethod
+    def get_by_id(resource_id):
+        from galileo.prompts import get_prompt
+        return get_prompt(id=resource_id)
+
+    @staticmethod
+    def get_by_name(name):
+        from galileo.prompts import get_prompt
+        return get_prompt(name=name)
+
+    @staticmethod
+    def create(name, content, project):
+        from galileo.prompts import create_prompt
+        from galileo.schema.message import Message
+
+        # The SDK only serializes Message objects
+        messages = [Message(**message) if isinstance(message, dict) else message for message in content]
+        return create_prompt(name, messages, project_name=project)
+
+    @staticmethod
+    def version(resource):
+        return str(getattr(resource, "max_version", None) or getattr(resource, "updated_at", ""))
+
+    @staticmethod
+    def matches(resource, content):
+        selected = getattr(resource, "selected_version", None)
+        template = getattr(selected, "template", None) or getattr(resource, "template", None)
+        return prompt_content(template) == prompt_content(content)
+
+class _Datasets:
+    """Dataset operations of the Galileo SDK"""
+
+    kind = "dataset"
+
+    @staticmethod
+    def get_by_id(resource_id):
+        from galileo.datasets import get_dataset
+        return get_dataset(id=resource_id)
+
+    @staticmethod
+    def get_by_name(name):
+        from galileo.datasets import get_dataset
+        return get_dataset(name=name)
+
+    @staticmethod
+    def create(name, content, project):
+        from galileo.datasets import create_dataset
+        return create_dataset(name, content, project_name=project) if project else create_dataset(name, content)
+
+    @staticmethod
+    def version(resource):
+        dataset = getattr(resource, "dataset", resource)
+        return str(getattr(dataset, "current_version_index", ""))
+
+    @staticmethod
+    def matches(resource, content):
+        dataset = getattr(resource, "dataset", resource)
+        num_rows, columns = _dataset_shape(content)
+        remote_columns = sorted(getattr(dataset, "column_names", None) or [])
+        return getattr(dataset, "num_rows", None) == num_rows and remote_columns == columns
+
+class ResourceResolver:
+    """Resolves prompt templates and datasets through a local index of their remote IDs"""
+
+    def __init__(self, path=None, environment_url=None):
+        """
+        Initialize the resolver
+
+        Args:
+            path: The index file (default: HARNESS_RESOURCE_CACHE or
+                  tests/python/.results/resource_cache.json)
+            environment_url: The Galileo environment the IDs belong to (default:
+                             GALILEO_CONSOLE_URL)
+        """
+        self.path = path or os.environ.get(CACHE_FILE_ENV) or DEFAULT_CACHE_FILE
+        self.environment_url = environment_url if environment_url is not None else os.environ.get("GALILEO_CONSOLE_URL", "")
+        self.lock = threading.Lock()
+        self.resolved = {}
+        self.stats = {"hits": 0, "lookups": 0, "creates": 0}
+
+    def _key(self, kind, name, digest):
+        """Build the index key of a resource"""
+        return f"{self.environment_url}|{kind}|{name}|{digest}"
+
+    def _load(self):
+        """Read the index"""
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _update(self, key, entry):
+        """Store or remove one index entry, keeping entries written by other processes"""
+        with self.lock:
+            index = self._load()
+            if entry is None:
+                index.pop(key, None)
+            else:
+                index[key] = entry
+
+            # Write atomically so a concurrent reader never sees a partial index
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def _record(self, key, operations, name, digest, resource):
+        """Index a resolved resource"""
+        self._update(key, {
+            "kind": operations.kind,
+            "name": name,
+            "remote_name": getattr(resource, "name", None),
+            "id": str(resource.id),
+            "content_hash": digest,
+            "version": operations.version(resource),
+            "validated_at": time.time(),
+        })
+
+    def _resolve(self, operations, name, content, project, digest):
+        """Get a resource from the index, by name, or by creating it"""
+        key = self._key(operations.kind, name, digest)
+        if key in self.resolved:
+            return self.resolved[key]
+
+        entry = self._load().get(key)
+        if entry is not None:
+            # One get by ID both fetches the resource and validates the index entry
+            resource = _get_or_none(operations.get_by_id, entry["id"])
+            if resource is not None:
+                self.stats["hits"] += 1
+                version = operations.version(resource)
+                if version != entry.get("version"):
+                    console.print(f"[bold yellow]⚠ {operations.kind.capitalize()} {name} changed remotely (version {entry.get('version')} → {version})[/]")
+                    self._record(key, operations, name, digest, resource)
+                self.resolved[key] = resource
+                return resource
+            # The resource was deleted; the index entry is stale
+            self._update(key, None)
+
+        self.stats["lookups"] += 1
+        resource = _get_or_none(operations.get_by_name, name)
+
+        if resource is not None and not operations.matches(resource, content):
+            suffixed_name = f"{name}-{digest[:SUFFIX_LENGTH]}"
+            if name.endswith(digest[:SUFFIX_LENGTH]):
+                raise ValueError(f"{operations.kind.capitalize()} {name} exists with different content")
+            console.print(f"[bold yellow]⚠ {operations.kind.capitalize()} {name} exists with different content, using {suffixed_name}[/]")
+            resource = self._resolve(operations, suffixed_name, content, project, digest)
+        elif resource is None:
+            resource = self._create(operations, name, content, project)
+
+        self._record(key, operations, name, digest, resource)
+        self.resolved[key] = resource
+        return resource
+
+    def _create(self, operations, name, content, project):
+        """Create a resource, or get it if a concurrent run created it first"""
+        from galileo.exceptions import ConflictError
+
+        try:
+            resource = operations.create(name, content, project)
+        except ConflictError:
+            resource = _get_or_none(operations.get_by_name, name)
+            if resource is None or not operations.matches(resource, content):
+                raise
+            return resource
+
+        self.stats["creates"] += 1
+        console.print(f"[bold green]✓ Created {operations.kind} {getattr(resource, 'name', name)}[/]")
+        return resource
+
+    def prompt(self, name, messages, project=None):
+        """
+        Resolve a prompt template
+
+        Args:
+            name: The template name
+            messages: The template messages, as dictionaries with role and content
+            project: The project to associate a created template with (default:
+                     GALILEO_PROJECT)
+
+        Returns:
+            The SDK PromptTemplate
+        """
+        project = project or os.environ.get("GALILEO_PROJECT")
+        return self._resolve(_Prompts, name, messages, project, content_hash(prompt_content(messages)))
+
+    def dataset(self, name, rows, project=None):
+        """
+        Resolve a dataset
+
+        Args:
+            name: The dataset name
+            rows: The dataset content, as a list of row dictionaries
+            project: The project to associate a created dataset with (default: none)
+
+        Returns:
+            The SDK Dataset
+        """
+        return self._resolve(_Datasets, name, rows, project, content_hash(rows))
+
+    def clear(self):
+        """Remove the index"""
+        with self.lock:
+            self.resolved.clear()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+# The process-wide resolver, created on first use
+_resolver = None
+_resolver_lock = threading.Lock()
+
+def get_resolver():
+    """
+    Get the process-wide resolver
+
+    Returns:
+        The ResourceResolver
+    """
+    global _resolver
+
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = ResourceResolver()
+        return _resolver
+
+class _MemoryResource:
+    """A remote resource held by _MemoryOperations"""
+
+    def __init__(self, resource_id, name, content):
+        self.id = resource_id
+        self.name = name
+        self.template = content
+        self.max_version = 1
+
+class _MemoryOperations:
+    """Prompt-like operations on an in-memory store, raising like the SDK does"""
+
+    kind = "prompt"
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+        self.created = 0
+
+    def get_by_id(self, resource_id):
+        from galileo.exceptions import NotFoundError
+
+        self.calls.append("get_by_id")
+        if resource_id not in self.store:
+            raise NotFoundError(404, b"{}")
+        return self.store[resource_id]
+
+    def get_by_name(self, name):
+        self.calls.append("get_by_name")
+        return next((resource for resource in self.store.values() if resource.name == name), None)
+
+    def create(self, name, content, project):
+        self.calls.append("create")
+        self.created += 1
+        resource = _MemoryResource(f"id-{self.created}", name, content)
+        self.store[resource.id] = resource
+        return resource
+
+    def version(self, resource):
+        return str(resource.max_version)
+
+    def matches(self, resource, content):
+        return prompt_content(resource.template) == prompt_content(content)
+
+def check():
+    """
+    Check the resolver against an in-memory API
+
+    Returns:
+        A list of (description, passed) tuples
+    """
+    messages = [{"role": "user", "content": "Question: {{question}}"}]
+    operations = _MemoryOperations()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.json")
+
+        def resolve(content=messages):
+            operations.calls.clear()
+            # A new resolver per call, as in a new run, so only the index file is shared
+            resolver = ResourceResolver(path, environment_url="memory")
+            return resolver._resolve(operations, "prompt", content, None, content_hash(prompt_content(content)))
+
+        created = resolve()
+        results.append(("A missing resource is created", operations.calls == ["get_by_name", "create"]))
+
+        resource = resolve()
+        results.append(("An indexed resource costs one get by ID", operations.calls == ["get_by_id"] and resource is created))
+
+        del operations.store[created.id]
+        recreated = resolve()
+        results.append(("A deleted resource is recreated", operations.calls == ["get_by_id", "get_by_name", "create"] and recreated.id != created.id))
+
+        index = ResourceResolver(path, environment_url="memory")._load()
+        results.append(("The stale index entry is replaced", [entry["id"] for entry in index.values()] == [recreated.id]))
+
+        changed = [{"role": "user", "content": "Answer: {{question}}"}]
+        suffixed = resolve(changed)
+        results.append(("Changed content uses a suffixed name", suffixed.name == f"prompt-{content_hash(prompt_content(changed))[:SUFFIX_LENGTH]}"))
+
+        def failing_get(resource_id):
+            raise TimeoutError("timed out")
+
+        operations.get_by_id = failing_get
+        try:
+            resolve()
+            raised = False
+        except TimeoutError:
+            raised = True
+        results.append(("Other errors are raised, not treated as a not-found", raised))
+
+    return results
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if the command succeeded, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Check or clear the prompt template and dataset index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("check", help="Check the resolver against an in-memory API")
+    subparsers.add_parser("clear", help="Remove the index")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        resolver = ResourceResolver()
+        resolver.clear()
+        console.print(f"[bold green]✓ Removed {resolver.path}[/]")
+        return True
+
+    results = check()
+    for description, passed in results:
+        console.print(f"[bold green]✓ {description}[/]" if passed else f"[bold red]✗ {description}[/]")
+
+    return all(passed for _, passed in results)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
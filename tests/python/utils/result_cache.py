@@ -0,0 +1,179 @@
+"""
+Result Cache Utilities
+
+This module provides a content-addressed cache of harness test results. A result is keyed by
+everything that can change it: the test's own sources, the utility modules it imports, the
+installed galileo and openai versions, and the target Galileo environment. Rerunning the
+suite with an unchanged key inside the freshness window reuses the result instead of
+repeating the LLM calls and metric waits.
+
+Only passing results are cached, so failures are always retried.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from importlib import metadata
+
+from . import impact
+
+# Default freshness window in seconds
+CACHE_TTL = 24 * 60 * 60
+
+# Packages whose installed versions are part of the key
+KEY_PACKAGES = ("galileo", "openai")
+
+# Test directory files that are part of the key, besides the Python sources
+KEY_EXTRA_FILES = ("requirements.txt",)
+
+def package_version(name):
+    """
+    Get the installed version of a package
+
+    Args:
+        name: The distribution name
+
+    Returns:
+        The version string, or "not-installed"
+    """
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "not-installed"
+
+def hash_files(paths, base):
+    """
+    Hash a set of files by their paths relative to base and their contents
+
+    Args:
+        paths: The file paths
+        base: The directory the paths are made relative to
+
+    Returns:
+        A SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, base).replace(os.sep, "/").encode())
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+def key_components(test_id, root=impact.TESTS_ROOT, environment_url=None):
+    """
+    Get the inputs of a test's cache key
+
+    Args:
+        test_id: The test ID
+        root: The tests root (default: tests/python)
+        environment_url: The target Galileo URL (default: GALILEO_CONSOLE_URL)
+
+    Returns:
+        A dictionary with test, sources, utils, packages and environment_url
+    """
+    test_dir = os.path.join(root, test_id)
+    sources = [
+        os.path.join(test_dir, filename) for filename in os.listdir(test_dir)
+        if filename.endswith(".py") or filename in KEY_EXTRA_FILES
+    ]
+    utils = [os.path.join(impact.UTILS_DIR, f"{module}.py") for module in impact.utils_dependencies(test_id, root)]
+
+    return {
+        "test": test_id,
+        "sources": hash_files(sources, test_dir),
+        "utils": hash_files(utils, impact.UTILS_DIR),
+        "packages": {name: package_version(name) for name in KEY_PACKAGES},
+        "environment_url": environment_url if environment_url is not None else os.environ.get("GALILEO_CONSOLE_URL", ""),
+    }
+
+def cache_key(components):
+    """
+    Build a cache key from its components
+
+    Args:
+        components: The result of key_components
+
+    Returns:
+        A SHA-256 hex digest
+    """
+    return hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """A directory of cached test results and logs, one pair of files per key"""
+
+    def __init__(self, directory, ttl=CACHE_TTL):
+        """
+        Initialize the cache
+
+        Args:
+            directory: The cache directory
+            ttl: Freshness window in seconds (default: CACHE_TTL)
+        """
+        self.directory = directory
+        self.ttl = ttl
+
+    def _paths(self, key):
+        """Get the entry and log file paths of a key"""
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.log")
+
+    def get(self, key):
+        """
+        Look up a fresh entry
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The entry dictionary (result, components, cached_at, log), or None on a miss
+            or a stale entry
+        """
+        entry_path, log_path = self._paths(key)
+
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("cached_at", 0) > self.ttl:
+            return None
+
+        entry["log"] = log_path if os.path.exists(log_path) else None
+        return entry
+
+    def put(self, key, result, components):
+        """
+        Store a passing result and a copy of its log
+
+        Args:
+            key: The cache key
+            result: The result dictionary from suite_runner.run_test
+            components: The key components, stored for inspection
+
+        Returns:
+            True if the result was cached, False if it wasn't a pass
+        """
+        if result.get("status") != "passed":
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        entry_path, log_path = self._paths(key)
+
+        if result.get("log") and os.path.exists(result["log"]):
+            shutil.copyfile(result["log"], log_path)
+
+        entry = {"result": result, "components": components, "cached_at": time.time()}
+
+        # Write atomically so a concurrent reader never sees a partial entry
+        tmp_path = f"{entry_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, entry_path)
+
+        return True
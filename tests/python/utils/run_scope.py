@@ -0,0 +1,208 @@
+"""
+Run Scope Utilities
+
+This module namespaces the resources a harness run creates, so that many runs (branches,
+shards, developers) can share one Galileo project at the same time. Every run has an ID,
+taken from the HARNESS_RUN_ID environment variable or generated once and exported so that
+test subprocesses and sample apps inherit it. Resource names are prefixed with the run ID
+and looked up by that exact name, and each test logs its traces to its own ephemeral log
+stream. Log streams, datasets and experiments registered as ephemeral are deleted when the
+test exits, so runs don't leave resources behind in the shared project. Set
+HARNESS_KEEP_RESOURCES=1 to keep them, e.g. to inspect a run's traces.
+
+The sample apps apply the same prefix themselves (they only read HARNESS_RUN_ID), so
+they still run unchanged outside the harness.
+"""
+
+import atexit
+import os
+import re
+import secrets
+import threading
+from datetime import datetime, timezone
+
+from . import galileo_api
+from .terminal import console
+
+# Environment variable holding the run ID
+RUN_ID_ENV = "HARNESS_RUN_ID"
+
+# Set to 1 to keep ephemeral log streams, datasets and experiments after the run, e.g.
+# to inspect its traces
+KEEP_RESOURCES_ENV = "HARNESS_KEEP_RESOURCES"
+
+# The former name of KEEP_RESOURCES_ENV, from when only log streams were ephemeral; still honored
+KEEP_LOG_STREAMS_ENV = "HARNESS_KEEP_LOG_STREAMS"
+
+_lock = threading.Lock()
+_ephemeral_resources = []
+
+def new_run_id():
+    """
+    Generate a run ID
+
+    Returns:
+        A short ID such as "run-1019153012-3fa2c1", sortable by start time
+    """
+    return f"run-{datetime.now(timezone.utc):%m%d%H%M%S}-{secrets.token_hex(3)}"
+
+def get_run_id():
+    """
+    Get the run ID, generating and exporting one if HARNESS_RUN_ID isn't set
+
+    Returns:
+        The run ID
+    """
+    with _lock:
+        if not os.environ.get(RUN_ID_ENV):
+            os.environ[RUN_ID_ENV] = new_run_id()
+        return os.environ[RUN_ID_ENV]
+
+def scoped_name(name, run_id=None):
+    """
+    Prefix a resource name with the run ID
+
+    Sample apps build the same name as f"{run_id}-{name}", so keep the two in sync.
+
+    Args:
+        name: The unscoped name, e.g. "test_dataset"
+        run_id: The run ID (default: get_run_id())
+
+    Returns:
+        The run-scoped name, e.g. "run-1019153012-3fa2c1-test_dataset"
+    """
+    return f"{run_id or get_run_id()}-{name}"
+
+def log_stream_name(test_name, run_id=None):
+    """
+    Get the name of a test's ephemeral log stream
+
+    Args:
+        test_name: The test name, e.g. "sdk/openai-wrapper"
+        run_id: The run ID (default: get_run_id())
+
+    Returns:
+        The run-scoped log stream name, e.g. "run-1019153012-3fa2c1-sdk-openai-wrapper"
+    """
+    return scoped_name(re.sub(r"[^A-Za-z0-9_-]+", "-", test_name).strip("-"), run_id)
+
+def ephemeral_log_stream(harness_session, test_name, project_id=None, project_name=None):
+    """
+    Create a log stream for this test and point the apps at it
+
+    GALILEO_LOG_STREAM is set to the new stream, so sample apps (in any app_runner mode)
+    log there and every trace in it belongs to this test. The stream is deleted at exit
+    unless HARNESS_KEEP_RESOURCES=1.
+
+    Args:
+        harness_session: The shared Session
+        test_name: The test name, used in the log stream name
+        project_id: The project ID (default: resolved from the session)
+        project_name: The project name, if project_id isn't the session's project
+
+    Returns:
+        A tuple of (log_stream_name, log_stream_id); the ID is None if creation failed
+    """
+    if project_id is None:
+        project_id, _ = harness_session.resolve()
+    if not project_id:
+        return None, None
+
+    name = log_stream_name(test_name)
+    log_stream_id = galileo_api.create_log_stream(harness_session.api_url, harness_session.headers, project_id, name)
+
+    if not log_stream_id:
+        return name, None
+
+    os.environ["GALILEO_LOG_STREAM"] = name
+    harness_session.ids[f"{project_name or harness_session.project_name}/{name}"] = [project_id, log_stream_id]
+
+    api_url, headers = harness_session.api_url, harness_session.headers
+    _register(f"log stream {name}", lambda: galileo_api.delete_log_stream(api_url, headers, project_id, log_stream_id))
+
+    return name, log_stream_id
+
+def ephemeral_dataset(harness_session, name):
+    """
+    Delete a run-scoped dataset at exit
+
+    The dataset is looked up by name at exit, so it can be registered before a sample app
+    creates it. Datasets aren't project-scoped, so the lookup covers every project. It is
+    kept if HARNESS_KEEP_RESOURCES=1.
+
+    Args:
+        harness_session: The shared Session
+        name: The unscoped dataset name, e.g. "test_dataset"
+
+    Returns:
+        The run-scoped dataset name
+    """
+    scoped = scoped_name(name)
+    api_url, headers = harness_session.api_url, harness_session.headers
+
+    def delete():
+        dataset = galileo_api.find_dataset_by_name(api_url, headers, scoped)
+        return dataset is not None and galileo_api.delete_dataset(api_url, headers, dataset.get('id'))
+
+    _register(f"dataset {scoped}", delete)
+    return scoped
+
+def ephemeral_experiment(harness_session, name, project_id=None):
+    """
+    Delete a run-scoped experiment at exit
+
+    The experiment is looked up by name at exit, so it can be registered before a sample
+    app creates it. It is kept if HARNESS_KEEP_RESOURCES=1.
+
+    Args:
+        harness_session: The shared Session
+        name: The unscoped experiment name, e.g. "my-experiment"
+        project_id: The project ID (default: resolved from the session)
+
+    Returns:
+        The run-scoped experiment name
+    """
+    scoped = scoped_name(name)
+    if project_id is None:
+        project_id, _ = harness_session.resolve()
+    api_url, headers = harness_session.api_url, harness_session.headers
+
+    def delete():
+        experiment = galileo_api.find_experiment(api_url, headers, project_id, scoped)
+        return experiment is not None and galileo_api.delete_experiment(api_url, headers, project_id, experiment.get('id'))
+
+    _register(f"experiment {scoped}", delete)
+    return scoped
+
+def keep_resources():
+    """
+    Check whether ephemeral resources should be kept after the run
+
+    Returns:
+        True if HARNESS_KEEP_RESOURCES (or the older HARNESS_KEEP_LOG_STREAMS) is 1
+    """
+    return os.environ.get(KEEP_RESOURCES_ENV) == "1" or os.environ.get(KEEP_LOG_STREAMS_ENV) == "1"
+
+def _register(description, delete):
+    """Register a resource for deletion at exit, unless ephemeral resources are kept"""
+    if keep_resources():
+        return
+
+    with _lock:
+        _ephemeral_resources.append((description, delete))
+
+def delete_ephemeral_resources():
+    """Delete the resources registered as ephemeral in this process"""
+    with _lock:
+        pending = list(_ephemeral_resources)
+        _ephemeral_resources.clear()
+
+    for description, delete in pending:
+        # Cleanup is best-effort, so a failure never fails the test that already ran
+        try:
+            if delete():
+                console.print(f"[bold green]✓ Deleted ephemeral {description}[/]")
+        except Exception as e:
+            console.print(f"[bold yellow]⚠ Could not delete ephemeral {description}: {str(e)}[/]")
+
+atexit.register(delete_ephemeral_resources)
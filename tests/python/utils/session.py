@@ -0,0 +1,236 @@
+"""
+Session Utilities
+
+This module provides a harness session that carries everything the tests resolve before
+doing real work: the API configuration, the authentication token, the request headers and
+the project and log stream IDs. A session is created once per suite run and reused by every
+test, either in the same process or, for test subprocesses, through a JSON handoff file
+named by the HARNESS_SESSION_FILE environment variable.
+"""
+
+import json
+import os
+import time
+
+from . import config
+from . import galileo_api
+from . import timings
+from .terminal import console
+
+# Environment variable naming the session handoff file
+SESSION_FILE_ENV = "HARNESS_SESSION_FILE"
+
+# Sessions older than this are re-created, so a long suite run never uses an expired token
+SESSION_MAX_AGE = 45 * 60
+
+_session = None
+
+class Session:
+    """
+    The resolved authentication and IDs shared by the tests of a suite run
+
+    Project and log stream IDs are resolved lazily and cached per (project, log stream)
+    pair, so tests that use a different project share the token and headers too.
+    """
+
+    def __init__(self, api_url, api_key, project_name, log_stream_name, auth_token=None, headers=None, ids=None, created_at=None):
+        """
+        Initialize the session
+
+        Args:
+            api_url: The Galileo API URL
+            api_key: The Galileo API key
+            project_name: The default project name
+            log_stream_name: The default log stream name
+            auth_token: The authentication token (optional)
+            headers: The API request headers (default: built from the token or API key)
+            ids: Resolved IDs, mapping "project/log_stream" to [project_id, log_stream_id] (optional)
+            created_at: Creation time as a Unix timestamp (default: now)
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.project_name = project_name
+        self.log_stream_name = log_stream_name
+        self.auth_token = auth_token
+        self.headers = headers or config.setup_headers(auth_token, api_key)
+        self.ids = dict(ids or {})
+        self.created_at = created_at or time.time()
+
+    @property
+    def age(self):
+        """Seconds since the session was created"""
+        return time.time() - self.created_at
+
+    def is_fresh(self, max_age=SESSION_MAX_AGE):
+        """
+        Check whether the session is recent enough to reuse
+
+        Args:
+            max_age: Maximum age in seconds (default: SESSION_MAX_AGE)
+
+        Returns:
+            True if the session can be reused, False otherwise
+        """
+        return self.age < max_age
+
+    def resolve(self, project_name=None, log_stream_name=None):
+        """
+        Get the project and log stream IDs, resolving them on first use
+
+        Args:
+            project_name: The project name (default: the session's project)
+            log_stream_name: The log stream name (default: the session's log stream)
+
+        Returns:
+            A tuple of (project_id, log_stream_id); either can be None if not found
+        """
+        project_name = project_name or self.project_name
+        log_stream_name = log_stream_name or self.log_stream_name
+        key = f"{project_name}/{log_stream_name}"
+
+        if key in self.ids:
+            project_id, log_stream_id = self.ids[key]
+            console.print(f"[bold green]✓ Using session IDs for {key} (project: {project_id}, log stream: {log_stream_id})[/]")
+            return project_id, log_stream_id
+
+        with timings.phase("id_resolution"):
+            project_id, log_stream_id = galileo_api.get_project_and_log_stream_ids(self.api_url, self.headers, project_name, log_stream_name)
+
+        # Only cache complete lookups, so a missing project or log stream is retried
+        if project_id and log_stream_id:
+            self.ids[key] = [project_id, log_stream_id]
+
+        return project_id, log_stream_id
+
+    def to_dict(self):
+        """
+        Serialize the session
+
+        Returns:
+            A JSON-serializable dictionary
+        """
+        return {
+            "api_url": self.api_url,
+            "api_key": self.api_key,
+            "project_name": self.project_name,
+            "log_stream_name": self.log_stream_name,
+            "auth_token": self.auth_token,
+            "headers": self.headers,
+            "ids": self.ids,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Deserialize a session
+
+        Args:
+            data: A dictionary from to_dict
+
+        Returns:
+            A Session
+        """
+        return cls(**data)
+
+    def save(self, path):
+        """
+        Write the session to a handoff file, readable only by the current user
+
+        Args:
+            path: The file path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # The file holds a token and the API key, so create it with owner-only permissions
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a session from a handoff file
+
+        Args:
+            path: The file path
+
+        Returns:
+            A Session, or None if the file is missing or invalid
+        """
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+def create_session(required_vars=None, resolve_ids=True):
+    """
+    Create a session: check the environment, authenticate and resolve the default IDs
+
+    Args:
+        required_vars: Required environment variable names (default: the standard Galileo variables)
+        resolve_ids: Whether to resolve the default project and log stream IDs (default: True)
+
+    Returns:
+        A Session, or None if required environment variables are missing
+    """
+    with timings.phase("env_check"):
+        if not config.check_environment_variables(required_vars):
+            return None
+
+    api_url, api_key, project_name, log_stream_name = config.setup_api_config()
+
+    with timings.phase("auth"):
+        auth_token = galileo_api.get_auth_token(api_url, api_key)
+
+    new_session = Session(api_url, api_key, project_name, log_stream_name, auth_token=auth_token)
+
+    if resolve_ids and project_name and log_stream_name:
+        new_session.resolve()
+
+    return new_session
+
+def _matches_environment(candidate):
+    """Check that a session was created for the current API URL and key"""
+    return candidate.api_url == os.environ.get("GALILEO_CONSOLE_URL") and candidate.api_key == os.environ.get("GALILEO_API_KEY")
+
+def get_session(required_vars=None):
+    """
+    Get the shared session, creating it only if no reusable one exists
+
+    The session is looked up in this order: the one already created in this process, the
+    handoff file named by HARNESS_SESSION_FILE, and finally a new one. A session is only
+    reused while it's fresh and was created for the current GALILEO_CONSOLE_URL and
+    GALILEO_API_KEY.
+
+    Args:
+        required_vars: Required environment variable names (default: the standard Galileo variables)
+
+    Returns:
+        A Session, or None if required environment variables are missing
+    """
+    global _session
+
+    # Checking the environment is cheap, and keeps the missing-variable help in every test
+    with timings.phase("env_check"):
+        if not config.check_environment_variables(required_vars):
+            return None
+
+    if _session is not None and _session.is_fresh() and _matches_environment(_session):
+        console.print(f"[bold green]✓ Reusing session from this process ({_session.age:.0f}s old)[/]")
+        return _session
+
+    session_file = os.environ.get(SESSION_FILE_ENV)
+    if session_file:
+        shared = Session.load(session_file)
+
+        if shared is not None and shared.is_fresh() and _matches_environment(shared):
+            console.print(f"[bold green]✓ Using shared suite session ({shared.age:.0f}s old)[/]")
+            _session = shared
+            return _session
+
+        console.print("[bold yellow]⚠ Shared session is missing, stale or for another environment. Creating a new one.[/]")
+
+    _session = create_session(required_vars)
+    return _session
@@ -0,0 +1,182 @@
+"""
+Sharding Utilities
+
+This module splits the harness suite across CI nodes. Tests are assigned to shards by
+bin-packing on their historical durations, read from the suite runner's results store, so
+that every shard finishes at about the same time. Each shard writes a partial report, and
+merge_reports() combines them into one.
+
+Every node must compute the same assignment, so all shards of a run need the same
+durations file (e.g. restored from the CI cache before the run).
+"""
+
+import json
+import os
+import statistics
+
+# Number of recent durations kept per test
+HISTORY_SIZE = 5
+
+# Duration assumed for tests without history, when no other test has any either
+DEFAULT_DURATION = 120.0
+
+def parse_shard(spec):
+    """
+    Parse a shard specification
+
+    Args:
+        spec: A string such as "2/4" (the second of four shards)
+
+    Returns:
+        A tuple of (index, count) with a 1-based index
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}'. Use INDEX/COUNT, e.g. 1/4")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}'. INDEX must be between 1 and COUNT")
+
+    return index, count
+
+def load_durations(path):
+    """
+    Load the durations store
+
+    Args:
+        path: The durations file
+
+    Returns:
+        A dictionary mapping test IDs to their recent durations in seconds (empty if missing)
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def update_durations(path, results):
+    """
+    Add the durations of a run to the store
+
+    Cached results are skipped, as they didn't run.
+
+    Args:
+        path: The durations file
+        results: Result dictionaries from the suite runner
+    """
+    history = load_durations(path)
+
+    for result in results:
+        if result.get("cached") or result.get("status") == "error":
+            continue
+        durations = history.setdefault(result["test"], [])
+        durations.append(round(result["duration"], 3))
+        del durations[:-HISTORY_SIZE]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # Write atomically, as shards of the same run may finish at the same time
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def estimate_durations(test_ids, history):
+    """
+    Estimate each test's duration from its history
+
+    Args:
+        test_ids: The test IDs
+        history: The durations store
+
+    Returns:
+        A dictionary mapping test IDs to estimated durations. Tests with history get the
+        median of their recent durations; others get the median of all known estimates.
+    """
+    known = {test_id: statistics.median(history[test_id]) for test_id in test_ids if history.get(test_id)}
+    fallback = statistics.median(known.values()) if known else DEFAULT_DURATION
+
+    return {test_id: known.get(test_id, fallback) for test_id in test_ids}
+
+def assign_shards(test_ids, history, count):
+    """
+    Assign tests to shards, longest first, each to the shard with the least estimated time
+
+    Args:
+        test_ids: The test IDs
+        history: The durations store
+        count: The number of shards
+
+    Returns:
+        A list of count dictionaries with tests (sorted) and estimated (seconds)
+    """
+    estimates = estimate_durations(test_ids, history)
+    shards = [{"tests": [], "estimated": 0.0} for _ in range(count)]
+
+    # Sorting by ID breaks ties the same way on every node
+    for test_id in sorted(test_ids, key=lambda test_id: (-estimates[test_id], test_id)):
+        shard = min(shards, key=lambda shard: shard["estimated"])
+        shard["tests"].append(test_id)
+        shard["estimated"] += estimates[test_id]
+
+    for shard in shards:
+        shard["tests"].sort()
+
+    return shards
+
+def merge_reports(reports):
+    """
+    Merge the partial reports of a sharded run
+
+    Args:
+        reports: Report dictionaries from run_suite, one per shard
+
+    Returns:
+        A combined report. wall_time is the slowest shard's, and shards lists each
+        shard's index, wall time and tests. Tests missing from every shard, or present
+        in several, are listed under missing and duplicates.
+    """
+    results = {}
+    duplicates = set()
+    expected = set()
+    shards = []
+
+    for report in reports:
+        shard = report.get("shard") or {}
+        expected.update(shard.get("all_tests", []))
+        shards.append({"index": shard.get("index"), "count": shard.get("count"), "wall_time": report["wall_time"], "tests": [result["test"] for result in report["results"]]})
+
+        for result in report["results"]:
+            if result["test"] in results:
+                duplicates.add(result["test"])
+            results[result["test"]] = result
+
+    counts = {}
+    for result in results.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    # Combine the per-phase timings of each shard's own setup
+    timings = {}
+    for report in reports:
+        for phase_name, stats in (report.get("timings") or {}).items():
+            combined = timings.setdefault(phase_name, {"count": 0, "total": 0.0, "max": 0.0})
+            combined["count"] += stats["count"]
+            combined["total"] += stats["total"]
+            combined["max"] = max(combined["max"], stats["max"])
+
+    for stats in timings.values():
+        stats["mean"] = stats["total"] / stats["count"]
+
+    return {
+        "started_at": min(report["started_at"] for report in reports),
+        "wall_time": max(report["wall_time"] for report in reports),
+        "jobs": max(report["jobs"] for report in reports),
+        "counts": counts,
+        "results": [results[test_id] for test_id in sorted(results)],
+        "timings": timings,
+        "shards": sorted(shards, key=lambda shard: shard["index"] or 0),
+        "missing": sorted(expected - set(results)),
+        "duplicates": sorted(duplicates),
+    }
@@ -0,0 +1,341 @@
+"""
+Statistics Utilities
+
+This module provides reusable functions for summarizing repeated-trial metric values,
+including bootstrap confidence intervals, effect sizes and significance checks, and
+paired tests for row-by-row comparisons, with t critical values and Holm's correction
+for testing several metrics at once.
+"""
+
+import math
+
+import numpy as np
+
+# Up to this many pairs, the sign-flip test enumerates every sign pattern exactly
+EXACT_SIGN_FLIP_MAX = 16
+
+def to_array(values):
+    """
+    Convert metric values to a float array, dropping missing values
+
+    Args:
+        values: An iterable of metric values (None entries are ignored)
+
+    Returns:
+        A 1-D NumPy float array
+    """
+    return np.asarray([value for value in values if value is not None], dtype=float)
+
+def bootstrap_ci(values, confidence=0.95, n_resamples=2000, seed=None):
+    """
+    Compute a percentile bootstrap confidence interval for the mean
+
+    Args:
+        values: The metric values
+        confidence: The confidence level (default: 0.95)
+        n_resamples: The number of bootstrap resamples (default: 2000)
+        seed: An optional random seed for reproducible intervals
+
+    Returns:
+        A tuple of (low, high), or (nan, nan) if there are no values
+    """
+    values = to_array(values)
+
+    if values.size == 0:
+        return float('nan'), float('nan')
+
+    # Draw every resample at once so the means are a single vectorized reduction
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, values.size, size=(n_resamples, values.size))
+    means = values[indices].mean(axis=1)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+def bootstrap_diff_ci(original_values, improved_values, confidence=0.95, n_resamples=2000, seed=None):
+    """
+    Compute a percentile bootstrap confidence interval for the difference in means
+
+    Args:
+        original_values: The metric values from the original version
+        improved_values: The metric values from the improved version
+        confidence: The confidence level (default: 0.95)
+        n_resamples: The number of bootstrap resamples (default: 2000)
+        seed: An optional random seed for reproducible intervals
+
+    Returns:
+        A tuple of (low, high) for mean(improved) - mean(original),
+        or (nan, nan) if either sample is empty
+    """
+    original_values = to_array(original_values)
+    improved_values = to_array(improved_values)
+
+    if original_values.size == 0 or improved_values.size == 0:
+        return float('nan'), float('nan')
+
+    # The two samples are independent, so each one is resampled on its own
+    rng = np.random.default_rng(seed)
+    original_means = original_values[rng.integers(0, original_values.size, size=(n_resamples, original_values.size))].mean(axis=1)
+    improved_means = improved_values[rng.integers(0, improved_values.size, size=(n_resamples, improved_values.size))].mean(axis=1)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(improved_means - original_means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+def cohens_d(original_values, improved_values):
+    """
+    Compute Cohen's d effect size using the pooled standard deviation
+
+    Args:
+        original_values: The metric values from the original version
+        improved_values: The metric values from the improved version
+
+    Returns:
+        The effect size, or nan if either sample is empty
+    """
+    original_values = to_array(original_values)
+    improved_values = to_array(improved_values)
+
+    if original_values.size == 0 or improved_values.size == 0:
+        return float('nan')
+
+    difference = improved_values.mean() - original_values.mean()
+    dof = original_values.size + improved_values.size - 2
+
+    if dof <= 0:
+        return float('nan')
+
+    pooled_var = (
+        (original_values.size - 1) * original_values.var(ddof=1 if original_values.size > 1 else 0)
+        + (improved_values.size - 1) * improved_values.var(ddof=1 if improved_values.size > 1 else 0)
+    ) / dof
+    pooled_sd = np.sqrt(pooled_var)
+
+    # Identical, constant samples have no spread; report the direction of any difference
+    if pooled_sd == 0:
+        return 0.0 if difference == 0 else float(np.sign(difference) * np.inf)
+
+    return float(difference / pooled_sd)
+
+def summarize_trials(values, confidence=0.95, n_resamples=2000, seed=None):
+    """
+    Summarize the metric values from repeated trials
+
+    Args:
+        values: The metric values
+        confidence: The confidence level for the bootstrap interval (default: 0.95)
+        n_resamples: The number of bootstrap resamples (default: 2000)
+        seed: An optional random seed for reproducible intervals
+
+    Returns:
+        A dictionary with n, mean, stdev, ci_low and ci_high
+    """
+    values = to_array(values)
+    ci_low, ci_high = bootstrap_ci(values, confidence=confidence, n_resamples=n_resamples, seed=seed)
+
+    return {
+        "n": int(values.size),
+        "mean": float(values.mean()) if values.size else float('nan'),
+        "stdev": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+def compare_trials(original_values, improved_values, confidence=0.95, n_resamples=2000, seed=None):
+    """
+    Compare the metric values from repeated trials of two versions
+
+    The difference is considered significant when the bootstrap confidence interval
+    for mean(improved) - mean(original) does not contain zero.
+
+    Args:
+        original_values: The metric values from the original version
+        improved_values: The metric values from the improved version
+        confidence: The confidence level (default: 0.95)
+        n_resamples: The number of bootstrap resamples (default: 2000)
+        seed: An optional random seed for reproducible intervals
+
+    Returns:
+        A dictionary with the original and improved summaries, the difference in means,
+        its confidence interval, the effect size and a significant flag
+    """
+    original = summarize_trials(original_values, confidence=confidence, n_resamples=n_resamples, seed=seed)
+    improved = summarize_trials(improved_values, confidence=confidence, n_resamples=n_resamples, seed=seed)
+    diff_low, diff_high = bootstrap_diff_ci(original_values, improved_values, confidence=confidence, n_resamples=n_resamples, seed=seed)
+
+    significant = bool(not np.isnan(diff_low) and (diff_low > 0 or diff_high < 0))
+
+    return {
+        "original": original,
+        "improved": improved,
+        "confidence": confidence,
+        "difference": improved["mean"] - original["mean"],
+        "diff_ci_low": diff_low,
+        "diff_ci_high": diff_high,
+        "effect_size": cohens_d(original_values, improved_values),
+        "significant": significant,
+    }
+
+def paired_t_test(differences, n_resamples=10000, seed=None):
+    """
+    Test whether paired differences have a nonzero mean
+
+    With 30 or more pairs the p-value comes from the normal approximation to the t
+    distribution. With fewer, it comes from a sign-flip randomization test, which makes
+    no normality assumption. Up to EXACT_SIGN_FLIP_MAX pairs every sign pattern is
+    enumerated, so the p-value is exact and deterministic; above that, patterns are
+    sampled.
+
+    Args:
+        differences: The per-pair differences (None and NaN entries are ignored)
+        n_resamples: The number of sampled sign flips (default: 10000)
+        seed: An optional random seed for reproducible sampled p-values
+
+    Returns:
+        A dictionary with n, mean, stdev, stderr, t and p_value (two-sided); the
+        statistics are nan with fewer than 2 pairs
+    """
+    differences = to_array(differences)
+    differences = differences[~np.isnan(differences)]
+    n = int(differences.size)
+
+    if n < 2:
+        return {"n": n, "mean": float(differences.mean()) if n else float('nan'), "stdev": float('nan'), "stderr": float('nan'), "t": float('nan'), "p_value": float('nan')}
+
+    mean = float(differences.mean())
+    stdev = float(differences.std(ddof=1))
+    stderr = stdev / np.sqrt(n)
+
+    if stderr == 0:
+        t = 0.0 if mean == 0 else float(np.sign(mean) * np.inf)
+        p_value = 1.0 if mean == 0 else 0.0
+    elif n >= 30:
+        t = mean / stderr
+        p_value = math.erfc(abs(t) / math.sqrt(2))
+    elif n <= EXACT_SIGN_FLIP_MAX:
+        t = mean / stderr
+        # Under the null hypothesis each difference is equally likely to have either sign,
+        # and the 2 ** n patterns (the observed one included) are few enough to list
+        signs = 1.0 - 2.0 * ((np.arange(2 ** n)[:, None] >> np.arange(n)) & 1)
+        flipped_means = (signs * differences).mean(axis=1)
+        p_value = float(np.mean(np.abs(flipped_means) >= abs(mean) - 1e-12))
+    else:
+        t = mean / stderr
+        rng = np.random.default_rng(seed)
+        signs = rng.choice((-1.0, 1.0), size=(n_resamples, n))
+        flipped_means = (signs * differences).mean(axis=1)
+        p_value = float((np.sum(np.abs(flipped_means) >= abs(mean) - 1e-12) + 1) / (n_resamples + 1))
+
+    return {"n": n, "mean": mean, "stdev": stdev, "stderr": float(stderr), "t": float(t), "p_value": float(p_value)}
+
+def wilcoxon_signed_rank(differences):
+    """
+    Run the Wilcoxon signed-rank test on paired differences
+
+    Zero differences are dropped, tied magnitudes get their average rank, and the p-value
+    comes from the normal approximation with a tie correction. Unlike the t-test, this is
+    robust to a few rows with very large differences.
+
+    Args:
+        differences: The per-pair differences (None and NaN entries are ignored)
+
+    Returns:
+        A dictionary with n (nonzero differences), statistic (the sum of positive ranks),
+        z and p_value (two-sided; nan without nonzero differences)
+    """
+    differences = to_array(differences)
+    differences = differences[~np.isnan(differences) & (differences != 0)]
+    n = int(differences.size)
+
+    if n == 0:
+        return {"n": 0, "statistic": 0.0, "z": float('nan'), "p_value": float('nan')}
+
+    # Average ranks of tied magnitudes, computed from the sorted unique values
+    _, inverse, counts = np.unique(np.abs(differences), return_inverse=True, return_counts=True)
+    average_ranks = np.cumsum(counts) - (counts - 1) / 2
+    ranks = average_ranks[inverse]
+
+    statistic = float(ranks[differences > 0].sum())
+    expected = n * (n + 1) / 4
+    variance = n * (n + 1) * (2 * n + 1) / 24 - float(np.sum(counts ** 3 - counts)) / 48
+
+    if variance <= 0:
+        return {"n": n, "statistic": statistic, "z": float('nan'), "p_value": float('nan')}
+
+    z = (statistic - expected) / math.sqrt(variance)
+    return {"n": n, "statistic": statistic, "z": float(z), "p_value": float(math.erfc(abs(z) / math.sqrt(2)))}
+
+def _t_central_probability(t, df):
+    """Get P(|T| < t) for Student's t distribution with an integer number of degrees of freedom"""
+    theta = math.atan(t / math.sqrt(df))
+    cos_squared = math.cos(theta) ** 2
+
+    # The finite series of Abramowitz and Stegun 26.7.3 (odd df) and 26.7.4 (even df)
+    if df % 2:
+        term, total = math.cos(theta), 0.0
+        for k in range(1, (df - 1) // 2 + 1):
+            total += term
+            term *= cos_squared * (2 * k) / (2 * k + 1)
+        return 2 / math.pi * (theta + math.sin(theta) * total)
+
+    term, total = 1.0, 0.0
+    for k in range(1, df // 2 + 1):
+        total += term
+        term *= cos_squared * (2 * k - 1) / (2 * k)
+    return math.sin(theta) * total
+
+def t_critical(confidence, df):
+    """
+    Get the two-sided critical value of Student's t distribution
+
+    Args:
+        confidence: The confidence level, e.g. 0.95
+        df: The degrees of freedom (a positive integer)
+
+    Returns:
+        The value t such that P(|T| < t) = confidence
+    """
+    df = int(df)
+    if df < 1:
+        return float('nan')
+
+    # Bracket the value, then bisect; the probability increases with t
+    low, high = 0.0, 2.0
+    while _t_central_probability(high, df) < confidence:
+        low, high = high, high * 2
+
+    for _ in range(100):
+        middle = (low + high) / 2
+        if _t_central_probability(middle, df) < confidence:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
+
+def holm_adjust(p_values):
+    """
+    Adjust p-values for testing several hypotheses at once with Holm's step-down method
+
+    Rejecting every hypothesis whose adjusted p-value is below alpha keeps the chance of
+    any false rejection at most alpha, with more power than Bonferroni's correction.
+
+    Args:
+        p_values: The p-values (None and nan entries are ignored and stay nan)
+
+    Returns:
+        A NumPy array of adjusted p-values in the same order
+    """
+    # None becomes nan rather than being dropped, so the order is kept
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(p_values.shape, np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    m = tested.size
+
+    running_max = 0.0
+    for rank, index in enumerate(tested[np.argsort(p_values[tested], kind="stable")]):
+        running_max = max(running_max, min(1.0, (m - rank) * p_values[index]))
+        adjusted[index] = running_max
+
+    return adjusted
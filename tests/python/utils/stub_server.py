@@ -0,0 +1,425 @@
+"""
+Stub Server Utilities
+
+This module provides a local OpenAI-compatible HTTP server for benchmarking the harness
+without network access. It serves chat completions (including streaming) with
+configurable latency distributions, token counts and error injection.
+
+Point a (Galileo-wrapped) OpenAI client at it with base_url, or set OPENAI_BASE_URL so
+that unmodified sample apps pick it up:
+
+    python -m tests.python.utils.stub_server --port 8000 --latency lognormal:-1.5,0.4 --error-rate 0.05 --seed 1
+    OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=stub python tests/python/sdk/openai-wrapper/app.py
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .terminal import console
+
+DEFAULT_RESPONSE_TEXT = "This is a test response from the local stub server."
+
+ERROR_TYPES = {
+    400: "invalid_request_error",
+    401: "authentication_error",
+    429: "rate_limit_error",
+    500: "server_error",
+    503: "server_error",
+}
+
+def parse_latency(spec):
+    """
+    Parse a latency distribution spec
+
+    Supported specs (all values in seconds, except lognormal which takes the mean and
+    standard deviation of the underlying normal distribution):
+        fixed:0.2
+        uniform:0.1,0.5
+        normal:0.3,0.05
+        lognormal:-1.5,0.4
+        exponential:0.3      (mean)
+
+    Args:
+        spec: The latency spec string (a bare number is treated as fixed)
+
+    Returns:
+        A tuple of (distribution_name, parameters)
+    """
+    if spec is None or spec == "":
+        return "fixed", (0.0,)
+
+    name, _, params = str(spec).partition(":")
+    if not params:
+        return "fixed", (float(name),)
+
+    values = tuple(float(value) for value in params.split(","))
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    if name not in expected:
+        raise ValueError(f"Unknown latency distribution '{name}'. Use one of: {', '.join(expected)}")
+    if len(values) != expected[name]:
+        raise ValueError(f"Latency distribution '{name}' takes {expected[name]} parameter(s)")
+
+    return name, values
+
+def count_tokens(text):
+    """
+    Estimate the token count of a text deterministically (about 4 characters per token)
+
+    Args:
+        text: The text
+
+    Returns:
+        The estimated number of tokens
+    """
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+class StubConfig:
+    """
+    Behaviour of the stub server
+
+    The random generator is seeded and shared by all request threads, so a run with a fixed
+    seed and a single client thread produces the same latencies and errors every time.
+    """
+
+    def __init__(self, latency=None, error_rate=0.0, error_status=500, response_text=None, completion_tokens=None, chunk_delay=0.0, seed=None):
+        """
+        Initialize the configuration
+
+        Args:
+            latency: A latency spec for parse_latency (default: no latency)
+            error_rate: Probability of answering a completion with an error (default: 0.0)
+            error_status: HTTP status of injected errors (default: 500)
+            response_text: Text of every completion (default: DEFAULT_RESPONSE_TEXT)
+            completion_tokens: If set, completions are built from the response words up to
+                               (at least) this many tokens
+            chunk_delay: Delay between streamed chunks in seconds (default: 0.0)
+            seed: Random seed for latencies and errors (optional)
+        """
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_text = response_text or DEFAULT_RESPONSE_TEXT
+        self.completion_tokens = completion_tokens
+        self.chunk_delay = chunk_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self):
+        """Draw one latency from the configured distribution, in seconds"""
+        name, params = self.latency
+
+        with self._lock:
+            if name == "fixed":
+                value = params[0]
+            elif name == "uniform":
+                value = self._random.uniform(*params)
+            elif name == "normal":
+                value = self._random.gauss(*params)
+            elif name == "lognormal":
+                value = self._random.lognormvariate(*params)
+            else:
+                value = self._random.expovariate(1 / params[0]) if params[0] > 0 else 0.0
+
+        return max(0.0, value)
+
+    def should_fail(self):
+        """Decide whether the next completion gets an injected error"""
+        if self.error_rate <= 0:
+            return False
+
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def completion_text(self):
+        """Build the completion text, honouring completion_tokens if set"""
+        if not self.completion_tokens:
+            return self.response_text
+
+        # Repeat the response words until the token estimate reaches the target
+        words = self.response_text.split()
+        text = ""
+        i = 0
+        while count_tokens(text) < self.completion_tokens:
+            text = f"{text} {words[i % len(words)]}".strip()
+            i += 1
+
+        return text
+
+class StubStats:
+    """Counters collected by the stub server"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.streamed = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, error=False, streamed=False):
+        """Record one completion request"""
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.streamed += int(streamed)
+            self.total_latency += latency
+
+    def snapshot(self):
+        """
+        Get the current counters
+
+        Returns:
+            A dictionary with requests, errors, streamed and mean_latency
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "streamed": self.streamed,
+                "mean_latency": self.total_latency / self.requests if self.requests else 0.0,
+            }
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the OpenAI endpoints used by the harness"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {
+            "error": {
+                "message": message,
+                "type": ERROR_TYPES.get(status, "server_error"),
+                "code": None,
+            }
+        })
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/v1/models", "/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "stub"}]})
+        else:
+            self._send_error(404, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_error(400, "Request body is not valid JSON")
+            return
+
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_error(404, f"Unknown path {self.path}")
+            return
+
+        config = self.server.config
+        latency = config.sample_latency()
+        stream = bool(body.get("stream"))
+
+        if config.should_fail():
+            time.sleep(latency)
+            self.server.stats.record(latency, error=True, streamed=stream)
+            self._send_error(config.error_status, "Injected error from the stub server")
+            return
+
+        model = body.get("model", "gpt-4o")
+        messages = body.get("messages", [])
+        prompt_text = " ".join(str(message.get("content", "")) for message in messages if isinstance(message, dict))
+        text = config.completion_text()
+        usage = {
+            "prompt_tokens": count_tokens(prompt_text),
+            "completion_tokens": count_tokens(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        time.sleep(latency)
+        self.server.stats.record(latency, streamed=stream)
+
+        if stream:
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self._stream_completion(completion_id, created, model, text, usage if include_usage else None, config.chunk_delay)
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream_completion(self, completion_id, created, model, text, usage, chunk_delay):
+        """Send the completion as server-sent events, one word per chunk"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None, choices=True, extra=None):
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if choices else [],
+            }
+            if extra:
+                payload.update(extra)
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if chunk_delay:
+                time.sleep(chunk_delay)
+            chunk({"content": word if i == 0 else f" {word}"})
+        chunk({}, finish_reason="stop")
+
+        if usage:
+            chunk(None, choices=False, extra={"usage": usage})
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+class StubServer:
+    """
+    A local OpenAI-compatible server running in a background thread
+
+    Use it as a context manager:
+
+        with StubServer(latency="uniform:0.1,0.3", seed=1) as server:
+            client = clients.get_openai_client(api_key="stub", base_url=server.base_url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, **config):
+        """
+        Initialize the server
+
+        Args:
+            host: The host to bind (default: "127.0.0.1")
+            port: The port to bind (default: 0, any free port)
+            **config: StubConfig options (latency, error_rate, error_status, response_text,
+                      completion_tokens, chunk_delay, seed)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = StubConfig(**config)
+        self.httpd.stats = StubStats()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """The base URL to pass to the OpenAI client"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self):
+        """The server's request counters"""
+        return self.httpd.stats
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def add_config_arguments(parser):
+    """
+    Add the stub configuration options to an argument parser
+
+    Args:
+        parser: The argparse parser
+    """
+    parser.add_argument("--latency", default="fixed:0", help="Latency distribution, e.g. fixed:0.2, uniform:0.1,0.5, normal:0.3,0.05, lognormal:-1.5,0.4, exponential:0.3")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error per completion")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected errors")
+    parser.add_argument("--response-text", default=None, help="Text of every completion")
+    parser.add_argument("--completion-tokens", type=int, default=None, help="Build completions of (at least) this many tokens")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Delay between streamed chunks in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latencies and errors")
+
+def config_from_args(args):
+    """
+    Build StubConfig keyword arguments from parsed arguments
+
+    Args:
+        args: The parsed arguments
+
+    Returns:
+        A dictionary of StubConfig options
+    """
+    return {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "error_status": args.error_status,
+        "response_text": args.response_text,
+        "completion_tokens": args.completion_tokens,
+        "chunk_delay": args.chunk_delay,
+        "seed": args.seed,
+    }
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server for offline harness benchmarking")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubServer(host=args.host, port=args.port, **config_from_args(args))
+    console.print(f"[bold cyan]Stub server listening on {server.base_url}[/]")
+    console.print(f"[cyan]Set OPENAI_BASE_URL={server.base_url} to point clients at it. Press Ctrl+C to stop.[/]")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        stats = server.stats.snapshot()
+        console.print(f"[bold cyan]Served {stats['requests']} completions ({stats['errors']} errors, {stats['streamed']} streamed)[/]")
+
+if __name__ == "__main__":
+    main()
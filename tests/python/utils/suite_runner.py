@@ -0,0 +1,469 @@
+"""
+Suite Runner Utilities
+
+This module provides a suite runner for the harness: it discovers every test.py under
+tests/python, runs them in parallel worker processes with per-test timeouts, captures each
+test's output separately, and produces one aggregated pass/fail and timing report.
+Authentication and ID lookups are done once for the whole run and handed to the tests
+through a session file (see session.py), and tests whose inputs haven't changed reuse
+their last passing result (see result_cache.py). With --shard, only one balanced slice of
+the suite runs (see sharding.py), and --merge combines the partial reports of every shard.
+
+    python -m tests.python.utils.suite_runner --jobs 4 --timeout 600
+    python -m tests.python.utils.suite_runner sdk/openai-wrapper getting-started
+    python -m tests.python.utils.suite_runner --affected --base origin/main
+    python -m tests.python.utils.suite_runner --shard 2/4
+    python -m tests.python.utils.suite_runner --merge .results/report.shard-*-of-4.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from rich.panel import Panel
+from rich.table import Table
+
+from . import config
+from . import impact
+from . import result_cache
+from . import run_scope
+from . import session
+from . import sharding
+from . import timings
+from .terminal import console
+
+# The tests/python directory that holds every harness
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Default location for captured logs and the JSON report
+DEFAULT_OUTPUT_DIR = os.path.join(TESTS_ROOT, ".results")
+
+def discover_tests(root=TESTS_ROOT, selected=None):
+    """
+    Discover every test.py under the tests root
+
+    Args:
+        root: The directory to search (default: tests/python)
+        selected: Test IDs or ID prefixes to keep, e.g. ["sdk"] or ["getting-started"] (optional)
+
+    Returns:
+        A sorted list of test IDs, i.e. test.py directories relative to root
+        (e.g. "sdk/openai-wrapper")
+    """
+    test_ids = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Skip utilities, virtualenvs, caches and result directories
+        dirnames[:] = [name for name in dirnames if name != "utils" and not name.startswith((".", "__"))]
+
+        if "test.py" in filenames:
+            test_ids.append(os.path.relpath(dirpath, root).replace(os.sep, "/"))
+
+    if selected:
+        prefixes = [item.strip("/") for item in selected]
+        test_ids = [test_id for test_id in test_ids if any(test_id == prefix or test_id.startswith(f"{prefix}/") for prefix in prefixes)]
+
+    return sorted(test_ids)
+
+def log_path_for(test_id, output_dir):
+    """
+    Get the log file path of a test
+
+    Args:
+        test_id: The test ID
+        output_dir: The results directory
+
+    Returns:
+        The path of the test's captured output
+    """
+    return os.path.join(output_dir, "logs", f"{test_id.replace('/', '__')}.log")
+
+def run_test(test_id, root=TESTS_ROOT, output_dir=DEFAULT_OUTPUT_DIR, timeout=900, env=None):
+    """
+    Run one test.py in its own process and capture its output
+
+    The test runs with its own directory as the working directory, as when run by hand.
+
+    Args:
+        test_id: The test ID
+        root: The tests root (default: tests/python)
+        output_dir: The results directory (default: tests/python/.results)
+        timeout: Maximum run time in seconds before the test is killed (default: 900)
+        env: Extra environment variables for the test process (optional)
+
+    Returns:
+        A result dictionary with test, status ("passed", "failed", "timeout" or "error"),
+        returncode, duration, log, a short error message and, if the test recorded any,
+        its per-phase timings
+    """
+    test_dir = os.path.join(root, test_id)
+    log_path = log_path_for(test_id, output_dir)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    timings_path = os.path.join(output_dir, "timings", f"{test_id.replace('/', '__')}.json")
+
+    process_env = dict(os.environ)
+    process_env.update(env or {})
+    process_env[timings.TIMINGS_FILE_ENV] = timings_path
+
+    # Don't attach timings left over from an earlier run
+    if os.path.exists(timings_path):
+        os.remove(timings_path)
+    # Keep rich output readable in the captured logs
+    process_env.setdefault("COLUMNS", "120")
+
+    start_time = time.time()
+    result = {"test": test_id, "status": "error", "returncode": None, "duration": 0.0, "log": log_path, "error": None}
+
+    try:
+        with open(log_path, "w") as log_file:
+            completed = subprocess.run(
+                [sys.executable, "test.py"],
+                cwd=test_dir,
+                env=process_env,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                timeout=timeout,
+            )
+        result["returncode"] = completed.returncode
+        result["status"] = "passed" if completed.returncode == 0 else "failed"
+    except subprocess.TimeoutExpired:
+        result["status"] = "timeout"
+        result["error"] = f"Timed out after {timeout} seconds"
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["duration"] = time.time() - start_time
+
+    # Attach the test's per-phase timings, if it wrote any
+    if os.path.exists(timings_path):
+        try:
+            result["timings"] = timings.load_summary(timings_path)
+        except (OSError, ValueError):
+            pass
+
+    return result
+
+def cached_result(test_id, entry, output_dir):
+    """
+    Build a suite result from a cache entry, restoring its log
+
+    Args:
+        test_id: The test ID
+        entry: The cache entry from ResultCache.get
+        output_dir: The results directory
+
+    Returns:
+        A result dictionary marked as cached, with the original duration in cached_duration
+    """
+    result = dict(entry["result"])
+    log_path = log_path_for(test_id, output_dir)
+
+    if entry.get("log"):
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        shutil.copyfile(entry["log"], log_path)
+
+    result.update({
+        "log": log_path,
+        "cached": True,
+        "cached_at": entry["cached_at"],
+        "cached_duration": result["duration"],
+        "duration": 0.0,
+    })
+    return result
+
+def share_session(output_dir):
+    """
+    Create the suite session and write its handoff file
+
+    Args:
+        output_dir: The results directory
+
+    Returns:
+        The handoff file path, or None if the session could not be created
+    """
+    console.print("[bold cyan]Creating the shared suite session...[/]")
+    shared = session.create_session()
+
+    if shared is None:
+        console.print("[bold yellow]⚠ No shared session. Each test will authenticate on its own.[/]")
+        return None
+
+    session_path = os.path.join(output_dir, "session.json")
+    shared.save(session_path)
+    return session_path
+
+def run_suite(test_ids, jobs=4, timeout=900, root=TESTS_ROOT, output_dir=DEFAULT_OUTPUT_DIR, env=None, use_session=True, cache=None):
+    """
+    Run tests in parallel, each in its own process
+
+    Args:
+        test_ids: The test IDs to run
+        jobs: Maximum number of tests running at once (default: 4)
+        timeout: Per-test timeout in seconds (default: 900)
+        root: The tests root (default: tests/python)
+        output_dir: The results directory (default: tests/python/.results)
+        env: Extra environment variables for every test process (optional)
+        use_session: Whether to authenticate once and share the session with every test (default: True)
+        cache: A ResultCache to reuse and store passing results (optional)
+
+    Returns:
+        A report dictionary with started_at, run_id, wall_time, jobs, counts, per-test results and
+        the timings of the suite's own setup (e.g. creating the shared session)
+    """
+    started_at = datetime.now(timezone.utc).isoformat()
+    start_time = time.time()
+    results = []
+
+    # Reuse cached results, keeping the keys of the tests that still have to run
+    pending = {}
+    for test_id in test_ids:
+        if cache is None:
+            pending[test_id] = None
+            continue
+
+        components = result_cache.key_components(test_id, root)
+        key = result_cache.cache_key(components)
+        entry = cache.get(key)
+
+        if entry is None:
+            pending[test_id] = (key, components)
+            continue
+
+        result = cached_result(test_id, entry, output_dir)
+        results.append(result)
+        age = (time.time() - entry["cached_at"]) / 60
+        console.print(f"[bold green]✓ {test_id} passed (cached {age:.0f} min ago, saved {result['cached_duration']:.1f}s)[/]")
+
+    # Every test of the run shares one run ID, so its resource names are unique to the run
+    env = dict(env or {})
+    env.setdefault(run_scope.RUN_ID_ENV, run_scope.get_run_id())
+    session_path = share_session(output_dir) if use_session and pending else None
+    if session_path:
+        env[session.SESSION_FILE_ENV] = session_path
+
+    if pending:
+        console.print(f"[bold cyan]Running {len(pending)} tests with {jobs} jobs (timeout {timeout}s per test)...[/]")
+
+    try:
+        # Each worker thread only waits on its test's subprocess, so threads are enough to
+        # keep `jobs` test processes running in parallel
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            futures = {executor.submit(run_test, test_id, root, output_dir, timeout, env): test_id for test_id in pending}
+
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+
+                if cache is not None:
+                    key, components = pending[result["test"]]
+                    cache.put(key, result, components)
+
+                style = "green" if result["status"] == "passed" else "red"
+                console.print(f"[bold {style}]{'✓' if result['status'] == 'passed' else '✗'} {result['test']} {result['status']} in {result['duration']:.1f}s[/]")
+    finally:
+        # The handoff file holds credentials, so don't leave it behind
+        if session_path and os.path.exists(session_path):
+            os.remove(session_path)
+
+    results.sort(key=lambda result: result["test"])
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    return {
+        "started_at": started_at,
+        "run_id": env[run_scope.RUN_ID_ENV],
+        "wall_time": time.time() - start_time,
+        "jobs": jobs,
+        "counts": counts,
+        "results": results,
+        "timings": timings.summarize(timings.get_records()),
+    }
+
+def write_report(report, path):
+    """
+    Write a suite report as JSON
+
+    Args:
+        report: The report from run_suite
+        path: The output file path
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def display_report(report):
+    """
+    Display a suite report
+
+    Args:
+        report: The report from run_suite
+    """
+    table = Table(title="Suite Results", show_header=True, header_style="bold cyan")
+    table.add_column("Test", style="cyan")
+    table.add_column("Status", style="cyan")
+    table.add_column("Duration", style="cyan")
+    table.add_column("Log", style="cyan")
+
+    for result in report["results"]:
+        style = "green" if result["status"] == "passed" else "red"
+        status = f"{result['status']} (cached)" if result.get("cached") else result["status"]
+        table.add_row(result["test"], f"[{style}]{status}[/]", f"{result['duration']:.1f}s", os.path.relpath(result["log"]))
+
+    console.print(table)
+
+    total_duration = sum(result["duration"] for result in report["results"])
+    passed = report["counts"].get("passed", 0)
+    total = len(report["results"])
+    cached = sum(1 for result in report["results"] if result.get("cached"))
+    summary = (
+        f"{passed}/{total} tests passed" + (f" ({cached} from cache)" if cached else "") + "\n"
+        f"Wall time: {report['wall_time']:.1f}s (sum of test durations: {total_duration:.1f}s, {report['jobs']} jobs)"
+    )
+
+    if passed == total:
+        console.print(Panel(f"[bold green]{summary}[/]", title="[bold green]Success[/]", border_style="green"))
+    else:
+        console.print(Panel(f"[bold red]{summary}[/]", title="[bold red]Failure[/]", border_style="red"))
+
+def merge(report_paths, report_path, durations_path):
+    """
+    Merge the partial reports of a sharded run into one report
+
+    Args:
+        report_paths: The partial report files, one per shard
+        report_path: The merged report file to write
+        durations_path: The durations store to update with the merged results
+
+    Returns:
+        True if every expected test ran exactly once and passed, False otherwise
+    """
+    reports = []
+    for path in report_paths:
+        try:
+            with open(path) as f:
+                reports.append(json.load(f))
+        except (OSError, ValueError) as e:
+            console.print(f"[bold red]✗ Could not read report {path}: {e}[/]")
+            return False
+
+    report = sharding.merge_reports(reports)
+    write_report(report, report_path)
+    sharding.update_durations(durations_path, report["results"])
+
+    display_report(report)
+    for shard in report["shards"]:
+        console.print(f"[cyan]Shard {shard['index']}/{shard['count']}: {len(shard['tests'])} test(s) in {shard['wall_time']:.1f}s[/]")
+
+    if report["missing"]:
+        console.print(f"[bold red]✗ Tests missing from every shard: {', '.join(report['missing'])}[/]")
+    if report["duplicates"]:
+        console.print(f"[bold yellow]⚠ Tests run by more than one shard: {', '.join(report['duplicates'])}[/]")
+
+    console.print(f"[bold cyan]Merged report written to {os.path.relpath(report_path)}[/]")
+
+    return not report["missing"] and report["counts"].get("passed", 0) == len(report["results"])
+
+def main():
+    """
+    Main function
+
+    Returns:
+        True if every test passed, False otherwise
+    """
+    parser = argparse.ArgumentParser(description="Run the tests/python harness suite in parallel")
+    parser.add_argument("tests", nargs="*", help="Test IDs or prefixes to run, e.g. sdk/openai-wrapper or sdk (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=int(os.environ.get("HARNESS_JOBS", 4)), help="Number of tests to run in parallel")
+    parser.add_argument("--timeout", type=float, default=900, help="Per-test timeout in seconds")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Directory for captured logs and the report")
+    parser.add_argument("--report", default=None, help="Path of the JSON report (default: <output-dir>/report.json)")
+    parser.add_argument("--list", action="store_true", help="List the discovered tests and exit")
+    parser.add_argument("--no-shared-session", action="store_true", help="Let every test authenticate and resolve IDs on its own")
+    parser.add_argument("--no-cache", action="store_true", help="Run every test even if a fresh cached result exists")
+    parser.add_argument("--cache-ttl", type=float, default=float(os.environ.get("HARNESS_CACHE_TTL", result_cache.CACHE_TTL)), help="Freshness window of cached results in seconds")
+    parser.add_argument("--shard", default=None, help="Only run shard INDEX/COUNT of the suite, e.g. 2/4, balanced on historical durations")
+    parser.add_argument("--durations", default=None, help="Durations store used for sharding (default: <output-dir>/durations.json)")
+    parser.add_argument("--merge", nargs="+", default=None, metavar="REPORT", help="Merge the partial reports of a sharded run instead of running tests")
+    parser.add_argument("--affected", action="store_true", help="Only run tests affected by changes against the base branch")
+    parser.add_argument("--base", default=None, help="Base branch or commit for --affected (default: HARNESS_BASE_BRANCH or main/master)")
+    args = parser.parse_args()
+
+    durations_path = args.durations or os.path.join(args.output_dir, "durations.json")
+
+    if args.merge:
+        return merge(args.merge, args.report or os.path.join(args.output_dir, "report.json"), durations_path)
+
+    test_ids = discover_tests(selected=args.tests)
+
+    if args.affected:
+        changed = impact.changed_files(args.base)
+
+        if changed is None:
+            console.print("[bold yellow]⚠ Could not compute the diff against the base branch. Running all selected tests.[/]")
+        else:
+            impacted = impact.select_impacted_tests(test_ids, changed)
+            impact.display_impact(impacted, test_ids)
+            test_ids = [test_id for test_id in test_ids if test_id in impacted]
+
+            if not test_ids:
+                console.print("[bold green]✓ No tests affected by the changes[/]")
+                return True
+
+    shard = None
+    if args.shard:
+        try:
+            index, count = sharding.parse_shard(args.shard)
+        except ValueError as e:
+            console.print(f"[bold red]✗ {e}[/]")
+            return False
+
+        all_tests = test_ids
+        shard = sharding.assign_shards(all_tests, sharding.load_durations(durations_path), count)[index - 1]
+        shard.update({"index": index, "count": count, "all_tests": all_tests})
+        test_ids = shard["tests"]
+        console.print(f"[bold cyan]Shard {index}/{count}: {len(test_ids)} of {len(all_tests)} test(s), estimated {shard['estimated']:.0f}s[/]")
+
+        if not test_ids:
+            console.print("[bold yellow]⚠ No tests assigned to this shard[/]")
+
+    if args.list:
+        for test_id in test_ids:
+            console.print(test_id)
+        return True
+
+    if not test_ids and shard is None:
+        console.print("[bold red]✗ No tests found[/]")
+        return False
+
+    config.load_environment()
+
+    cache = None if args.no_cache else result_cache.ResultCache(os.path.join(args.output_dir, "cache"), ttl=args.cache_ttl)
+
+    report = run_suite(test_ids, jobs=args.jobs, timeout=args.timeout, output_dir=args.output_dir, use_session=not args.no_shared_session, cache=cache)
+    default_report = f"report.shard-{shard['index']}-of-{shard['count']}.json" if shard else "report.json"
+    report_path = args.report or os.path.join(args.output_dir, default_report)
+
+    # A sharded run records its durations when the partial reports are merged, so the
+    # store is updated once per run
+    if shard:
+        report["shard"] = shard
+    else:
+        sharding.update_durations(durations_path, report["results"])
+    write_report(report, report_path)
+
+    display_report(report)
+    console.print(f"[bold cyan]Report written to {os.path.relpath(report_path)}[/]")
+
+    return report["counts"].get("passed", 0) == len(report["results"])
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,12 @@
+"""
+Terminal Utilities
+
+This module provides the rich console shared by every utility module, so that output
+from different modules goes through one console (and one live display) and the console
+is only built once per process.
+"""
+
+from rich.console import Console
+
+# Shared rich console
+console = Console()
@@ -0,0 +1,317 @@
+"""
+Timing Utilities
+
+This module records how long each phase of a harness run takes (environment check, auth,
+ID resolution, LLM calls, flushes, trace lookups, metric-wait attempts, display, ...) and
+writes the timings to a JSON results file when the process exits. A compare command diffs
+a results file or suite report against a stored baseline and fails when a phase regresses
+beyond a threshold.
+
+    python -m tests.python.utils.timings show tests/python/.results/report.json
+    python -m tests.python.utils.timings compare tests/python/.results/report.json baseline.json --threshold 0.25
+"""
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from rich.table import Table
+
+from .terminal import console
+
+# Environment variable naming the results file; the suite runner sets one per test
+TIMINGS_FILE_ENV = "HARNESS_TIMINGS_FILE"
+
+# The tests/python directory, used to name the default results file after the test
+TESTS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_TIMINGS_DIR = os.path.join(TESTS_ROOT, ".results", "timings")
+
+_lock = threading.Lock()
+_records = []
+
+def record(phase_name, duration, **labels):
+    """
+    Record the duration of a phase
+
+    Args:
+        phase_name: The phase name, e.g. "auth" or "llm_call"
+        duration: The duration in seconds
+        **labels: Extra details stored with the record, e.g. model="gpt-4o"
+    """
+    entry = {"phase": phase_name, "duration": duration, "ended_at": time.time()}
+    entry.update(labels)
+
+    with _lock:
+        _records.append(entry)
+
+@contextmanager
+def phase(phase_name, **labels):
+    """
+    Time a block of code as a phase
+
+    The phase is recorded even if the block raises.
+
+    Args:
+        phase_name: The phase name
+        **labels: Extra details stored with the record
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase_name, time.perf_counter() - start_time, **labels)
+
+def timed(phase_name):
+    """
+    Decorate a function so that every call is recorded as a phase
+
+    Args:
+        phase_name: The phase name
+
+    Returns:
+        The decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(phase_name, function=function.__name__):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_records():
+    """
+    Get every phase recorded in this process
+
+    Returns:
+        A list of record dictionaries, in completion order
+    """
+    with _lock:
+        return list(_records)
+
+def summarize(records):
+    """
+    Summarize records per phase
+
+    Args:
+        records: Phase records
+
+    Returns:
+        A dictionary mapping each phase to count, total, mean and max durations
+    """
+    summary = {}
+
+    for entry in records:
+        stats = summary.setdefault(entry["phase"], {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += entry["duration"]
+        stats["max"] = max(stats["max"], entry["duration"])
+
+    for stats in summary.values():
+        stats["mean"] = stats["total"] / stats["count"]
+
+    return summary
+
+def default_results_path():
+    """
+    Get the results file path for this process
+
+    Returns:
+        HARNESS_TIMINGS_FILE if set, otherwise a file under tests/python/.results/timings
+        named after the running test (e.g. sdk__openai-wrapper.json) or script
+    """
+    if os.environ.get(TIMINGS_FILE_ENV):
+        return os.environ[TIMINGS_FILE_ENV]
+
+    script_path = os.path.abspath(sys.argv[0] if sys.argv and sys.argv[0] else "harness")
+    relative = os.path.relpath(os.path.dirname(script_path), TESTS_ROOT)
+
+    if os.path.basename(script_path) == "test.py" and not relative.startswith(".."):
+        name = relative.replace(os.sep, "__")
+    else:
+        name = os.path.splitext(os.path.basename(script_path))[0]
+
+    return os.path.join(DEFAULT_TIMINGS_DIR, f"{name}.json")
+
+def write_results(path=None):
+    """
+    Write the recorded timings as JSON
+
+    Args:
+        path: The output file path (default: default_results_path())
+
+    Returns:
+        The path written to
+    """
+    path = path or default_results_path()
+    records = get_records()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "script": sys.argv[0] if sys.argv else None,
+            "written_at": datetime.now(timezone.utc).isoformat(),
+            "records": records,
+            "summary": summarize(records),
+        }, f, indent=2)
+
+    return path
+
+def _write_at_exit():
+    """Write the results file at exit if anything was timed"""
+    if get_records():
+        try:
+            write_results()
+        except OSError:
+            pass
+
+atexit.register(_write_at_exit)
+
+def load_summary(path):
+    """
+    Load per-phase totals from a timings results file or a suite report
+
+    Args:
+        path: A file written by write_results, or a suite_runner report
+
+    Returns:
+        A dictionary mapping phase keys to summary statistics. Suite report keys are
+        prefixed with the test ID, e.g. "sdk/datasets/auth", or "suite" for the suite's
+        own setup.
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    if "results" in data:
+        summary = {f"suite/{phase_name}": stats for phase_name, stats in (data.get("timings") or {}).items()}
+        for result in data["results"]:
+            for phase_name, stats in (result.get("timings") or {}).items():
+                summary[f"{result['test']}/{phase_name}"] = stats
+        return summary
+
+    return data.get("summary") or summarize(data.get("records", []))
+
+def compare(current, baseline, threshold=0.2, min_delta=0.5):
+    """
+    Compare per-phase totals against a baseline
+
+    A phase regresses when its total grows by more than threshold (relative) and by more
+    than min_delta seconds, so small phases don't fail on noise.
+
+    Args:
+        current: The current summary from load_summary
+        baseline: The baseline summary from load_summary
+        threshold: Allowed relative growth (default: 0.2, i.e. 20%)
+        min_delta: Growth in seconds below which a phase never regresses (default: 0.5)
+
+    Returns:
+        A list of rows with phase, baseline, current, change (relative, or None for new
+        phases) and regressed
+    """
+    rows = []
+
+    for key in sorted(set(current) | set(baseline)):
+        current_total = current.get(key, {}).get("total")
+        baseline_total = baseline.get(key, {}).get("total")
+
+        change = None
+        regressed = False
+        if current_total is not None and baseline_total:
+            change = (current_total - baseline_total) / baseline_total
+            regressed = change > threshold and current_total - baseline_total > min_delta
+
+        rows.append({"phase": key, "baseline": baseline_total, "current": current_total, "change": change, "regressed": regressed})
+
+    return rows
+
+def display_summary(summary, title="Phase Timings"):
+    """
+    Display per-phase statistics
+
+    Args:
+        summary: A summary from summarize or load_summary
+        title: The table title (default: "Phase Timings")
+    """
+    table = Table(title=title, show_header=True, header_style="bold cyan")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Count", style="cyan")
+    table.add_column("Total", style="cyan")
+    table.add_column("Mean", style="cyan")
+    table.add_column("Max", style="cyan")
+
+    for key, stats in sorted(summary.items()):
+        table.add_row(key, str(stats["count"]), f"{stats['total']:.2f}s", f"{stats['mean']:.2f}s", f"{stats['max']:.2f}s")
+
+    console.print(table)
+
+def display_comparison(rows, threshold):
+    """
+    Display a baseline comparison
+
+    Args:
+        rows: The result of compare
+        threshold: The relative threshold used
+    """
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}s"
+
+    table = Table(title="Phase Timings vs Baseline", show_header=True, header_style="bold cyan")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Baseline", style="cyan")
+    table.add_column("Current", style="cyan")
+    table.add_column("Change", style="cyan")
+
+    for row in rows:
+        if row["change"] is None:
+            change = "[dim]new[/]" if row["baseline"] is None else "[dim]removed[/]" if row["current"] is None else "-"
+        else:
+            style = "red" if row["regressed"] else "green" if row["change"] <= 0 else "yellow"
+            change = f"[{style}]{row['change']:+.0%}[/]"
+        table.add_row(row["phase"], seconds(row["baseline"]), seconds(row["current"]), change)
+
+    console.print(table)
+
+    regressions = [row["phase"] for row in rows if row["regressed"]]
+    if regressions:
+        console.print(f"[bold red]✗ {len(regressions)} phase(s) regressed by more than {threshold:.0%}: {', '.join(regressions)}[/]")
+    else:
+        console.print(f"[bold green]✓ No phase regressed by more than {threshold:.0%}[/]")
+
+def main():
+    """
+    Main function
+
+    Returns:
+        False if the compare command found a regression, True otherwise
+    """
+    parser = argparse.ArgumentParser(description="Show harness phase timings or compare them against a baseline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    show_parser = subparsers.add_parser("show", help="Show the phase timings of a results file or suite report")
+    show_parser.add_argument("path")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare phase timings against a baseline")
+    compare_parser.add_argument("current", help="Results file or suite report of the current run")
+    compare_parser.add_argument("baseline", help="Results file or suite report to compare against")
+    compare_parser.add_argument("--threshold", type=float, default=float(os.environ.get("HARNESS_TIMING_THRESHOLD", 0.2)), help="Allowed relative growth per phase, e.g. 0.2 for 20%%")
+    compare_parser.add_argument("--min-delta", type=float, default=0.5, help="Growth in seconds below which a phase never fails")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        display_summary(load_summary(args.path))
+        return True
+
+    rows = compare(load_summary(args.current), load_summary(args.baseline), threshold=args.threshold, min_delta=args.min_delta)
+    display_comparison(rows, args.threshold)
+
+    return not any(row["regressed"] for row in rows)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,309 @@
+"""
+Usage Utilities
+
+This module provides reusable functions for token usage and cost accounting,
+including extracting usage from OpenAI responses, aggregating it across runs,
+and enforcing token and cost budgets.
+"""
+
+import os
+import threading
+
+# Prices in USD per million tokens as (prompt, completion). Model names returned by the API
+# carry a date suffix (e.g. "gpt-4o-2024-08-06"), so lookups match on the longest prefix.
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+def extract_usage(response):
+    """
+    Extract token usage from an OpenAI chat completion response
+
+    Args:
+        response: The chat completion response
+
+    Returns:
+        A dictionary of (prompt_tokens, completion_tokens, total_tokens) or None if the
+        response has no usage (e.g. a stream without include_usage)
+    """
+    usage = getattr(response, 'usage', None)
+
+    if usage is None and isinstance(response, dict):
+        usage = response.get('usage')
+
+    if not usage:
+        return None
+
+    def field(name):
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value or 0
+
+    prompt_tokens = field('prompt_tokens')
+    completion_tokens = field('completion_tokens')
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": field('total_tokens') or prompt_tokens + completion_tokens,
+    }
+
+def get_model_price(model, prices=None):
+    """
+    Look up the price of a model
+
+    Args:
+        model: The model name, optionally with a version suffix
+        prices: A price table to use instead of MODEL_PRICES (optional)
+
+    Returns:
+        A tuple of (prompt_price, completion_price) per million tokens or None if unknown
+    """
+    prices = MODEL_PRICES if prices is None else prices
+
+    if not model:
+        return None
+
+    matches = [name for name in prices if model == name or model.startswith(f"{name}-")]
+    if not matches:
+        return None
+
+    return prices[max(matches, key=len)]
+
+def estimate_cost(model, prompt_tokens, completion_tokens, prices=None):
+    """
+    Estimate the cost of a run
+
+    Args:
+        model: The model name
+        prompt_tokens: The number of prompt tokens
+        completion_tokens: The number of completion tokens
+        prices: A price table to use instead of MODEL_PRICES (optional)
+
+    Returns:
+        The cost in USD or None if the model has no known price
+    """
+    price = get_model_price(model, prices)
+
+    if price is None:
+        return None
+
+    prompt_price, completion_price = price
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+def prompt_label(messages, max_length=60):
+    """
+    Build a short label identifying the prompt of a request
+
+    Args:
+        messages: The chat messages sent to the model
+        max_length: Maximum label length (default: 60)
+
+    Returns:
+        The first message content, collapsed to one line and truncated
+    """
+    if not messages:
+        return "Unknown"
+
+    first = messages[0]
+    content = first.get('content', '') if isinstance(first, dict) else getattr(first, 'content', '')
+    label = " ".join(str(content).split())
+
+    return label[:max_length - 3] + "..." if len(label) > max_length else label
+
+class UsageTracker:
+    """
+    Aggregate token usage and cost across runs and enforce a budget
+
+    Each recorded run is stored with its model, prompt and suite, so totals can be broken
+    down by any of them. A tracker can be shared between threads.
+    """
+
+    def __init__(self, max_tokens=None, max_cost=None, suite=None, prices=None):
+        """
+        Initialize the tracker
+
+        Args:
+            max_tokens: Total token ceiling (optional)
+            max_cost: Total cost ceiling in USD (optional)
+            suite: Default suite name for recorded runs (optional)
+            prices: A price table to use instead of MODEL_PRICES (optional)
+        """
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.suite = suite
+        self.prices = prices
+        self.records = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, suite=None):
+        """
+        Create a tracker with budgets from HARNESS_MAX_TOKENS and HARNESS_MAX_COST
+
+        Args:
+            suite: Default suite name for recorded runs (optional)
+
+        Returns:
+            A UsageTracker
+        """
+        max_tokens = os.environ.get("HARNESS_MAX_TOKENS")
+        max_cost = os.environ.get("HARNESS_MAX_COST")
+
+        return cls(
+            max_tokens=int(max_tokens) if max_tokens else None,
+            max_cost=float(max_cost) if max_cost else None,
+            suite=suite,
+        )
+
+    def record(self, usage, model=None, prompt=None, suite=None):
+        """
+        Record the usage of one run
+
+        Args:
+            usage: A usage dictionary from extract_usage (None is ignored)
+            model: The model name (optional)
+            prompt: A label for the prompt (optional)
+            suite: The suite name (default: the tracker's suite)
+
+        Returns:
+            The stored record or None if there was no usage
+        """
+        if not usage:
+            return None
+
+        record = dict(usage)
+        record["model"] = model or "Unknown"
+        record["prompt"] = prompt or "Unknown"
+        record["suite"] = suite or self.suite or "Unknown"
+        record["cost"] = estimate_cost(model, usage["prompt_tokens"], usage["completion_tokens"], self.prices)
+
+        with self._lock:
+            self.records.append(record)
+
+        return record
+
+    def record_response(self, response, model=None, prompt=None, suite=None):
+        """
+        Record the usage of an OpenAI chat completion response
+
+        Args:
+            response: The chat completion response
+            model: The requested model, used if the response doesn't name one (optional)
+            prompt: A label for the prompt (optional)
+            suite: The suite name (default: the tracker's suite)
+
+        Returns:
+            The stored record or None if the response had no usage
+        """
+        return self.record(extract_usage(response), model=getattr(response, 'model', None) or model, prompt=prompt, suite=suite)
+
+    def totals(self, records=None):
+        """
+        Sum usage over records
+
+        Args:
+            records: The records to sum (default: all records)
+
+        Returns:
+            A dictionary with calls, prompt_tokens, completion_tokens, total_tokens and cost
+        """
+        if records is None:
+            with self._lock:
+                records = list(self.records)
+
+        return {
+            "calls": len(records),
+            "prompt_tokens": sum(record["prompt_tokens"] for record in records),
+            "completion_tokens": sum(record["completion_tokens"] for record in records),
+            "total_tokens": sum(record["total_tokens"] for record in records),
+            "cost": sum(record["cost"] or 0.0 for record in records),
+        }
+
+    def aggregate(self, key):
+        """
+        Sum usage grouped by a record field
+
+        Args:
+            key: The field to group by ("model", "prompt" or "suite")
+
+        Returns:
+            A dictionary mapping each group to its totals
+        """
+        with self._lock:
+            records = list(self.records)
+
+        groups = {}
+        for record in records:
+            groups.setdefault(record[key], []).append(record)
+
+        return {name: self.totals(group) for name, group in groups.items()}
+
+    def exceeded(self):
+        """
+        Check whether the token or cost budget has been reached
+
+        Returns:
+            True if a ceiling is set and has been reached, False otherwise
+        """
+        totals = self.totals()
+
+        if self.max_tokens is not None and totals["total_tokens"] >= self.max_tokens:
+            return True
+        if self.max_cost is not None and totals["cost"] >= self.max_cost:
+            return True
+
+        return False
+
+    def wrap(self, client):
+        """
+        Wrap an OpenAI client so that every chat completion is recorded
+
+        Args:
+            client: An OpenAI (or Galileo-wrapped OpenAI) client
+
+        Returns:
+            A client proxy that behaves like the original
+        """
+        return TrackedClient(client, self)
+
+class _TrackedCompletions:
+    """Proxy for client.chat.completions that records usage of each create() call"""
+
+    def __init__(self, completions, tracker):
+        self._completions = completions
+        self._tracker = tracker
+
+    def create(self, *args, **kwargs):
+        response = self._completions.create(*args, **kwargs)
+        self._tracker.record_response(response, model=kwargs.get('model'), prompt=prompt_label(kwargs.get('messages')))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+class _TrackedChat:
+    """Proxy for client.chat that exposes tracked completions"""
+
+    def __init__(self, chat, tracker):
+        self._chat = chat
+        self.completions = _TrackedCompletions(chat.completions, tracker)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+class TrackedClient:
+    """Proxy for an OpenAI client that records the usage of chat completions"""
+
+    def __init__(self, client, tracker):
+        self._client = client
+        self.tracker = tracker
+        self.chat = _TrackedChat(client.chat, tracker)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)